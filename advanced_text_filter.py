@@ -1,5 +1,7 @@
 import re
 
+from line_dedupe import LineDeduper
+
 # 기존 설정
 TH_NOISE = 5
 
@@ -13,18 +15,96 @@ NUKE_TOKENS = [
     "DIAT", "ITO", "수험서", "출간사", "가격", "대상", "비고"
 ]
 
+# STRONG_UI_KEYWORDS에 추가
+STRONG_UI_KEYWORDS = [
+    "변환방식", "변환방식:", "html템플릿업데이트", "파일을선택", "파일선택",
+    "클릭하여파일선택", "pdfpptx", "pptx-pdf", "p p t x", "다운로드됩니다",
+    "ocr지원", "이미지품질", "슬라이드당텍스트", "dpi", "pptx", "pdf",
+    "업로드", "변환완료", "변환하기",
+    # 새로 추가된 키워드들
+    "해랍북스", "2024년도", "도서목록", "수험서", "출간사", "교재명",
+    "DIAT", "ITO", "급수", "단계", "가격", "대상", "비고"
+]
+
+# NOISE_TRIGGER_KEYWORDS에 추가
+NOISE_TRIGGER_KEYWORDS = [
+    "변환", "파일", "pptx", "pdf", "템플릿", "업데이트",
+    # 새로 추가
+    "해랍북스", "수험서", "출간사", "교재명", "도서목록"
+]
+
 # 새로운 패턴 추가 (기존 코드 뒤에 추가)
 LONG_REPETITIVE_PATTERN = re.compile(r"(해랍북스|DIAT|ITO|수험서|출간사).{0,50}(해랍북스|DIAT|ITO|수험서|출간사)")
 TABLE_METADATA_PATTERN = re.compile(r"^(교재명|출간사|가격|대상|비고)\s*[:：]?\s*")
 REPETITIVE_NUMBERS = re.compile(r"\d{1,2}[,-]\d{1,2}[급단계]")
+HANGUL_PATTERN = re.compile(r"[가-힣]")
+
+
+class KeywordMatcher:
+    """
+    키워드 목록을 정규식 하나로 묶어서 한 줄을 한 번만 훑고 검사
+
+    기존에는 줄마다 모든 키워드를 lower()한 뒤 `in`으로 하나씩 찾았다.
+    여기서는 키워드를 import 시점에 한 번 소문자로 바꾸고 긴 것부터
+    교대(alternation) 정규식으로 묶는다. 위치마다 가장 긴 키워드를 찾고,
+    그 키워드의 접두사인 키워드도 같은 위치에 있는 것으로 센다
+    (겹치거나 포함된 키워드까지 기존 점수와 똑같이 계산).
+    """
+
+    def __init__(self, weighted_lists, lowercase=True):
+        """
+        Args:
+            weighted_lists (list): [(키워드 목록, 키워드당 점수)]
+            lowercase (bool): 키워드를 소문자로 바꿔서 비교 (기존 token.lower()와 같음)
+        """
+        self.weights = {}
+        self._always = 0  # 빈 키워드는 모든 줄에 포함됨
+        for keywords, weight in weighted_lists:
+            for keyword in keywords:
+                key = keyword.lower() if lowercase else keyword
+                if key:
+                    self.weights[key] = self.weights.get(key, 0) + weight
+                else:
+                    self._always += weight
+
+        ordered = sorted(self.weights, key=len, reverse=True)
+        alternation = "|".join(re.escape(key) for key in ordered) or "(?!)"
+        self._first = re.compile(alternation)
+        self._all = re.compile(f"(?=({alternation}))")
+        self._prefixes = {key: [other for other in self.weights if key.startswith(other)]
+                          for key in self.weights}
+
+    def contains(self, text: str) -> bool:
+        """키워드가 하나라도 있는지"""
+        return self._always > 0 or self._first.search(text) is not None
+
+    def score(self, text: str) -> int:
+        """text에 들어 있는 서로 다른 키워드의 점수 합"""
+        first = self._first.search(text)
+        if first is None:
+            return self._always
+
+        found = set()
+        for match in self._all.finditer(text, first.start()):
+            found.update(self._prefixes[match.group(1)])
+        return self._always + sum(self.weights[key] for key in found)
+
+
+# NUKE 토큰(+10)과 강한 UI 키워드(+5)를 한 번에 검사
+UI_KEYWORD_MATCHER = KeywordMatcher([(NUKE_TOKENS, 10), (STRONG_UI_KEYWORDS, 5)])
+
+# second_pass_nuke는 줄만 소문자로 바꾸고 키워드는 그대로 비교
+NOISE_TRIGGER_MATCHER = KeywordMatcher([(NOISE_TRIGGER_KEYWORDS, 1)], lowercase=False)
 
 # 새로운 강화된 필터링 함수 추가
 def remove_long_repetitive_content(lines: list[str]) -> list[str]:
     """긴 반복 콘텐츠 제거 (테이블 메타데이터, 반복 패턴 등)"""
     if not lines:
         return lines
-    
-    filtered_lines = []
+    return list(iter_remove_long_repetitive_content(lines))
+
+def iter_remove_long_repetitive_content(lines):
+    """remove_long_repetitive_content의 스트리밍 버전 (줄을 하나씩 받아서 남길 줄을 생성)"""
     repetitive_count = 0
     max_repetitive_lines = 10  # 연속 반복 라인 최대 허용 수
     
@@ -33,7 +113,7 @@ def remove_long_repetitive_content(lines: list[str]) -> list[str]:
         
         # 빈 라인은 통과
         if not line_stripped:
-            filtered_lines.append(line)
+            yield line
             repetitive_count = 0
             continue
         
@@ -65,9 +145,7 @@ def remove_long_repetitive_content(lines: list[str]) -> list[str]:
         else:
             repetitive_count = 0  # 정상 라인이면 카운터 리셋
         
-        filtered_lines.append(line)
-    
-    return filtered_lines
+        yield line
 
 # 기존 코드에 추가할 함수들
 
@@ -75,18 +153,19 @@ def hangul_ratio(line: str) -> float:
     """한글 비율 계산"""
     if not line.strip():
         return 0.0
-    hangul_pattern = re.compile(r"[가-힣]")
-    h = len(hangul_pattern.findall(line))
+    h = len(HANGUL_PATTERN.findall(line))
     return h / max(1, len(line))
 
 def early_block_filter(raw_text: str) -> list[str]:
     """초기 블록 필터링"""
-    lines = [l for l in raw_text.splitlines()]
-    # 공백 제거
-    normed = [l.rstrip("\n") for l in lines]
-    # 불필요한 완전 공백 제거
-    cleaned = [l for l in normed if l.strip()]
-    return cleaned
+    return list(iter_early_block_filter(raw_text.splitlines()))
+
+def iter_early_block_filter(lines):
+    """초기 블록 필터링 (줄 단위): 줄 끝 개행을 떼고 완전 공백 줄 제거"""
+    for l in lines:
+        l = l.rstrip("\n")
+        if l.strip():
+            yield l
 
 def classify_lines(lines: list[str], debug=False):
     """라인 분류 및 점수 부여"""
@@ -103,18 +182,8 @@ def ui_noise_score(line: str) -> int:
     if not line.strip():
         return 0
     
-    score = 0
-    line_lower = line.lower()
-    
-    # NUKE 토큰 체크
-    for token in NUKE_TOKENS:
-        if token.lower() in line_lower:
-            score += 10
-    
-    # 강한 UI 키워드 체크
-    for keyword in STRONG_UI_KEYWORDS:
-        if keyword.lower() in line_lower:
-            score += 5
+    # NUKE 토큰, 강한 UI 키워드 체크 (한 번에)
+    score = UI_KEYWORD_MATCHER.score(line.lower())
     
     # 반복 패턴 체크
     if LONG_REPETITIVE_PATTERN.search(line):
@@ -135,55 +204,60 @@ def second_pass_nuke(kept_lines):
         return kept_lines
     
     norm_lines = [line.lower().replace(" ", "") for line in kept_lines]
-    ui_hits = sum(1 for n in norm_lines if any(k in n for k in NOISE_TRIGGER_KEYWORDS))
+    is_hit = [NOISE_TRIGGER_MATCHER.contains(n) for n in norm_lines]
+    ui_hits = sum(is_hit)
     
     if ui_hits / len(kept_lines) >= 0.30:
         # 30% 이상이면 해당 키워드 포함 라인 삭제
-        filtered = []
-        for l, n in zip(kept_lines, norm_lines):
-            if any(k in n for k in NOISE_TRIGGER_KEYWORDS):
-                continue
-            filtered.append(l)
+        filtered = [l for l, hit in zip(kept_lines, is_hit) if not hit]
         return filtered if filtered else kept_lines
     
     return kept_lines
 
+# recover_if_too_few: 남은 줄이 이 수 이하이면 복구
+RECOVER_MIN_LINES = 3
+# 복구할 공문서 키워드가 없을 때 남기는 원본 상위 줄 수
+RECOVER_HEAD_LINES = 15
+
+PUBLIC_DOC_KEYWORDS = [
+    "수신", "제목", "붙임", "담당", "연락처", "회신", "협조", "안내",
+    "신청", "요청", "공지", "배포", "검토", "회의", "공문"
+]
+
 def recover_if_too_few(original, filtered):
     """텍스트가 너무 적으면 공문서 키워드로 복구 시도"""
-    PUBLIC_DOC_KEYWORDS = [
-        "수신", "제목", "붙임", "담당", "연락처", "회신", "협조", "안내",
-        "신청", "요청", "공지", "배포", "검토", "회의", "공문"
-    ]
-    
-    if len(filtered) == 0 or len(filtered) <= 3:
+    if len(filtered) == 0 or len(filtered) <= RECOVER_MIN_LINES:
         recover = [l for l in original if any(k in l for k in PUBLIC_DOC_KEYWORDS)]
         if recover:
             return recover
         # 마지막 보호: 원본 상위 15줄
-        return original[:15]
+        return original[:RECOVER_HEAD_LINES]
     return filtered
 
 def final_compact(lines):
     """최종 압축 - 중복 제거 & 공백 다듬기"""
-    seen = set()
-    out = []
+    return list(iter_final_compact(lines))
+
+def iter_final_compact(lines, dedupe_window=None):
+    """final_compact의 스트리밍 버전 (본 줄은 64비트 해시로만 기억, dedupe_window는 LineDeduper 참고)"""
+    seen = LineDeduper(window=dedupe_window)
     for l in lines:
         # 정규화된 키로 중복 체크
         key = "".join(l.split()).lower()
-        if key in seen or len(key) < 3:  # 너무 짧은 라인도 제거
+        if len(key) < 3 or seen.is_duplicate(key):  # 너무 짧은 라인도 제거
             continue
-        seen.add(key)
-        out.append(l.strip())
-    return out
+        yield l.strip()
 
 # 새로운 중복 제거 함수 추가
 def remove_duplicate_content(lines: list[str]) -> list[str]:
     """중복 콘텐츠 제거 (연속된 중복 블록 감지)"""
     if not lines:
         return lines
-    
-    filtered_lines = []
-    seen_blocks = set()
+    return list(iter_remove_duplicate_content(lines))
+
+def iter_remove_duplicate_content(lines, dedupe_window=None):
+    """remove_duplicate_content의 스트리밍 버전 (최대 5줄 블록만 들고 있고, 본 블록은 해시로만 기억)"""
+    seen_blocks = LineDeduper(window=dedupe_window)
     current_block = []
     
     for line in lines:
@@ -193,10 +267,9 @@ def remove_duplicate_content(lines: list[str]) -> list[str]:
             # 빈 라인이면 현재 블록 처리
             if current_block:
                 block_key = "\n".join(current_block).lower()
-                if block_key not in seen_blocks:
-                    seen_blocks.add(block_key)
-                    filtered_lines.extend(current_block)
-                    filtered_lines.append(line)  # 빈 라인도 추가
+                if not seen_blocks.is_duplicate(block_key):
+                    yield from current_block
+                    yield line  # 빈 라인도 추가
                 current_block = []
             continue
         
@@ -205,41 +278,116 @@ def remove_duplicate_content(lines: list[str]) -> list[str]:
         # 블록이 5줄 이상이면 중복 체크
         if len(current_block) >= 5:
             block_key = "\n".join(current_block).lower()
-            if block_key not in seen_blocks:
-                seen_blocks.add(block_key)
-                filtered_lines.extend(current_block)
+            if not seen_blocks.is_duplicate(block_key):
+                yield from current_block
             current_block = []
     
     # 마지막 블록 처리
     if current_block:
         block_key = "\n".join(current_block).lower()
         if block_key not in seen_blocks:
-            filtered_lines.extend(current_block)
-    
-    return filtered_lines
+            yield from current_block
+
+# ---------------- 스트리밍 필터 ----------------
+# filter_text_blocks는 전체 텍스트를 splitlines()로 펼치고 단계마다 전체 목록을
+# 새로 만들어서, OCR한 책 한 권이면 수 MB 텍스트의 복사본을 여러 개 들고 있었다.
+# iter_filter_lines는 같은 단계를 제너레이터로 이어서 줄을 하나씩 흘려보낸다.
+# - second_pass_nuke: window줄씩 모아서 창마다 비율 계산 (window=None이면 전체, 기존과 같음)
+# - recover_if_too_few: 남은 줄이 4줄이 될 때까지만 앞 3줄을 붙잡아 두고,
+#   복구 후보(원본 앞 15줄 + 공문서 키워드 줄)도 그때까지만 최대 RECOVER_BUFFER_LINES줄 보관
+
+# 스트리밍에서 second_pass_nuke 비율을 계산하는 줄 수
+SECOND_PASS_WINDOW = 500
+
+# 복구 후보로 보관하는 최대 줄 수
+RECOVER_BUFFER_LINES = 200
+
+class _RecoveryBuffer:
+    """recover_if_too_few에 필요한 원본 줄만 보관 (앞 15줄 + 공문서 키워드가 있는 줄)"""
+
+    def __init__(self, limit=RECOVER_BUFFER_LINES):
+        self.lines = []
+        self.limit = limit
+        self.active = True
+        self._seen = 0
+
+    def observe(self, line):
+        if self.active and len(self.lines) < self.limit and (
+                self._seen < RECOVER_HEAD_LINES or any(k in line for k in PUBLIC_DOC_KEYWORDS)):
+            self.lines.append(line)
+        self._seen += 1
+
+    def stop(self):
+        """남은 줄이 충분해서 복구할 일이 없으면 보관 중단"""
+        self.active = False
+        self.lines = []
+
+def _iter_scored(lines, recovery, debug):
+    for line in lines:
+        if recovery.active:
+            recovery.observe(line)
+        score = ui_noise_score(line)
+        if debug:
+            print(f"[{score:2d}] {line[:50]}...")
+        if score < TH_NOISE:
+            yield line
+
+def _iter_second_pass(lines, window):
+    if window is None:
+        yield from second_pass_nuke(list(lines))
+        return
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= window:
+            yield from second_pass_nuke(chunk)
+            chunk = []
+    if chunk:
+        yield from second_pass_nuke(chunk)
+
+def _iter_recover(lines, recovery):
+    held = []
+    for line in lines:
+        if held is None:
+            yield line
+            continue
+        held.append(line)
+        if len(held) > RECOVER_MIN_LINES:
+            recovery.stop()
+            yield from held
+            held = None
+    if held is not None:
+        yield from recover_if_too_few(recovery.lines, held)
+
+def iter_filter_lines(lines, window=SECOND_PASS_WINDOW, debug=False, dedupe_window=None):
+    """
+    filter_text_blocks의 스트리밍 버전
+
+    Args:
+        lines (iterable): 입력 줄 (파일 객체, iter_page_lines 결과 등)
+        window (int): second_pass_nuke를 적용할 줄 수 (None이면 문서 전체 - 기존과 같은 결과)
+        debug (bool): 줄마다 점수 출력
+        dedupe_window (int): 중복 검사에 기억할 최근 줄/블록 수 (None이면 문서 전체)
+
+    Yields:
+        str: 남길 줄 (앞뒤 공백 제거)
+    """
+    early = iter_remove_long_repetitive_content(
+        iter_remove_duplicate_content(iter_early_block_filter(lines), dedupe_window))
+    recovery = _RecoveryBuffer()
+    kept = _iter_second_pass(_iter_scored(early, recovery, debug), window)
+    yield from iter_final_compact(_iter_recover(kept, recovery), dedupe_window)
+
+def iter_page_lines(page_texts):
+    """페이지별 텍스트(또는 (페이지 번호, 텍스트))를 줄 단위로 펼침 - 페이지 추출과 바로 연결"""
+    for page_text in page_texts:
+        if isinstance(page_text, tuple):
+            page_text = page_text[1]
+        yield from page_text.splitlines()
 
-# filter_text_blocks 함수 수정
 def filter_text_blocks(raw_text: str, debug=False) -> str:
     """통합: 기존 filter_text_blocks 재정의 (점수 기반 필터 호출 전)"""
-    # 0) Early block nuke
-    early_lines = early_block_filter(raw_text)
-    
-    # 0.3) 중복 콘텐츠 제거 (새로 추가)
-    early_lines = remove_duplicate_content(early_lines)
-    
-    # 0.5) 긴 반복 콘텐츠 제거
-    early_lines = remove_long_repetitive_content(early_lines)
-    
-    # 1) 점수 기반
-    classified = classify_lines(early_lines, debug=debug)
-    after_cut = dynamic_cutoff(classified)
-    kept = [l for (l, sc) in after_cut if sc < TH_NOISE]
-    
-    kept2 = second_pass_nuke(kept)
-    recovered = recover_if_too_few(early_lines, kept2)
-    final_lines = final_compact(recovered)
-    
-    return "\n".join(final_lines)
+    return "\n".join(iter_filter_lines(raw_text.splitlines(), window=None, debug=debug))
 
 if __name__ == "__main__":
     # 테스트 코드
@@ -263,21 +411,3 @@ if __name__ == "__main__":
     print("\n=== 강화된 필터링 결과 ===")
     filtered = filter_text_blocks(test_text, debug=True)
     print(filtered)
-
-# STRONG_UI_KEYWORDS에 추가
-STRONG_UI_KEYWORDS = [
-    "변환방식", "변환방식:", "html템플릿업데이트", "파일을선택", "파일선택",
-    "클릭하여파일선택", "pdfpptx", "pptx-pdf", "p p t x", "다운로드됩니다",
-    "ocr지원", "이미지품질", "슬라이드당텍스트", "dpi", "pptx", "pdf",
-    "업로드", "변환완료", "변환하기",
-    # 새로 추가된 키워드들
-    "해랍북스", "2024년도", "도서목록", "수험서", "출간사", "교재명",
-    "DIAT", "ITO", "급수", "단계", "가격", "대상", "비고"
-]
-
-# NOISE_TRIGGER_KEYWORDS에 추가
-NOISE_TRIGGER_KEYWORDS = [
-    "변환", "파일", "pptx", "pdf", "템플릿", "업데이트",
-    # 새로 추가
-    "해랍북스", "수험서", "출간사", "교재명", "도서목록"
-]
\ No newline at end of file
@@ -1,12 +1,11 @@
 from flask import Flask, request, render_template, send_file, flash, redirect, url_for
 import os
-import tempfile
 from werkzeug.utils import secure_filename
-from pdf2image import convert_from_path
+from pdf_rasterizer import get_pdf_page_count, iter_encoded_pages
+from conversion_cache import create_conversion_cache_from_env, hash_file, make_cache_key
 from pptx import Presentation
 from pptx.util import Inches
 import io
-from PIL import Image
 import json
 from dotenv import load_dotenv
 # Adobe PDF Services SDK imports (선택적 - API 키가 설정된 경우에만 사용)
@@ -48,6 +47,27 @@ ALLOWED_EXTENSIONS = {'pdf'}
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 
+# 변환 결과 캐시 (outputs/cache, CONVERSION_CACHE=0이면 비활성화)
+conversion_cache = create_conversion_cache_from_env()
+
+# 품질 설정에 따른 파라미터 설정 (최적화됨, 변환 캐시 키에도 사용)
+QUALITY_SETTINGS = {
+    'medium': {
+        'dpi': 120,  # DPI 최적화로 속도 향상
+        'format': 'jpeg',
+        'jpeg_quality': 80,  # 품질과 속도의 균형
+        'max_size': (1600, 1200),  # 적절한 해상도
+        'description': '균형 변환 (최적화된 속도와 품질)'
+    },
+    'high': {
+        'dpi': 180,  # 고품질이지만 속도 고려
+        'format': 'jpeg',  # PNG 대신 JPEG 사용으로 속도 향상
+        'jpeg_quality': 90,
+        'max_size': (2048, 1536),  # 해상도 최적화
+        'description': '고품질 변환 (향상된 속도)'
+    }
+}
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -88,25 +108,7 @@ def extract_pdf_content_with_adobe(pdf_path):
 def pdf_to_docx(pdf_path, output_path, quality='medium'):
     """PDF를 DOCX로 변환하는 함수 (Adobe API 통합)"""
     try:
-        # 품질 설정에 따른 파라미터 설정 (최적화됨)
-        quality_settings = {
-            'medium': {
-                'dpi': 120,  # DPI 최적화로 속도 향상
-                'format': 'jpeg',
-                'jpeg_quality': 80,  # 품질과 속도의 균형
-                'max_size': (1600, 1200),  # 적절한 해상도
-                'description': '균형 변환 (최적화된 속도와 품질)'
-            },
-            'high': {
-                'dpi': 180,  # 고품질이지만 속도 고려
-                'format': 'jpeg',  # PNG 대신 JPEG 사용으로 속도 향상
-                'jpeg_quality': 90,
-                'max_size': (2048, 1536),  # 해상도 최적화
-                'description': '고품질 변환 (향상된 속도)'
-            }
-        }
-        
-        settings = quality_settings.get(quality, quality_settings['medium'])
+        settings = QUALITY_SETTINGS.get(quality, QUALITY_SETTINGS['medium'])
         print(f"변환 설정: {settings['description']}")
         
         # Adobe API를 사용하여 PDF 내용 추출 시도
@@ -116,46 +118,28 @@ def pdf_to_docx(pdf_path, output_path, quality='medium'):
                 print("Adobe API를 사용하여 PDF 내용을 추출했습니다.")
                 # 추출된 내용을 기반으로 DOCX 생성 (향후 구현 가능)
         
-        # 기본 방법: PDF를 이미지로 변환 (품질별 최적화)
+        # 기본 방법: PDF를 이미지로 변환 (품질별 최적화, 렌더링 풀에서 병렬 처리)
         print("PDF를 이미지로 변환 중...")
-        images = convert_from_path(pdf_path, dpi=settings['dpi'], fmt=settings['format'])
+        total_pages = get_pdf_page_count(pdf_path)
         
         # 새 Word 문서 생성
         doc = Document()
         
-        print(f"총 {len(images)}페이지 처리 중...")
-        # 각 페이지를 문서에 추가
-        for i, image in enumerate(images):
-            print(f"페이지 {i+1}/{len(images)} 처리 중...")
+        print(f"총 {total_pages}페이지 처리 중...")
+        # 각 페이지를 문서에 추가 (크기 축소와 JPEG 인코딩은 워커에서 수행)
+        for i, img_stream in iter_encoded_pages(pdf_path, dpi=settings['dpi'],
+                                                quality=settings['jpeg_quality'],
+                                                max_size=settings['max_size'],
+                                                optimize=True, page_count=total_pages,
+                                                fmt=settings['format']):
+            print(f"페이지 {i+1}/{total_pages} 처리 중...")
             
-            # 이미지 크기 최적화 (품질별 설정)
-            max_width, max_height = settings['max_size']
-            if image.size[0] > max_width or image.size[1] > max_height:
-                image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+            # 문서에 이미지 추가
+            doc.add_picture(img_stream, width=Inches(6))
             
-            # 이미지를 임시 파일로 저장 (JPEG 최적화)
-            temp_img_path = None
-            try:
-                with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_img:
-                    temp_img_path = temp_img.name
-                    # JPEG로 저장 (품질별 압축, 빠른 처리)
-                    image.save(temp_img_path, 'JPEG', quality=settings['jpeg_quality'], optimize=True)
-                
-                # 문서에 이미지 추가
-                doc.add_picture(temp_img_path, width=Inches(6))
-                
-                # 페이지 구분을 위한 페이지 브레이크 추가 (마지막 페이지 제외)
-                if i < len(images) - 1:
-                    doc.add_page_break()
-                
-            finally:
-                # 임시 파일 삭제 (빠른 처리)
-                if temp_img_path and os.path.exists(temp_img_path):
-                    try:
-                        os.unlink(temp_img_path)
-                    except (OSError, PermissionError) as e:
-                        print(f"임시 파일 삭제 실패 (무시됨): {e}")
-                        # 임시 파일 삭제 실패는 무시하고 계속 진행
+            # 페이지 구분을 위한 페이지 브레이크 추가 (마지막 페이지 제외)
+            if i < total_pages - 1:
+                doc.add_page_break()
         
         # DOCX 파일 저장
         doc.save(output_path)
@@ -168,25 +152,7 @@ def pdf_to_docx(pdf_path, output_path, quality='medium'):
 def pdf_to_pptx(pdf_path, output_path, quality='medium'):
     """PDF를 PPTX로 변환하는 함수 (Adobe API 통합)"""
     try:
-        # 품질 설정에 따른 파라미터 설정 (최적화됨)
-        quality_settings = {
-            'medium': {
-                'dpi': 120,  # DPI 최적화로 속도 향상
-                'format': 'jpeg',
-                'jpeg_quality': 80,  # 품질과 속도의 균형
-                'max_size': (1600, 1200),  # 적절한 해상도
-                'description': '균형 변환 (최적화된 속도와 품질)'
-            },
-            'high': {
-                'dpi': 180,  # 고품질이지만 속도 고려
-                'format': 'jpeg',  # PNG 대신 JPEG 사용으로 속도 향상
-                'jpeg_quality': 90,
-                'max_size': (2048, 1536),  # 해상도 최적화
-                'description': '고품질 변환 (향상된 속도)'
-            }
-        }
-        
-        settings = quality_settings.get(quality, quality_settings['medium'])
+        settings = QUALITY_SETTINGS.get(quality, QUALITY_SETTINGS['medium'])
         print(f"변환 설정: {settings['description']}")
         
         # Adobe API를 사용하여 PDF 내용 추출 시도
@@ -198,12 +164,12 @@ def pdf_to_pptx(pdf_path, output_path, quality='medium'):
         
         # 기본 방법: PDF를 이미지로 변환 (품질별 최적화)
         print("PDF를 이미지로 변환 중...")
-        images = convert_from_path(pdf_path, dpi=settings['dpi'], fmt=settings['format'])
+        total_pages = get_pdf_page_count(pdf_path)
         
         # 새 PowerPoint 프레젠테이션 생성
         prs = Presentation()
         
-        print(f"총 {len(images)}페이지 처리 중...")
+        print(f"총 {total_pages}페이지 처리 중...")
         def get_blank_slide_layout(prs):
             """안전한 빈 슬라이드 레이아웃 가져오기"""
             try:
@@ -218,41 +184,23 @@ def pdf_to_pptx(pdf_path, output_path, quality='medium'):
             except IndexError:
                 return prs.slide_layouts[0]
         
-        # 각 페이지를 슬라이드로 추가
-        for i, image in enumerate(images):
-            print(f"페이지 {i+1}/{len(images)} 처리 중...")
+        # 각 페이지를 슬라이드로 추가 (크기 축소와 JPEG 인코딩은 워커에서 수행)
+        for i, img_stream in iter_encoded_pages(pdf_path, dpi=settings['dpi'],
+                                                quality=settings['jpeg_quality'],
+                                                max_size=settings['max_size'],
+                                                optimize=True, page_count=total_pages,
+                                                fmt=settings['format']):
+            print(f"페이지 {i+1}/{total_pages} 처리 중...")
             
             # 슬라이드 추가 - 안전한 레이아웃 사용
             slide_layout = get_blank_slide_layout(prs)
             slide = prs.slides.add_slide(slide_layout)
             
-            # 이미지 크기 최적화 (품질별 설정)
-            max_width, max_height = settings['max_size']
-            if image.size[0] > max_width or image.size[1] > max_height:
-                image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
-            
-            # 이미지를 임시 파일로 저장 (JPEG 최적화)
-            temp_img_path = None
-            try:
-                with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_img:
-                    temp_img_path = temp_img.name
-                    # JPEG로 저장 (품질별 압축, 빠른 처리)
-                    image.save(temp_img_path, 'JPEG', quality=settings['jpeg_quality'], optimize=True)
-                
-                # 슬라이드에 이미지 추가
-                left = Inches(0.5)
-                top = Inches(0.5)
-                height = Inches(7)
-                slide.shapes.add_picture(temp_img_path, left, top, height=height)
-                
-            finally:
-                # 임시 파일 삭제 (빠른 처리)
-                if temp_img_path and os.path.exists(temp_img_path):
-                    try:
-                        os.unlink(temp_img_path)
-                    except (OSError, PermissionError) as e:
-                        print(f"임시 파일 삭제 실패 (무시됨): {e}")
-                        # 임시 파일 삭제 실패는 무시하고 계속 진행
+            # 슬라이드에 이미지 추가
+            left = Inches(0.5)
+            top = Inches(0.5)
+            height = Inches(7)
+            slide.shapes.add_picture(img_stream, left, top, height=height)
         
         # PPTX 파일 저장
         prs.save(output_path)
@@ -324,13 +272,31 @@ def upload_file():
                 output_path = os.path.join(OUTPUT_FOLDER, output_filename)
                 
                 quality = request.form.get('quality', 'medium')
-                print(f"PDF → DOCX 변환 시작 - {input_path} -> {output_path}")
                 
-                try:
-                    conversion_success = pdf_to_docx(input_path, output_path, quality)
-                except Exception as e:
-                    print(f"변환 중 예외 발생: {str(e)}")
-                    flash(f'변환 중 오류가 발생했습니다: {str(e)}')
+                # 변환 캐시 확인 (입력 해시 + 품질 설정)
+                cache_key = None
+                cached_path = None
+                skip_cache = request.form.get('no_cache', '').lower() in ('1', 'true', 'yes', 'on')
+                if conversion_cache is not None and not skip_cache:
+                    settings = QUALITY_SETTINGS.get(quality, QUALITY_SETTINGS['medium'])
+                    cache_key = make_cache_key(hash_file(input_path),
+                                               {'direction': 'pdf_to_docx', **settings})
+                    cached_path = conversion_cache.get(cache_key, '.docx')
+                
+                if cached_path:
+                    print(f"캐시 적중 - {cached_path}")
+                    output_path = cached_path
+                    conversion_success = True
+                else:
+                    print(f"PDF → DOCX 변환 시작 - {input_path} -> {output_path}")
+                    
+                    try:
+                        conversion_success = pdf_to_docx(input_path, output_path, quality)
+                        if conversion_success and cache_key:
+                            output_path = conversion_cache.put(cache_key, output_path, '.docx')
+                    except Exception as e:
+                        print(f"변환 중 예외 발생: {str(e)}")
+                        flash(f'변환 중 오류가 발생했습니다: {str(e)}')
                     
             elif file_ext == 'docx':
                 # DOCX → PDF 변환
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+페이지 이미지 삽입 벤치마크: 임시 JPEG 파일 vs 메모리 버퍼
+
+사용법:
+    python benchmarks/bench_image_pipeline.py --pages 50 --dirs /dev/shm uploads
+
+--dirs로 넘긴 각 디렉토리(tmpfs, 실제 디스크 등)에 대해 기존 방식
+(JPEG 저장 → add_picture(경로) → 삭제)을 측정하고, 메모리 버퍼 방식
+(encode_jpeg → add_picture(스트림))과 페이지당 시간을 비교한다.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document
+from docx.shared import Inches
+from PIL import Image, ImageDraw
+
+from pdf_rasterizer import encode_jpeg
+
+
+def make_page_image(index, size=(1240, 1754)):
+    """A4 150dpi 크기의 가짜 페이지 이미지 생성"""
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    for row in range(40, size[1] - 40, 24):
+        draw.text((60, row), f"page {index} line {row} " * 6, fill='black')
+    return image
+
+
+def run_disk(images, directory, quality):
+    doc = Document()
+    start = time.perf_counter()
+    for i, image in enumerate(images):
+        img_path = os.path.join(directory, f'bench_page_{os.getpid()}_{i}.jpg')
+        image.save(img_path, 'JPEG', quality=quality)
+        doc.add_picture(img_path, width=Inches(6))
+        os.remove(img_path)
+    return time.perf_counter() - start
+
+
+def run_memory(images, quality):
+    doc = Document()
+    start = time.perf_counter()
+    for image in images:
+        doc.add_picture(encode_jpeg(image, quality=quality), width=Inches(6))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=30)
+    parser.add_argument('--quality', type=int, default=85)
+    parser.add_argument('--dirs', nargs='+', default=['/dev/shm', 'uploads'])
+    parser.add_argument('--repeat', type=int, default=3, help='반복 측정 후 최솟값 사용')
+    args = parser.parse_args()
+
+    images = [make_page_image(i) for i in range(args.pages)]
+    print(f"페이지 수: {args.pages}, JPEG 품질: {args.quality}")
+
+    dirs = [d for d in args.dirs if os.path.isdir(d)]
+    for directory in set(args.dirs) - set(dirs):
+        print(f"  {directory}: 디렉토리 없음 (건너뜀)")
+
+    # 측정 순서에 따른 편차를 줄이기 위해 방식별로 번갈아 측정
+    run_memory(images[:2], args.quality)  # 워밍업
+    mem_runs, disk_runs = [], {d: [] for d in dirs}
+    for _ in range(args.repeat):
+        mem_runs.append(run_memory(images, args.quality))
+        for directory in dirs:
+            disk_runs[directory].append(run_disk(images, directory, args.quality))
+
+    mem_per_page = min(mem_runs) / args.pages * 1000
+    print(f"  메모리 버퍼          : {mem_per_page:7.2f} ms/page")
+    for directory in dirs:
+        disk_per_page = min(disk_runs[directory]) / args.pages * 1000
+        gain = disk_per_page - mem_per_page
+        print(f"  임시 파일 ({directory:<8}) : {disk_per_page:7.2f} ms/page "
+              f"(메모리 버퍼 대비 {gain:+.2f} ms/page)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+중복 제거 메모리 벤치마크: 문자열 set vs LineDeduper(64비트 해시)
+
+사용법:
+    python benchmarks/bench_line_dedupe.py --lines 1000000
+
+한글/영문이 섞인 OCR 같은 줄(대부분 서로 다름)을 만든 뒤, 중복 검사에
+기억하는 내용만 따로 측정해서(tracemalloc, 입력 줄 자체는 제외) 100만 줄당 MB로 환산한다.
+- 줄 키: final_compact가 기억하는 정규화된 줄 (기존: 문자열 set)
+- 블록 키: remove_duplicate_content가 기억하는 5줄 블록 (기존: 문자열 set)
+LineDeduper는 기본(해시만), verify(키도 보관), window(최근 N개만) 모드를 비교한다.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from line_dedupe import LineDeduper, normalize_line
+
+KOREAN_WORDS = ["문서", "내용", "입니다", "회의", "수신", "제목", "결과", "보고서", "안내",
+                "담당", "협조", "요청", "검토", "공문", "붙임", "변환", "페이지", "표를"]
+ENGLISH_WORDS = ["the", "data", "report", "PDF", "page", "OCR", "table", "result"]
+
+
+def make_lines(count, seed=0):
+    rng = random.Random(seed)
+    lines = []
+    for number in range(count):
+        words = [rng.choice(KOREAN_WORDS if rng.random() < 0.7 else ENGLISH_WORDS)
+                 for _ in range(rng.randint(3, 12))]
+        # 줄 번호를 섞어서 대부분 서로 다른 줄로 만듦
+        words.insert(rng.randint(0, len(words)), str(number))
+        lines.append(" ".join(words))
+    return lines
+
+
+def measure(keys, make_store, add):
+    """keys를 모두 넣은 뒤 저장소가 차지하는 메모리(바이트)와 걸린 시간 (시간은 추적 없이 따로 잼)"""
+    start = time.perf_counter()
+    store = make_store()
+    for key in keys:
+        add(store, key)
+    elapsed = time.perf_counter() - start
+    del store
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        store = make_store()
+        for key in keys:
+            add(store, key)
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del store
+    return used, elapsed
+
+
+def add_to_set(store, key):
+    if key not in store:
+        store.add(key)
+
+
+def add_to_deduper(store, key):
+    store.is_duplicate(key)
+
+
+def run(label, keys, window, line_count):
+    print(f"\n{label} ({len(keys)}개)")
+    per_million = 1_000_000 / line_count
+    results = [
+        ("기존 문자열 set    ", set, add_to_set),
+        ("LineDeduper       ", LineDeduper, add_to_deduper),
+        ("LineDeduper verify", lambda: LineDeduper(verify=True), add_to_deduper),
+        (f"LineDeduper window={window}", lambda: LineDeduper(window=window), add_to_deduper),
+    ]
+    for name, make_store, add in results:
+        # 키 문자열은 입력이므로 측정 전에 만들어 둠 (verify/기존 set은 참조만 보관하지만
+        # 실제 필터에서는 키를 새로 만들어 넣으므로 키 크기도 더함)
+        used, elapsed = measure(keys, make_store, add)
+        if add is add_to_set or 'verify' in name:
+            used += sum(sys.getsizeof(key) for key in keys)
+        print(f"  {name}: {used * per_million / 1024 / 1024:8.1f} MB/100만 줄, "
+              f"{len(keys) / elapsed:10,.0f}개/초")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=1000000)
+    parser.add_argument('--window', type=int, default=10000, help='window 모드에서 기억할 키 수')
+    args = parser.parse_args()
+
+    lines = make_lines(args.lines)
+    line_keys = [normalize_line(line) for line in lines]
+    run("줄 키 (final_compact)", line_keys, args.window, len(lines))
+    del line_keys
+
+    block_keys = ["\n".join(lines[i:i + 5]).lower() for i in range(0, len(lines), 5)]
+    run("5줄 블록 키 (remove_duplicate_content)", block_keys, args.window, len(lines))
+
+
+if __name__ == '__main__':
+    main()
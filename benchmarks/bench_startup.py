@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+서버 콜드 스타트 벤치마크 (python -X importtime 기반)
+
+사용법:
+    python benchmarks/bench_startup.py --repeat 5 --top 15
+    python benchmarks/bench_startup.py --max-ms 800   # 회귀 검사 (초과 시 종료 코드 1)
+
+새 인터프리터에서 main.py가 서버를 띄우기 전까지 하는 import
+(main → final_server)를 반복 측정해서, 전체 import 시간과 누적 시간이
+큰 최상위 모듈을 보여준다. 변환 라이브러리가 다시 모듈 로드 시점에
+import되면 목록 상단에 나타나므로 회귀를 바로 확인할 수 있다.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 서버 시작 전까지 로드되면 안 되는 무거운 모듈
+HEAVY_MODULES = ['docx', 'reportlab', 'PyPDF2', 'PIL', 'pdf2image',
+                 'pytesseract', 'cv2', 'numpy', 'pdfplumber']
+
+STARTUP_CODE = 'import main, final_server'
+
+
+def measure_once():
+    """
+    새 프로세스에서 import 한 번 측정
+
+    Returns:
+        tuple: (실행 시간 ms, {모듈: (자체 us, 누적 us, 깊이)})
+    """
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', STARTUP_CODE],
+                            cwd=ROOT, capture_output=True, text=True)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"import 실패:\n{result.stderr[-2000:]}")
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return elapsed_ms, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='반복 측정 후 중앙값 사용')
+    parser.add_argument('--top', type=int, default=10, help='표시할 최상위 모듈 수')
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help='import 시간(중앙값)이 이 값을 넘으면 종료 코드 1')
+    args = parser.parse_args()
+
+    runs = [measure_once() for _ in range(args.repeat)]
+    runs.sort(key=lambda run: run[0])
+    elapsed_ms, modules = runs[len(runs) // 2]
+
+    # 최상위(깊이 0) 모듈의 누적 시간 합 = 전체 import 시간
+    import_ms = sum(cum for _, cum, depth in modules.values() if depth == 0) / 1000
+    print(f"측정 대상: python -c \"{STARTUP_CODE}\" ({args.repeat}회 중앙값)")
+    print(f"  프로세스 실행 시간 : {elapsed_ms:8.1f} ms")
+    print(f"  import 시간 합계   : {import_ms:8.1f} ms")
+
+    print(f"\n누적 import 시간 상위 {args.top}개 (최상위 모듈)")
+    top_level = sorted(((cum, name) for name, (_, cum, depth) in modules.items() if depth == 0),
+                       reverse=True)
+    for cumulative_us, name in top_level[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    loaded_heavy = [name for name in HEAVY_MODULES if name in modules]
+    if loaded_heavy:
+        print(f"\n⚠️ 시작 시 로드된 변환 모듈: {', '.join(loaded_heavy)}")
+    else:
+        print("\n✅ 시작 시 변환 모듈 로드 없음")
+
+    if args.max_ms is not None and import_ms > args.max_ms:
+        print(f"❌ import 시간 {import_ms:.1f} ms > 한도 {args.max_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
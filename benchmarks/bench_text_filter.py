@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+텍스트 필터 점수 회귀 확인 + 처리량 벤치마크
+
+사용법:
+    python benchmarks/bench_text_filter.py --lines 200000
+
+1) 회귀 확인: 아래 REGRESSION_CORPUS(겹치는 키워드, 대소문자, 공백, 빈 줄 등)와
+   시드를 고정한 합성 OCR 줄에 대해, 키워드를 하나씩 찾던 기존 구현
+   (이 파일의 reference_*)과 advanced_text_filter의 결과가 모두 같은지 확인한다.
+   ui_noise_score, hangul_ratio, second_pass_nuke, filter_text_blocks를 비교하고
+   하나라도 다르면 종료 코드 1. 규칙 엔진을 쓰는 filter_builder1_content와
+   enhanced_ui_filter도 패턴마다 re.search를 하던 기존 방식과 비교한다
+   (custom_words.txt 단어가 들어간 노이즈 줄 포함 - RULE_CORPUS).
+2) 처리량: 같은 줄들로 ui_noise_score와 filter_text_blocks의 초당 줄 수를 비교한다.
+3) 메모리(--memory): 전체 텍스트를 받는 filter_text_blocks와, 줄을 하나씩
+   만들어 넘기는 iter_filter_lines의 최대 할당량(tracemalloc)을 비교한다.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import advanced_text_filter as atf
+import builder1_filter
+import custom_filter_rules
+from rule_engine import RULES_DIR, read_rules
+
+# 키워드가 겹치거나 포함되는 경우, 대소문자, 특수 문자 등 회귀 확인용 줄
+REGRESSION_CORPUS = [
+    "",
+    "   ",
+    "\t",
+    "변환 방식: 표준 변환 (빠름)",
+    "변환방식:",
+    "변환방식",
+    "PDFPPTX 변환하기",
+    "pdfpptx pptx-pdf pdf pptx",
+    "pdf",
+    "P P T X 파일",
+    "p p t x",
+    "PPTX-PDF 다운로드됩니다",
+    "HTML 템플릿 업데이트",
+    "### HTML 템플릿 업데이트: ```html",
+    "html템플릿업데이트",
+    "웹 인터페이스 개선",
+    "## 🎯 4. 웹 인터페이스 개선:",
+    "해랍북스 2024년도 도서목록",
+    "해랍북스 DIAT ITO 수험서 출간사",
+    "DIAT 1-2급 수험서, ITO 3,4단계 출간사 해랍북스",
+    "diat ito Diat Ito",
+    "교재명: 엑셀 2016",
+    "교재명 : 파워포인트",
+    "출간사：해랍북스",
+    "가격 대상 비고",
+    "비고",
+    "가격표와 대상자",
+    "DPI 300, 이미지품질 높음, 슬라이드당텍스트 20줄",
+    "ocr지원 OCR지원 Ocr지원",
+    "클릭하여파일선택 파일을선택 파일선택",
+    "업로드 완료 후 변환완료",
+    "급수 단계 급수단계",
+    "İstanbul PDF İ",
+    "ﬁle PDF ligature",
+    "ITOITOITO",
+    "pdfpdfpdf pptxpptx",
+    "수신: 전 직원",
+    "제목: 2023년 하반기 회의 안내",
+    "붙임 1. 신청서 양식",
+    "담당자: 홍길동 (연락처 02-123-4567)",
+    "실제 문서 내용입니다.",
+    "이것은 보존되어야 할 텍스트입니다.",
+    "The quick brown fox jumps over the lazy dog",
+    "a" * 250,
+    "가" * 120 + "a" * 130,
+    "해랍북스" + "x" * 60 + "DIAT",
+    "해랍북스" + "x" * 40 + "DIAT",
+]
+
+# 규칙 파일에 걸리는 줄 (custom_words.txt 단어가 같이 있는 줄 포함)
+RULE_CORPUS = [
+    "로딩 애니메이션 KC인증 안내",
+    "클릭 이벤트 시험연구원 문의",
+    "변환 방식: 표준 변환 (빠름)",
+    "표준 변환 (빠름) 어린이제품",
+    "# 해결: 웹 인터페이스 환경변수 관련 업데이트",
+    "`index.html` 파일 로딩 div 요소 제거",
+    "## 🎯 4. 웹 인터페이스 개선: ```html",
+    "JavaScript 코드 수정 - 안전기준 확인",
+    "템플릿 파일 정리",
+    "업로드 섹션 제조업체",
+    "KC 인증 번호: 12345",
+    "신고확인증 유효기간 2025년",
+    "실제 중요한 문서 내용입니다.",
+    "수신: 전 직원",
+]
+
+KOREAN_WORDS = ["문서", "내용", "입니다", "회의", "수신", "제목", "결과", "보고서", "2023년",
+                "안내", "담당", "협조", "요청", "검토", "공문", "붙임", "변환", "파일"]
+ENGLISH_WORDS = ["the", "data", "report", "PDF", "page", "OCR", "table", "result"]
+NOISE_KEYWORDS = (atf.NUKE_TOKENS + atf.STRONG_UI_KEYWORDS + atf.NOISE_TRIGGER_KEYWORDS)
+
+
+# ---------------- 기존 구현 (비교 기준) ----------------
+
+def reference_ui_noise_score(line):
+    if not line.strip():
+        return 0
+
+    score = 0
+    line_lower = line.lower()
+    for token in atf.NUKE_TOKENS:
+        if token.lower() in line_lower:
+            score += 10
+    for keyword in atf.STRONG_UI_KEYWORDS:
+        if keyword.lower() in line_lower:
+            score += 5
+    if atf.LONG_REPETITIVE_PATTERN.search(line):
+        score += 8
+    if atf.TABLE_METADATA_PATTERN.search(line):
+        score += 6
+    return score
+
+
+def reference_hangul_ratio(line):
+    if not line.strip():
+        return 0.0
+    hangul_pattern = re.compile(r"[가-힣]")
+    h = len(hangul_pattern.findall(line))
+    return h / max(1, len(line))
+
+
+def reference_second_pass_nuke(kept_lines):
+    if not kept_lines:
+        return kept_lines
+
+    norm_lines = [line.lower().replace(" ", "") for line in kept_lines]
+    ui_hits = sum(1 for n in norm_lines if any(k in n for k in atf.NOISE_TRIGGER_KEYWORDS))
+    if ui_hits / len(kept_lines) >= 0.30:
+        filtered = []
+        for l, n in zip(kept_lines, norm_lines):
+            if any(k in n for k in atf.NOISE_TRIGGER_KEYWORDS):
+                continue
+            filtered.append(l)
+        return filtered if filtered else kept_lines
+    return kept_lines
+
+
+def reference_filter_text_blocks(raw_text):
+    early_lines = atf.early_block_filter(raw_text)
+    early_lines = atf.remove_duplicate_content(early_lines)
+    early_lines = atf.remove_long_repetitive_content(early_lines)
+    kept = [l for l in early_lines if reference_ui_noise_score(l) < atf.TH_NOISE]
+    kept2 = reference_second_pass_nuke(kept)
+    recovered = atf.recover_if_too_few(early_lines, kept2)
+    return "\n".join(atf.final_compact(recovered))
+
+
+def reference_rule_filter(rule_file, text):
+    """규칙 엔진 이전: 줄마다 패턴을 하나씩 re.search한 뒤 filter_text_blocks"""
+    if not text:
+        return ""
+    patterns = read_rules(os.path.join(RULES_DIR, rule_file))
+    kept = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not any(re.search(pattern, line, re.IGNORECASE) for pattern in patterns):
+            kept.append(line)
+    return reference_filter_text_blocks("\n".join(kept))
+
+
+# ---------------- 입력 ----------------
+
+def make_lines(count, seed=0, noise_rate=0.15):
+    """한글/영문 단어에 노이즈 키워드를 섞은 OCR 같은 줄 생성"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        words = [rng.choice(KOREAN_WORDS if rng.random() < 0.7 else ENGLISH_WORDS)
+                 for _ in range(rng.randint(2, 16))]
+        while rng.random() < noise_rate:
+            keyword = rng.choice(NOISE_KEYWORDS)
+            if rng.random() < 0.3:
+                keyword = keyword.upper()
+            words.insert(rng.randint(0, len(words)), keyword)
+        line = (" " if rng.random() < 0.8 else "").join(words)
+        if rng.random() < 0.05:
+            line = ""
+        lines.append(line)
+    return lines
+
+
+def check_regression(lines):
+    """기존 구현과 결과 비교, 다른 항목 수 반환"""
+    failures = 0
+    for line in lines:
+        expected = reference_ui_noise_score(line)
+        actual = atf.ui_noise_score(line)
+        if expected != actual:
+            failures += 1
+            print(f"  ui_noise_score 불일치: {line[:60]!r} 기존 {expected}, 현재 {actual}")
+        if reference_hangul_ratio(line) != atf.hangul_ratio(line):
+            failures += 1
+            print(f"  hangul_ratio 불일치: {line[:60]!r}")
+
+    for start in range(0, len(lines), 50):
+        chunk = lines[start:start + 50]
+        if reference_second_pass_nuke(chunk) != atf.second_pass_nuke(chunk):
+            failures += 1
+            print(f"  second_pass_nuke 불일치: {start}번째 줄부터")
+        text = "\n".join(chunk)
+        if reference_filter_text_blocks(text) != atf.filter_text_blocks(text):
+            failures += 1
+            print(f"  filter_text_blocks 불일치: {start}번째 줄부터")
+    return failures
+
+
+def check_rule_filters(lines, seed=2):
+    """규칙 엔진 필터와 기존 방식 비교 (RULE_CORPUS를 섞은 50줄 묶음), 다른 항목 수 반환"""
+    rng = random.Random(seed)
+    failures = 0
+    for start in range(0, len(lines), 50):
+        chunk = lines[start:start + 50]
+        for line in RULE_CORPUS:
+            chunk.insert(rng.randint(0, len(chunk)), line)
+        text = "\n".join(chunk)
+        for label, rule_file, func in (
+            ("filter_builder1_content", 'builder1_noise.txt', builder1_filter.filter_builder1_content),
+            ("enhanced_ui_filter", 'ui_noise.txt', custom_filter_rules.enhanced_ui_filter),
+        ):
+            if reference_rule_filter(rule_file, text) != func(text):
+                failures += 1
+                print(f"  {label} 불일치: {start}번째 줄부터")
+    return failures
+
+
+def lines_per_second(func, lines, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(lines)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(lines) / best
+
+
+def peak_memory(func):
+    """func 실행 중 최대 할당 바이트"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def compare_memory(line_count, noise_rate):
+    """전체 텍스트 필터 vs 스트리밍 필터 최대 메모리 (입력 생성 포함)"""
+    def whole():
+        text = "\n".join(make_lines(line_count, noise_rate=noise_rate))
+        return len(atf.filter_text_blocks(text))
+
+    def streaming():
+        # 페이지 추출처럼 줄을 조금씩 만들어서 흘려보냄
+        def pages():
+            for page in range(0, line_count, 50):
+                yield "\n".join(make_lines(min(50, line_count - page), seed=page, noise_rate=noise_rate))
+        return sum(len(line) for line in atf.iter_filter_lines(atf.iter_page_lines(pages())))
+
+    print(f"\n메모리 ({line_count}줄)")
+    for label, func in (("filter_text_blocks", whole), ("iter_filter_lines ", streaming)):
+        print(f"  {label}: 최대 {peak_memory(func) / 1024 / 1024:7.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=200000)
+    parser.add_argument('--noise-rate', type=float, default=0.15, help='줄마다 노이즈 키워드를 넣을 확률')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--memory', action='store_true', help='최대 메모리 비교도 실행')
+    args = parser.parse_args()
+
+    print("회귀 확인")
+    corpus = REGRESSION_CORPUS + make_lines(20000, seed=1, noise_rate=0.5)
+    failures = check_regression(corpus)
+    print(f"  {len(corpus)}줄, 불일치 {failures}건")
+    rule_failures = check_rule_filters(corpus)
+    print(f"  규칙 엔진 필터: 불일치 {rule_failures}건")
+    failures += rule_failures
+
+    lines = make_lines(args.lines, noise_rate=args.noise_rate)
+    text = "\n".join(lines)
+    print(f"\n처리량 ({len(lines)}줄, 노이즈 키워드 확률 {args.noise_rate})")
+    for label, reference, current in (
+        ("ui_noise_score    ",
+         lambda ls: [reference_ui_noise_score(l) for l in ls],
+         lambda ls: [atf.ui_noise_score(l) for l in ls]),
+        ("filter_text_blocks",
+         lambda ls: reference_filter_text_blocks(text),
+         lambda ls: atf.filter_text_blocks(text)),
+    ):
+        before = lines_per_second(reference, lines, args.repeat)
+        after = lines_per_second(current, lines, args.repeat)
+        print(f"  {label}: 기존 {before:10,.0f}줄/초, 현재 {after:10,.0f}줄/초 ({after / before:.1f}배)")
+
+    if args.memory:
+        compare_memory(args.lines, args.noise_rate)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+문단 줄바꿈 벤치마크: 글자 수 기준 분할 vs text_layout
+
+사용법:
+    python benchmarks/bench_text_layout.py --paragraphs 10000
+
+한글/영문이 섞인 문단을 만들어서 기존 방식(글자를 하나씩 이어 붙이다가
+글자 수로 자름)과 layout_paragraph()의 레이아웃 시간을 비교한다.
+layout_paragraph는 글자 폭 캐시가 빈 상태(첫 문서)와 채워진 상태를
+따로 측정하고, 줄 폭이 여백을 넘는 줄 수도 함께 보여준다.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.pdfbase import pdfmetrics
+
+import text_layout
+from font_registry import get_font_registry
+from text_layout import layout_paragraph
+
+KOREAN_WORDS = ['문서', '변환', '한글', '폰트', '레이아웃', '줄바꿈', '성능', '측정', '결과',
+                '대한민국은', '민주공화국이다', '페이지', '이미지', '표를', '포함한다']
+ENGLISH_WORDS = ['PDF', 'document', 'layout', 'performance', 'the', 'quick', 'brown',
+                 'fox', 'jumps', 'over', 'lazy', 'dog', 'reportlab', 'canvas']
+
+
+def make_paragraphs(count, seed=0):
+    rng = random.Random(seed)
+    paragraphs = []
+    for _ in range(count):
+        words = [rng.choice(KOREAN_WORDS if rng.random() < 0.7 else ENGLISH_WORDS)
+                 for _ in range(rng.randint(10, 80))]
+        paragraphs.append(' '.join(words) + '.')
+    return paragraphs
+
+
+def legacy_layout(text, chars_per_line):
+    """기존 final_server의 글자 수 기준 분할"""
+    lines = []
+    current_line = ""
+    for char in text:
+        if len(current_line) >= chars_per_line:
+            lines.append(current_line)
+            current_line = char
+        else:
+            current_line += char
+    if current_line:
+        lines.append(current_line)
+    return lines
+
+
+def count_overflow(lines, font_name, font_size, max_width):
+    return sum(1 for line in lines if pdfmetrics.stringWidth(line, font_name, font_size) > max_width + 0.01)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--paragraphs', type=int, default=10000)
+    parser.add_argument('--font-size', type=float, default=11)
+    parser.add_argument('--width', type=float, default=495, help='줄 최대 폭 (pt, A4 세로 본문 폭)')
+    args = parser.parse_args()
+
+    font_name = get_font_registry().get_korean_font() or 'Helvetica'
+    paragraphs = make_paragraphs(args.paragraphs)
+    total_chars = sum(len(p) for p in paragraphs)
+    print(f"문단 {args.paragraphs}개, {total_chars:,}자, 폰트 {font_name} {args.font_size}pt, 폭 {args.width}pt")
+
+    start = time.perf_counter()
+    legacy_lines = [line for p in paragraphs for line in legacy_layout(p, 50)]
+    legacy_time = time.perf_counter() - start
+
+    text_layout._width_cache.clear()
+    start = time.perf_counter()
+    new_lines = [box.text for p in paragraphs
+                 for box in layout_paragraph(p, font_name, args.font_size, args.width)]
+    cold_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for p in paragraphs:
+        layout_paragraph(p, font_name, args.font_size, args.width)
+    warm_time = time.perf_counter() - start
+
+    print(f"  글자 수 기준 (기존)      : {legacy_time * 1000:8.1f} ms, {len(legacy_lines):6d}줄, "
+          f"폭 초과 {count_overflow(legacy_lines, font_name, args.font_size, args.width)}줄")
+    print(f"  layout_paragraph (첫 실행): {cold_time * 1000:8.1f} ms, {len(new_lines):6d}줄, "
+          f"폭 초과 {count_overflow(new_lines, font_name, args.font_size, args.width)}줄")
+    print(f"  layout_paragraph (캐시)   : {warm_time * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
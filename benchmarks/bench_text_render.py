@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+본문 텍스트 그리기 벤치마크: 줄마다 drawString vs TextRunWriter
+
+사용법:
+    python benchmarks/bench_text_render.py --lines 50000
+
+한글/영문이 섞인 문단을 줄 단위로 나눈 뒤(레이아웃 시간은 측정에서 제외),
+같은 줄들을 두 방식으로 PDF에 그린다.
+- 줄마다 draw_korean_text: 줄마다 정규화, setFont, drawString (text object 하나씩)
+- TextRunWriter: 문단마다 한 번 정규화, 페이지마다 text object 하나
+그리기 시간, 저장 시간, 압축하지 않은 PDF 크기(콘텐츠 스트림 크기에 비례)를 비교한다.
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from docx_pdf_renderer import TextRunWriter, draw_korean_text, safe_korean_text
+from font_registry import get_font_registry
+from text_layout import layout_paragraph
+
+KOREAN_WORDS = ['문서', '변환', '한글', '폰트', '레이아웃', '줄바꿈', '성능', '측정', '결과',
+                '대한민국은', '민주공화국이다', '페이지', '이미지', '표를', '포함한다']
+ENGLISH_WORDS = ['PDF', 'document', 'layout', 'performance', 'the', 'quick', 'brown',
+                 'fox', 'jumps', 'over', 'lazy', 'dog', 'reportlab', 'canvas']
+
+MARGIN = 50
+FONT_SIZE = 11
+LINE_HEIGHT = 18
+
+
+def make_document(line_count, font_name, seed=0):
+    """line_count줄 이상이 될 때까지 문단을 만들어서 (원문, 줄 목록) 목록으로 반환"""
+    rng = random.Random(seed)
+    width = A4[0] - 2 * MARGIN
+    paragraphs = []
+    total = 0
+    while total < line_count:
+        words = [rng.choice(KOREAN_WORDS if rng.random() < 0.7 else ENGLISH_WORDS)
+                 for _ in range(rng.randint(10, 80))]
+        text = ' '.join(words) + '.'
+        lines = [box.text for box in layout_paragraph(text, font_name, FONT_SIZE, width)]
+        paragraphs.append((text, lines))
+        total += len(lines)
+    return paragraphs
+
+
+def render(paragraphs, mode, compress):
+    """두 방식 중 하나로 그리고 (그리기 시간, 저장 시간, PDF 바이트 수, 페이지 수) 반환"""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4, pageCompression=compress)
+    font_name = get_font_registry().get_korean_font() or 'Helvetica'
+    writer = TextRunWriter(c)
+    top = A4[1] - MARGIN
+    y = top
+    pages = 1
+
+    start = time.perf_counter()
+    for text, lines in paragraphs:
+        if mode == 'runs':
+            # 문단 단위 정규화 (렌더러와 같은 흐름)
+            safe_korean_text(text)
+        for line in lines:
+            if y - LINE_HEIGHT < MARGIN:
+                writer.new_page()
+                c.showPage()
+                pages += 1
+                y = top
+            if mode == 'runs':
+                writer.line(MARGIN, y, line, font_name, FONT_SIZE, LINE_HEIGHT)
+            else:
+                draw_korean_text(c, MARGIN, y, line, FONT_SIZE)
+            y -= LINE_HEIGHT
+        y -= 8
+    writer.flush()
+    draw_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    c.save()
+    save_time = time.perf_counter() - start
+    return draw_time, save_time, len(buffer.getvalue()), pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=50000)
+    parser.add_argument('--compress', action='store_true', help='페이지 스트림 압축 (렌더러 기본값)')
+    args = parser.parse_args()
+
+    font_name = get_font_registry().get_korean_font() or 'Helvetica'
+    paragraphs = make_document(args.lines, font_name)
+    line_count = sum(len(lines) for _, lines in paragraphs)
+    print(f"문단 {len(paragraphs)}개, {line_count}줄, 폰트 {font_name} {FONT_SIZE}pt, "
+          f"페이지 압축 {'사용' if args.compress else '안 함'}")
+
+    results = {}
+    for mode, label in (('lines', '줄마다 draw_korean_text'), ('runs', 'TextRunWriter        ')):
+        draw_time, save_time, size, pages = render(paragraphs, mode, int(args.compress))
+        results[mode] = draw_time
+        print(f"  {label}: 그리기 {draw_time:6.2f}초, 저장 {save_time:5.2f}초, "
+              f"{pages}페이지, PDF {size / 1024:8.0f} KB ({size / line_count:5.1f} B/줄)")
+
+    print(f"  그리기 속도 {results['lines'] / results['runs']:.1f}배")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""
+변환 결과 캐시 (내용 주소 기반)
+
+같은 PDF/DOCX가 반복해서 업로드되면 매번 전체 렌더링을 다시 하게 된다.
+여기서는 업로드 파일 내용의 해시와 변환 옵션(방향, dpi, 품질, 방향 설정
+등)으로 키를 만들고, 변환 결과물을 outputs/cache/<키><확장자>로 보관한다.
+
+- 항목 수와 전체 크기 한도를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+- 적중/미스 횟수 집계
+- 파일 수정 시각을 마지막 사용 시각으로 사용하므로, 서버 재시작이나
+  다른 워커 프로세스에서도 같은 캐시 디렉토리를 그대로 이어서 사용한다.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+
+# 캐시 키 형식이나 변환 결과가 바뀌면 올려서 기존 항목을 무효화
+CACHE_VERSION = 1
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# put() 도중 쓰는 임시 파일 접미사
+TMP_SUFFIX = '.tmp'
+
+# 이보다 오래된 임시 파일은 중단된 put()이 남긴 것으로 보고 삭제 (초)
+STALE_TMP_SECONDS = 60 * 60
+
+
+def hash_file(file_path):
+    """파일 내용의 SHA-256 해시 (1MB 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def make_cache_key(content_hash, params):
+    """
+    입력 해시와 변환 옵션으로 캐시 키 생성
+
+    Args:
+        content_hash (str): 업로드 파일 내용의 해시
+        params (dict): 결과에 영향을 주는 변환 옵션 (JSON 직렬화 가능해야 함)
+    """
+    payload = json.dumps({'v': CACHE_VERSION, 'input': content_hash, 'params': params},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ConversionCache:
+    """outputs/ 아래에 결과물을 보관하는 LRU 변환 캐시"""
+
+    def __init__(self, cache_dir=os.path.join('outputs', 'cache'),
+                 max_entries=500, max_bytes=1024 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()  # 파일명 -> 크기 (오래 사용하지 않은 순)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """
+        디스크에 남아있는 캐시 항목을 마지막 사용 시각 순으로 적재
+
+        임시 파일(*.tmp)은 항목이 아니다. 다른 워커가 쓰는 중일 수 있으므로
+        STALE_TMP_SECONDS보다 오래된 것만 지운다.
+        """
+        entries = []
+        now = time.time()
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if not os.path.isfile(path) or name.startswith('.'):
+                continue
+            stat = os.stat(path)
+            if name.endswith(TMP_SUFFIX):
+                if now - stat.st_mtime > STALE_TMP_SECONDS:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                continue
+            entries.append((stat.st_mtime, name, stat.st_size))
+
+        for _, name, size in sorted(entries):
+            self._entries[name] = size
+            self._total_bytes += size
+
+        with self._lock:
+            self._evict()
+
+    def get(self, key, suffix):
+        """
+        캐시된 결과물 경로 조회
+
+        Returns:
+            str: 결과물 경로, 없으면 None
+        """
+        name = key + suffix
+        path = os.path.join(self.cache_dir, name)
+
+        with self._lock:
+            if not os.path.exists(path):
+                # 다른 프로세스가 지웠으면 색인에서도 제거
+                if name in self._entries:
+                    self._total_bytes -= self._entries.pop(name)
+                self.misses += 1
+                return None
+
+            if name not in self._entries:
+                # 다른 워커 프로세스가 저장한 항목
+                size = os.path.getsize(path)
+                self._entries[name] = size
+                self._total_bytes += size
+
+            self._entries.move_to_end(name)
+            self.hits += 1
+
+        try:
+            os.utime(path, None)  # 마지막 사용 시각 기록
+        except OSError:
+            pass
+        return path
+
+    def put(self, key, source_path, suffix):
+        """
+        변환 결과물을 캐시에 저장 (원본 파일은 캐시로 이동)
+
+        Returns:
+            str: 캐시에 저장된 결과물 경로
+        """
+        name = key + suffix
+        path = os.path.join(self.cache_dir, name)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}{TMP_SUFFIX}"
+
+        try:
+            try:
+                os.replace(source_path, tmp_path)
+            except OSError:
+                shutil.copyfile(source_path, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        size = os.path.getsize(path)
+
+        with self._lock:
+            if name in self._entries:
+                self._total_bytes -= self._entries.pop(name)
+            self._entries[name] = size
+            self._total_bytes += size
+            self._evict(keep=name)
+        return path
+
+    def _evict(self, keep=None):
+        """한도를 넘으면 오래 사용하지 않은 항목 삭제 (lock 보유 상태에서 호출)"""
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._total_bytes > self.max_bytes):
+            name, size = next(iter(self._entries.items()))
+            if name == keep:
+                break
+            del self._entries[name]
+            self._total_bytes -= size
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+
+    def stats(self):
+        """적중률 등 캐시 상태"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+            }
+
+
+def create_conversion_cache_from_env():
+    """환경 변수로 변환 캐시 생성 (CONVERSION_CACHE=0이면 None)"""
+    if os.environ.get('CONVERSION_CACHE', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+    return ConversionCache(
+        cache_dir=os.environ.get('CONVERSION_CACHE_DIR', os.path.join('outputs', 'cache')),
+        max_entries=int(os.environ.get('CONVERSION_CACHE_MAX_ENTRIES', 500)),
+        max_bytes=int(os.environ.get('CONVERSION_CACHE_MAX_MB', 1024)) * 1024 * 1024,
+    )
@@ -1,43 +1,14 @@
-import re
-from advanced_text_filter import filter_text_blocks
+from rule_engine import create_rule_engine
+
+# 완전히 제거할 UI 패턴은 rules/ui_noise.txt
+UI_FILTER_ENGINE = create_rule_engine('ui_noise.txt')
 
 def enhanced_ui_filter(text: str) -> str:
     """더 강력한 UI 노이즈 제거"""
     if not text:
         return ""
     
-    lines = text.splitlines()
-    filtered_lines = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        
-        # 특정 패턴 완전 제거
-        skip_patterns = [
-            r"변환\s*방식\s*[:：].*",  # 변환 방식: ...
-            r"###\s*HTML\s*템플릿.*",   # ### HTML 템플릿...
-            r"##\s*🎯\s*\d+\..*",      # ## 🎯 4. ...
-            r"```\s*html.*",           # ```html
-            r"표준\s*변환\s*\(빠름\)",   # 표준 변환 (빠름)
-            r"웹\s*인터페이스\s*개선",   # 웹 인터페이스 개선
-        ]
-        
-        should_skip = False
-        for pattern in skip_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                should_skip = True
-                break
-        
-        if not should_skip:
-            filtered_lines.append(line)
-    
-    # 기본 필터링도 적용
-    intermediate_text = "\n".join(filtered_lines)
-    final_text = filter_text_blocks(intermediate_text, debug=False)
-    
-    return final_text
+    return UI_FILTER_ENGINE.filter_text(text)
 
 # main.py에서 사용
 def clean_extracted_text_enhanced(text):
@@ -0,0 +1,386 @@
+"""
+DOCX → PDF 스트리밍 렌더러
+
+기존 렌더링 루프는 DOCX 전체를 요소 목록으로 만든 뒤 그렸고, 시간과
+메모리를 막기 위해 200개 요소에서 말없이 멈췄다. 그래서 긴 문서는 뒷부분이
+잘린 PDF가 만들어졌다.
+
+DocxPdfRenderer는 DocxReader.iter_elements()의 요소를 하나씩 받아 바로
+그리고, 페이지가 차면 canvas.showPage()로 넘긴다. 요소 목록을 만들지 않으므로
+문서 길이와 관계없이 변환 중 메모리는 요소 하나 분량만 더 쓴다.
+(reportlab은 save() 전까지 페이지별 그리기 명령을 보관하므로 페이지당
+수 KB씩은 늘어난다. 이미지는 ImageStore에서 내용별로 한 번만 보관한다.)
+
+잘라내는 대신 페이지 수(max_pages)와 시간(time_budget) 한도를 두고,
+넘으면 RenderBudgetError로 변환을 중단해서 사용자에게 이유를 알려준다.
+"""
+
+import time
+import unicodedata
+
+from reportlab.lib.pagesizes import A4, landscape, portrait
+from reportlab.pdfgen import canvas
+
+from font_registry import get_font_registry
+from image_pipeline import ImageStore, raw_image_streams
+from text_layout import layout_paragraph, fit_text
+
+DEFAULT_MAX_PAGES = 2000
+DEFAULT_TIME_BUDGET = 600  # 초
+
+MARGIN = 50
+
+# 굵은 글꼴이 없을 때 글자 외곽선을 더 그려서 굵게 보이게 하는 선 두께 (글자 크기 대비)
+FAUX_BOLD_STROKE = 0.03
+
+
+class RenderBudgetError(Exception):
+    """페이지 수 또는 시간 한도를 넘어 렌더링을 중단한 경우"""
+
+
+# 제어 문자지만 레이아웃에 넘기는 문자 (강제 줄바꿈, 탭 - layout_paragraph가 처리)
+LAYOUT_CONTROLS = ('\n', '\t')
+
+
+def safe_korean_text(text):
+    """한글 텍스트 안전 처리 (제어/서식 문자 제거, 줄바꿈과 탭은 남김)"""
+    if not text:
+        return ""
+
+    try:
+        normalized = unicodedata.normalize('NFC', str(text))
+        # 출력 가능한 문자만 있으면 제어/서식 문자(Cc, Cf)도 없으므로 글자별 검사 생략
+        if normalized.isprintable():
+            cleaned = normalized
+        else:
+            cleaned = ''.join(char for char in normalized
+                              if char in LAYOUT_CONTROLS
+                              or unicodedata.category(char) not in ['Cc', 'Cf'])
+        return cleaned if cleaned.strip() else ""
+    except Exception as e:
+        return str(text) if text else ""
+
+
+def replace_hangul(text):
+    """한글 폰트가 없을 때 Helvetica로 그릴 수 있도록 한글을 대체 문자로 바꿈"""
+    if any('\uac00' <= char <= '\ud7af' for char in text):
+        return ''.join('한' if '\uac00' <= char <= '\ud7af' else char for char in text)
+    return text
+
+
+def draw_korean_text(canvas_obj, x, y, text, font_size=11, bold=False):
+    """한글 텍스트 한 줄 그리기 (자리 표시 등 단발성 텍스트용, 본문은 TextRunWriter 사용)"""
+    if not text or not text.strip():
+        return
+
+    try:
+        safe_text = ' '.join(safe_korean_text(text).split())  # 한 줄로
+        if not safe_text:
+            return
+
+        registry = get_font_registry()
+        korean_font = registry.get_korean_font()
+        if korean_font:
+            bold_font = registry.get_bold_font() if bold else None
+            if bold and not bold_font:
+                canvas_obj.saveState()
+                canvas_obj.setFont(korean_font, font_size)
+                canvas_obj.setLineWidth(font_size * FAUX_BOLD_STROKE)
+                canvas_obj.drawString(x, y, safe_text, mode=2)
+                canvas_obj.restoreState()
+            else:
+                canvas_obj.setFont(bold_font or korean_font, font_size)
+                canvas_obj.drawString(x, y, safe_text)
+        else:
+            # 한글이 있으면 대체 문자 사용
+            canvas_obj.setFont('Helvetica-Bold' if bold else 'Helvetica', font_size)
+            canvas_obj.drawString(x, y, replace_hangul(safe_text))
+
+    except Exception as e:
+        try:
+            canvas_obj.setFont('Helvetica', 8)
+            canvas_obj.drawString(x, y, "[Error]")
+        except:
+            pass
+
+
+class TextRunWriter:
+    """
+    한 페이지 영역의 텍스트 줄을 text object 하나(BT ... ET)로 모아서 그림
+
+    줄마다 drawString을 부르면 줄마다 text object, 폰트 지정(Tf/TL),
+    위치 지정(Tm)이 반복된다. 여기서는 폰트와 줄 간격이 바뀔 때만 지정하고,
+    바로 앞 줄 아래에 이어지는 줄은 T*(다음 줄)만 쓴다.
+    텍스트는 호출하는 쪽에서 미리 정규화해서 넘긴다.
+    """
+
+    def __init__(self, canvas_obj):
+        self.canvas = canvas_obj
+        self._text = None
+        self._font = None        # (폰트 이름, 크기)
+        self._leading = None
+        self._line_width = None  # 굵게 흉내용 외곽선 두께
+
+    def line(self, x, y, text, font_name, font_size, leading, faux_bold=False):
+        """(x, y)에 한 줄 추가 (다음 줄은 leading만큼 아래로 이어짐)"""
+        if faux_bold:
+            line_width = font_size * FAUX_BOLD_STROKE
+            if line_width != self._line_width:
+                # 선 두께는 text object 밖에서 바꿈
+                self.flush()
+                self.canvas.setLineWidth(line_width)
+                self._line_width = line_width
+
+        text_obj = self._text
+        if text_obj is None:
+            text_obj = self._text = self.canvas.beginText(x, y)
+        elif text_obj.getX() != x or abs(text_obj.getY() - y) > 0.001:
+            text_obj.setTextOrigin(x, y)
+
+        if self._font != (font_name, font_size):
+            text_obj.setFont(font_name, font_size, leading)
+            self._font = (font_name, font_size)
+            self._leading = leading
+        elif self._leading != leading:
+            text_obj.setLeading(leading)
+            self._leading = leading
+
+        text_obj.setTextRenderMode(2 if faux_bold else 0)
+        text_obj.textLine(text)
+
+    def flush(self):
+        """모은 줄을 캔버스에 씀 (이미지를 그리기 전, 페이지를 넘기기 전에 호출)"""
+        if self._text is not None:
+            # 렌더링 모드는 text object가 끝나도 유지되므로 되돌림
+            self._text.setTextRenderMode(0)
+            self.canvas.drawText(self._text)
+            self._text = None
+            self._font = None
+            self._leading = None
+
+    def new_page(self):
+        self.flush()
+        self._line_width = None
+
+
+class DocxPdfRenderer:
+    """DOCX 요소 스트림을 받아 PDF 페이지를 순서대로 그리는 렌더러"""
+
+    def __init__(self, output_path, orientation='portrait', max_pages=DEFAULT_MAX_PAGES,
+                 time_budget=DEFAULT_TIME_BUDGET, image_store=None):
+        # PDF 페이지 크기 설정
+        if orientation == 'landscape':
+            self.page_size = landscape(A4)
+            self.base_font_size = 10
+            self.line_height_base = 16
+        else:
+            self.page_size = portrait(A4)
+            self.base_font_size = 11
+            self.line_height_base = 18
+
+        self.output_path = output_path
+        self.orientation = orientation
+        self.max_pages = max_pages
+        self.time_budget = time_budget
+        self.image_store = image_store or ImageStore()
+
+        self.width, self.height = self.page_size
+        self.margin_left = MARGIN
+        self.margin_right = self.width - MARGIN
+        self.margin_top = self.height - MARGIN
+        self.margin_bottom = MARGIN
+        self.text_width = self.margin_right - self.margin_left
+
+        # 본문 폰트 (줄바꿈 폭 계산과 그리기에 같이 사용)
+        registry = get_font_registry()
+        self.korean_font = registry.get_korean_font()
+        if self.korean_font:
+            bold_font = registry.get_bold_font()
+            self.body_font = self.korean_font
+            self.bold_font = bold_font or self.korean_font
+            self.faux_bold = bold_font is None  # 굵은 글꼴이 없으면 외곽선으로 굵게
+        else:
+            self.body_font, self.bold_font, self.faux_bold = 'Helvetica', 'Helvetica-Bold', False
+
+        self.canvas = None
+        self.text_runs = None
+        self.y_pos = self.margin_top
+        self.page_count = 0
+        self.item_count = 0
+        self.image_count = 0
+        self._deadline = None
+
+    def render(self, elements, on_progress=None):
+        """
+        요소 스트림을 끝까지 그리고 PDF 저장
+
+        Args:
+            elements (iterable): DocxReader.iter_elements()가 생성하는 요소
+            on_progress (callable): 요소마다 on_progress(element) 호출
+
+        Returns:
+            dict: {'pages', 'items', 'images'}
+
+        Raises:
+            RenderBudgetError: 페이지 수 또는 시간 한도를 넘은 경우
+        """
+        self._deadline = time.monotonic() + self.time_budget if self.time_budget else None
+        self.canvas = canvas.Canvas(self.output_path, pagesize=self.page_size, pageCompression=1)
+        self.text_runs = TextRunWriter(self.canvas)
+        self.page_count = 1
+
+        print(f"📄 PDF 생성: {self.width:.0f} x {self.height:.0f} ({self.orientation})")
+
+        for element in elements:
+            self._check_time()
+            try:
+                if element['type'] == 'paragraph':
+                    self._draw_paragraph(element)
+                elif element['type'] == 'image':
+                    self._draw_image(element)
+                elif element['type'] == 'table':
+                    self._draw_table(element)
+                else:
+                    continue
+                self.item_count += 1
+            except RenderBudgetError:
+                raise
+            except Exception as e:
+                print(f"항목 처리 오류: {e}")
+
+            if on_progress:
+                on_progress(element)
+
+        self.text_runs.flush()
+        self.canvas.save()
+        return {'pages': self.page_count, 'items': self.item_count, 'images': self.image_count}
+
+    # ---------------- 한도 / 페이지 ----------------
+
+    def _check_time(self):
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            raise RenderBudgetError(
+                f"변환 시간 한도({self.time_budget}초)를 넘었습니다 "
+                f"({self.page_count}페이지까지 처리). 문서를 나눠서 변환하세요.")
+
+    def _new_page(self):
+        if self.page_count >= self.max_pages:
+            raise RenderBudgetError(
+                f"PDF 페이지 수 한도({self.max_pages}페이지)를 넘었습니다. 문서를 나눠서 변환하세요.")
+        self.text_runs.new_page()
+        self.canvas.showPage()
+        self.page_count += 1
+        self.y_pos = self.margin_top
+
+    def _ensure_space(self, required):
+        """남은 높이가 required보다 작으면 새 페이지"""
+        if self.y_pos - required < self.margin_bottom:
+            self._new_page()
+
+    # ---------------- 요소별 그리기 ----------------
+
+    def _prepare_text(self, text, single_line=False):
+        """
+        문단 단위로 한 번만 정규화 (한글 폰트가 없으면 대체 문자로)
+
+        Args:
+            single_line (bool): 줄바꿈/탭을 공백으로 (표 행, 제목처럼 한 줄로 그리는 텍스트)
+        """
+        text = safe_korean_text(text)
+        if single_line:
+            text = ' '.join(text.split())
+        return text if self.korean_font else replace_hangul(text)
+
+    def _draw_paragraph(self, element):
+        text = self._prepare_text(element['content'])
+        if not text:
+            return
+
+        font_size = element.get('font_size', self.base_font_size)
+        style = element.get('style', 'Normal')
+        is_heading = 'Heading' in style or 'Title' in style
+        bold = element.get('is_bold', False) or is_heading
+        font_name = self.bold_font if bold else self.body_font
+        faux_bold = bold and self.faux_bold
+
+        # 줄 높이 조정 (폰트 크기에 비례)
+        line_height = max(self.line_height_base, int(font_size * 1.4))
+
+        # 제목 스타일 추가 간격
+        if is_heading:
+            self.y_pos -= 15
+
+        # 실제 글자 폭으로 줄 단위 분할 (단어/한글 음절 경계)
+        for line in layout_paragraph(text, font_name, font_size, self.text_width):
+            self._ensure_space(line_height)
+            self.text_runs.line(self.margin_left, self.y_pos, line.text,
+                                font_name, font_size, line_height, faux_bold)
+            self.y_pos -= line_height
+
+        # 문단 간격 (스타일에 따라)
+        self.y_pos -= 15 if is_heading else 8
+
+    def _draw_image(self, element):
+        """원본 비율을 유지해서 가운데 정렬 (JPEG는 원본 그대로 포함)"""
+        self.text_runs.flush()
+        self.image_count += 1
+        try:
+            img_reader, img_width, img_height = self.image_store.get_reader(element['blob'])
+        except Exception as e:
+            print(f"이미지 {element['name']} 읽기 오류: {e}")
+            self._ensure_space(self.line_height_base)
+            draw_korean_text(self.canvas, self.margin_left, self.y_pos,
+                             f"[이미지 {self.image_count} - 지원하지 않는 형식]", self.base_font_size)
+            self.y_pos -= self.line_height_base
+            return
+
+        # 이미지 크기 계산 (원본 비율 유지)
+        aspect_ratio = img_width / img_height
+        max_width = self.text_width * 0.8  # 본문 너비의 80%
+        max_height = (self.margin_top - self.margin_bottom) * 0.6  # 본문 높이의 60%
+        if max_width / aspect_ratio <= max_height:
+            final_width, final_height = max_width, max_width / aspect_ratio
+        else:
+            final_width, final_height = max_height * aspect_ratio, max_height
+
+        # 이미지 여백 설정
+        image_margin_top = 20
+        image_margin_bottom = 15
+        self._ensure_space(final_height + image_margin_top + image_margin_bottom)
+
+        image_x = self.margin_left + (self.text_width - final_width) / 2
+        try:
+            # 투명도는 소프트 마스크로 유지
+            with raw_image_streams():
+                self.canvas.drawImage(img_reader, image_x, self.y_pos - final_height,
+                                      width=final_width, height=final_height,
+                                      preserveAspectRatio=True, anchor='c', mask='auto')
+            self.y_pos -= final_height + image_margin_bottom
+        except Exception as e:
+            print(f"이미지 그리기 오류: {e}")
+            draw_korean_text(self.canvas, self.margin_left, self.y_pos,
+                             f"[이미지 {self.image_count} - 로드 실패]", self.base_font_size)
+            self.y_pos -= self.line_height_base * 2
+
+    def _draw_table(self, element):
+        # 표 제목
+        self._ensure_space(self.line_height_base)
+        title = self._prepare_text(f"[표 {element['index'] + 1}]", single_line=True)
+        self.text_runs.line(self.margin_left, self.y_pos, title,
+                            self.bold_font, self.base_font_size + 1, self.line_height_base + 5,
+                            self.faux_bold)
+        self.y_pos -= self.line_height_base + 5
+
+        # 표 내용 (한 행을 한 줄로, 폭을 넘으면 말줄임)
+        font_size = self.base_font_size - 1
+        for row in element['content']:
+            row_text = self._prepare_text(" | ".join(row), single_line=True)
+            if not row_text:
+                continue
+            self._ensure_space(self.line_height_base)
+            row_text = fit_text(row_text, self.body_font, font_size, self.text_width - 10)
+            self.text_runs.line(self.margin_left + 10, self.y_pos, row_text,
+                                self.body_font, font_size, self.line_height_base)
+            self.y_pos -= self.line_height_base
+
+        self.y_pos -= 10  # 표 간격
@@ -0,0 +1,278 @@
+"""
+DOCX 단일 패스 리더
+
+기존 DOCX → PDF 변환은 같은 파일을 세 번 열었다 (방향 감지용 Document,
+내용 추출용 Document, 이미지 추출용 ZipFile). 또 run마다 XPath로
+a:blip을 찾고, 이미지는 word/media/ 순서대로 문단에 배정했기 때문에
+실제로 이미지를 참조하는 위치와 어긋날 수 있었다.
+
+DocxReader는 패키지를 한 번만 파싱하고, 본문(w:body)의 자식 요소를
+순서대로 훑으면서 문단/표/이미지를 타입이 있는 dict로 하나씩 넘겨준다.
+이미지는 blip의 r:embed(rId)로 관계를 따라가 실제 이미지 파트를 찾는다.
+
+사용법:
+    reader = DocxReader('input.docx')
+    for element in reader.iter_elements():
+        if element['type'] == 'paragraph': ...
+        elif element['type'] == 'image': ...   # element['blob']에 원본 바이트
+        elif element['type'] == 'table': ...
+"""
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml.ns import qn
+from docx.parts.image import ImagePart
+
+W_P = qn('w:p')
+W_R = qn('w:r')
+W_TBL = qn('w:tbl')
+W_TR = qn('w:tr')
+W_TC = qn('w:tc')
+W_T = qn('w:t')
+W_TAB = qn('w:tab')
+W_BR = qn('w:br')
+W_CR = qn('w:cr')
+W_PPR = qn('w:pPr')
+W_PSTYLE = qn('w:pStyle')
+W_RPR = qn('w:rPr')
+W_SZ = qn('w:sz')
+W_B = qn('w:b')
+W_VAL = qn('w:val')
+A_BLIP = qn('a:blip')
+V_IMAGEDATA = '{urn:schemas-microsoft-com:vml}imagedata'
+R_EMBED = qn('r:embed')
+R_ID = qn('r:id')
+
+# 진행률에 세는 본문 블록 (block_count와 iter_elements의 'block'이 같은 기준)
+BLOCK_TAGS = (W_P, W_TBL)
+
+# 문단 안에서 run을 감싸는 요소 (하이퍼링크, 변경 내용 추적 등)
+RUN_CONTAINERS = {qn('w:hyperlink'), qn('w:ins'), qn('w:smartTag'), qn('w:fldSimple')}
+
+# 제목 스타일별 최소 글자 크기
+HEADING_FONT_SIZES = [
+    ('Heading 1', 18), ('Title', 18),
+    ('Heading 2', 16),
+    ('Heading 3', 14),
+    ('Heading 4', 12),
+]
+
+DEFAULT_FONT_SIZE = 11
+
+
+def _iter_runs(paragraph_element):
+    """문단의 run을 문서 순서대로 (텍스트 상자 안의 run은 제외)"""
+    for child in paragraph_element:
+        if child.tag == W_R:
+            yield child
+        elif child.tag in RUN_CONTAINERS:
+            for run in child.iter(W_R):
+                yield run
+
+
+def _run_text(run):
+    parts = []
+    for child in run:
+        if child.tag == W_T:
+            parts.append(child.text or '')
+        elif child.tag == W_TAB:
+            parts.append('\t')
+        elif child.tag in (W_BR, W_CR):
+            parts.append('\n')
+    return ''.join(parts)
+
+
+def _run_image_ids(run):
+    """run이 참조하는 이미지 관계 ID 목록 (DrawingML blip, VML imagedata)"""
+    ids = [blip.get(R_EMBED) for blip in run.iter(A_BLIP)]
+    ids.extend(data.get(R_ID) for data in run.iter(V_IMAGEDATA))
+    return [rid for rid in ids if rid]
+
+
+def _run_format(run):
+    """run의 직접 서식 (글자 크기 pt, 굵게 여부)"""
+    font_size = None
+    is_bold = False
+    rpr = run.find(W_RPR)
+    if rpr is not None:
+        sz = rpr.find(W_SZ)
+        if sz is not None and sz.get(W_VAL, '').isdigit():
+            font_size = int(sz.get(W_VAL)) // 2
+        b = rpr.find(W_B)
+        if b is not None and b.get(W_VAL, 'true') not in ('0', 'false', 'off'):
+            is_bold = True
+    return font_size, is_bold
+
+
+class DocxReader:
+    """DOCX 패키지를 한 번 파싱해서 본문 요소를 순서대로 제공"""
+
+    def __init__(self, docx_path):
+        self.document = Document(docx_path)
+        self._part = self.document.part
+        self._style_names = {style.style_id: style.name for style in self.document.styles}
+        default_style = self.document.styles.default(WD_STYLE_TYPE.PARAGRAPH)
+        self._default_style = default_style.name if default_style is not None else 'Normal'
+        self._image_info = {}  # 이미지 파트 이름 -> (가로, 세로) 픽셀
+
+    @property
+    def block_count(self):
+        """본문의 최상위 블록(문단, 표) 수 - 진행률 계산용 (sectPr 등은 세지 않음)"""
+        return sum(1 for child in self.document.element.body.iterchildren()
+                   if child.tag in BLOCK_TAGS)
+
+    @property
+    def orientation(self):
+        """첫 번째 섹션 기준 문서 방향 ('portrait' 또는 'landscape')"""
+        sections = self.document.sections
+        if len(sections) > 0:
+            section = sections[0]
+            if section.page_width and section.page_height and section.page_width > section.page_height:
+                return 'landscape'
+        return 'portrait'
+
+    def iter_elements(self):
+        """
+        본문 요소를 문서 순서대로 생성
+
+        Yields:
+            dict: 다음 중 하나 ('block'은 요소가 속한 본문 블록 번호)
+                {'type': 'paragraph', 'content', 'font_size', 'is_bold', 'style', 'index', 'block'}
+                {'type': 'image', 'blob', 'content_type', 'name', 'width', 'height', 'index', 'block'}
+                {'type': 'table', 'content', 'index', 'block'}
+        """
+        paragraph_index = 0
+        image_index = 0
+        table_index = 0
+
+        block_children = (child for child in self.document.element.body.iterchildren()
+                          if child.tag in BLOCK_TAGS)
+        for block, child in enumerate(block_children):
+            if child.tag == W_P:
+                for element in self._paragraph_elements(child, paragraph_index):
+                    if element['type'] == 'image':
+                        element['index'] = image_index
+                        image_index += 1
+                    element['block'] = block
+                    yield element
+                paragraph_index += 1
+
+            elif child.tag == W_TBL:
+                rows, images = self._table_content(child)
+                if rows:
+                    yield {'type': 'table', 'content': rows, 'index': table_index, 'block': block}
+                    table_index += 1
+                # 표 안의 이미지는 표 다음에 배치
+                for element in images:
+                    element['index'] = image_index
+                    element['block'] = block
+                    image_index += 1
+                    yield element
+
+    def _paragraph_elements(self, paragraph_element, index):
+        """문단 하나를 텍스트 조각과 이미지로 분리 (이미지 앞뒤 텍스트는 별도 문단)"""
+        style_name = self._paragraph_style(paragraph_element)
+        texts = []
+        first_run = None
+
+        for run in _iter_runs(paragraph_element):
+            image_ids = _run_image_ids(run)
+            if image_ids:
+                paragraph = self._paragraph(texts, first_run, style_name, index)
+                if paragraph:
+                    yield paragraph
+                texts, first_run = [], None
+                for rid in image_ids:
+                    image = self._image(rid)
+                    if image:
+                        yield image
+
+            text = _run_text(run)
+            if text:
+                if first_run is None:
+                    first_run = run
+                texts.append(text)
+
+        paragraph = self._paragraph(texts, first_run, style_name, index)
+        if paragraph:
+            yield paragraph
+
+    def _paragraph(self, texts, first_run, style_name, index):
+        """문단 요소 생성 (공백뿐이면 None)"""
+        text = ''.join(texts).strip()
+        if not text:
+            return None
+
+        # 첫 번째 run의 서식 사용, 제목 스타일은 최소 크기 보장
+        font_size, is_bold = _run_format(first_run)
+        font_size = font_size or DEFAULT_FONT_SIZE
+        for heading, min_size in HEADING_FONT_SIZES:
+            if heading in style_name:
+                font_size = max(font_size, min_size)
+                break
+
+        return {
+            'type': 'paragraph',
+            'content': text,
+            'font_size': font_size,
+            'is_bold': is_bold,
+            'style': style_name,
+            'index': index,
+        }
+
+    def _paragraph_style(self, paragraph_element):
+        ppr = paragraph_element.find(W_PPR)
+        if ppr is not None:
+            pstyle = ppr.find(W_PSTYLE)
+            if pstyle is not None:
+                return self._style_names.get(pstyle.get(W_VAL), self._default_style)
+        return self._default_style
+
+    def _table_content(self, table_element):
+        """표의 행별 셀 텍스트와 셀 안의 이미지"""
+        rows = []
+        images = []
+        for tr in table_element.iterchildren(W_TR):
+            row = []
+            for tc in tr.iterchildren(W_TC):
+                cell_texts = []
+                for paragraph in tc.iterchildren(W_P):
+                    texts = []
+                    for run in _iter_runs(paragraph):
+                        for rid in _run_image_ids(run):
+                            image = self._image(rid)
+                            if image:
+                                images.append(image)
+                        texts.append(_run_text(run))
+                    cell_texts.append(''.join(texts))
+                cell_text = '\n'.join(cell_texts).strip()
+                if cell_text:
+                    row.append(cell_text)
+            if row:
+                rows.append(row)
+        return rows, images
+
+    def _image(self, rid):
+        """관계 ID로 이미지 파트를 찾아 이미지 요소 생성 (외부 링크 이미지는 None)"""
+        part = self._part.related_parts.get(rid)
+        if not isinstance(part, ImagePart):
+            return None
+
+        partname = str(part.partname)
+        if partname not in self._image_info:
+            try:
+                # 헤더만 읽어서 크기 확인 (디코딩 없음)
+                image = part.image
+                self._image_info[partname] = (image.px_width, image.px_height)
+            except Exception:
+                self._image_info[partname] = (None, None)
+        width, height = self._image_info[partname]
+
+        return {
+            'type': 'image',
+            'blob': part.blob,
+            'content_type': part.content_type,
+            'name': partname.lstrip('/'),
+            'width': width,
+            'height': height,
+        }
@@ -0,0 +1,334 @@
+"""
+한글 폰트 레지스트리
+
+기존에는 final_server import 시점에 GitHub에서 NanumGothic.ttf를 최대
+30초 동안 내려받고, 프로세스마다 reportlab에 TTF를 다시 등록했다. 그래서
+콜드 스타트가 느리고 오프라인 환경에서는 동작하지 않았다.
+
+여기서는 네트워크를 사용하지 않는다.
+- 설정한 로컬 폰트 디렉토리(FONT_DIR, 기본값 fonts/)와 시스템 폰트 경로에서
+  폰트를 찾는다.
+- .woff2는 fontTools(+brotli, requirements.txt에 포함)로 fonts/.cache/에 TTF로 한 번만
+  풀어 둔다. preload()는 한글 폰트를 하나도 찾지 못하면 FontNotFoundError를 낸다.
+- 찾은 폰트와 한글 글리프 커버리지를 fonts/.cache/font_index.json에 저장해서,
+  다음 실행에서는 폰트 파일을 다시 파싱하지 않는다.
+- reportlab 등록은 처음 사용할 때 한 번만 한다. 프리포크 서버에서는 마스터
+  프로세스가 preload()를 호출하면 fork된 워커가 등록 상태를 그대로 공유한다.
+"""
+
+import json
+import os
+import threading
+
+FONT_DIR = os.environ.get('FONT_DIR', 'fonts')
+CACHE_DIRNAME = '.cache'
+INDEX_FILENAME = 'font_index.json'
+
+FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc', '.woff2')
+
+# 폰트 디렉토리에 없을 때 찾아볼 시스템 폰트 (경로, 등록 이름, 표시 이름)
+SYSTEM_FONTS = [
+    (r'C:\Windows\Fonts\malgun.ttf', 'Malgun', '맑은 고딕'),
+    (r'C:\Windows\Fonts\malgunbd.ttf', 'MalgunBold', '맑은 고딕 Bold'),
+    (r'C:\Windows\Fonts\gulim.ttc', 'Gulim', '굴림'),
+    (r'C:\Windows\Fonts\batang.ttc', 'Batang', '바탕'),
+    ('/usr/share/fonts/truetype/nanum/NanumGothic.ttf', 'NanumGothic', '나눔고딕'),
+    ('/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf', 'NanumGothicBold', '나눔고딕 Bold'),
+]
+
+DISPLAY_NAMES = {
+    'NanumGothic': '나눔고딕',
+    'NanumGothicBold': '나눔고딕 Bold',
+    'Malgun': '맑은 고딕',
+    'MalgunBold': '맑은 고딕 Bold',
+}
+
+# 같은 커버리지일 때 우선 사용할 폰트 순서
+PREFERRED_FONTS = ['NanumGothic', 'Malgun']
+
+# 본문 폰트 이름에 붙여서 찾아볼 굵은 글꼴 이름 (NanumGothic -> NanumGothicBold)
+BOLD_SUFFIXES = ['Bold', '-Bold', '_Bold', 'bd', ' Bold']
+# 본문 폰트마다 따로 정해진 굵은 글꼴 이름
+BOLD_FONT_NAMES = {'Malgun': 'MalgunBold'}
+
+HANGUL_SYLLABLES = range(0xAC00, 0xD7A4)
+MIN_HANGUL_COVERAGE = 0.9
+
+
+class FontNotFoundError(Exception):
+    """사용할 수 있는 한글 폰트가 없음"""
+
+
+def _decompress_woff2(woff2_path, ttf_path):
+    """woff2를 TTF로 변환 (fontTools와 brotli가 있을 때만)"""
+    try:
+        from fontTools.ttLib import TTFont as FontToolsFont
+        import brotli  # noqa: F401 - fontTools의 woff2 압축 해제에 필요
+    except ImportError as e:
+        print(f"⚠️ {e.name} 없음 - {os.path.basename(woff2_path)} 건너뜀 (pip install -r requirements.txt)")
+        return False
+
+    try:
+        font = FontToolsFont(woff2_path)
+        font.flavor = None
+        tmp_path = f"{ttf_path}.{os.getpid()}.tmp"
+        font.save(tmp_path)
+        os.replace(tmp_path, ttf_path)
+        return True
+    except Exception as e:
+        print(f"⚠️ woff2 변환 실패 ({woff2_path}): {e}")
+        return False
+
+
+def _inspect_font(ttf_path):
+    """TTF의 글리프 수와 한글 음절 커버리지 계산"""
+    from reportlab.pdfbase.ttfonts import TTFontFile
+
+    font_file = TTFontFile(ttf_path)
+    char_map = font_file.charToGlyph
+    hangul = sum(1 for code in HANGUL_SYLLABLES if code in char_map)
+    return {
+        'glyph_count': len(char_map),
+        'hangul_coverage': round(hangul / len(HANGUL_SYLLABLES), 4),
+    }
+
+
+class FontRegistry:
+    """로컬 폰트 검색, 커버리지 색인, reportlab 지연 등록"""
+
+    def __init__(self, font_dir=FONT_DIR, system_fonts=SYSTEM_FONTS):
+        self.font_dir = font_dir
+        self.cache_dir = os.path.join(font_dir, CACHE_DIRNAME)
+        self.index_path = os.path.join(self.cache_dir, INDEX_FILENAME)
+        self.system_fonts = system_fonts
+
+        self._fonts = None          # 등록 이름 -> 색인 항목
+        self._registered = set()
+        self._korean_font = None
+        self._korean_font_resolved = False
+        self._bold_font = None
+        self._bold_font_resolved = False
+        self._lock = threading.RLock()
+
+    # ---------------- 검색 / 색인 ----------------
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self, index):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"폰트 색인 저장 실패 (무시됨): {e}")
+
+    def _candidates(self):
+        """(원본 경로, 등록 이름, 표시 이름) 목록"""
+        candidates = []
+        if os.path.isdir(self.font_dir):
+            for filename in sorted(os.listdir(self.font_dir)):
+                stem, ext = os.path.splitext(filename)
+                if ext.lower() in FONT_EXTENSIONS:
+                    candidates.append((os.path.join(self.font_dir, filename), stem,
+                                       DISPLAY_NAMES.get(stem, stem)))
+        candidates.extend(self.system_fonts)
+        return candidates
+
+    def _resolve_ttf(self, source_path):
+        """reportlab이 읽을 수 있는 TTF 경로 (woff2는 캐시에 변환)"""
+        if not source_path.lower().endswith('.woff2'):
+            return source_path
+
+        stem = os.path.splitext(os.path.basename(source_path))[0]
+        ttf_path = os.path.join(self.cache_dir, f"{stem}.ttf")
+        if (os.path.exists(ttf_path)
+                and os.path.getmtime(ttf_path) >= os.path.getmtime(source_path)):
+            return ttf_path
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return ttf_path if _decompress_woff2(source_path, ttf_path) else None
+
+    def discover(self):
+        """
+        폰트 검색 및 색인 갱신 (파일 크기/수정 시각이 같으면 색인 재사용)
+
+        Returns:
+            dict: 등록 이름 -> {'path', 'display_name', 'glyph_count', 'hangul_coverage'}
+        """
+        with self._lock:
+            if self._fonts is not None:
+                return self._fonts
+
+            old_index = self._load_index()
+            index = {}
+            fonts = {}
+
+            for source_path, name, display_name in self._candidates():
+                if name in fonts or not os.path.exists(source_path):
+                    continue
+
+                stat = os.stat(source_path)
+                entry = old_index.get(source_path)
+                if not (entry and entry.get('size') == stat.st_size
+                        and entry.get('mtime') == stat.st_mtime
+                        and entry.get('path') and os.path.exists(entry['path'])):
+                    ttf_path = self._resolve_ttf(source_path)
+                    if not ttf_path:
+                        continue
+                    try:
+                        info = _inspect_font(ttf_path)
+                    except Exception as e:
+                        print(f"폰트 분석 실패 ({source_path}): {e}")
+                        continue
+                    entry = {
+                        'name': name,
+                        'display_name': display_name,
+                        'path': ttf_path,
+                        'size': stat.st_size,
+                        'mtime': stat.st_mtime,
+                        **info,
+                    }
+
+                index[source_path] = entry
+                fonts[name] = entry
+
+            if index != old_index:
+                self._save_index(index)
+
+            self._fonts = fonts
+            return fonts
+
+    # ---------------- 등록 ----------------
+
+    def register(self, name):
+        """폰트를 reportlab에 등록 (이미 등록되어 있으면 생략)"""
+        with self._lock:
+            if name in self._registered:
+                return True
+
+            entry = self.discover().get(name)
+            if not entry:
+                return False
+
+            from reportlab.pdfbase import pdfmetrics
+            from reportlab.pdfbase.ttfonts import TTFont
+
+            try:
+                pdfmetrics.registerFont(TTFont(name, entry['path']))
+            except Exception as e:
+                print(f"{entry['display_name']} 등록 실패: {e}")
+                return False
+
+            self._registered.add(name)
+            print(f"✅ 한글 폰트 등록: {entry['display_name']} ({name})")
+            return True
+
+    def get_korean_font(self):
+        """
+        한글 본문 폰트 이름 (처음 호출할 때 선택 및 등록)
+
+        Returns:
+            str: 등록된 폰트 이름, 사용할 수 있는 한글 폰트가 없으면 None
+        """
+        if self._korean_font_resolved:
+            return self._korean_font
+
+        with self._lock:
+            if self._korean_font_resolved:
+                return self._korean_font
+
+            fonts = self.discover()
+            usable = [name for name, entry in fonts.items()
+                      if entry['hangul_coverage'] >= MIN_HANGUL_COVERAGE
+                      and 'bold' not in name.lower()]
+            usable.sort(key=lambda name: (
+                PREFERRED_FONTS.index(name) if name in PREFERRED_FONTS else len(PREFERRED_FONTS),
+                -fonts[name]['hangul_coverage'],
+            ))
+
+            self._korean_font = next((name for name in usable if self.register(name)), None)
+            if self._korean_font is None:
+                print("⚠️ 한글 폰트 등록 실패, 기본 폰트 사용")
+            self._korean_font_resolved = True
+            return self._korean_font
+
+    def get_bold_font(self):
+        """
+        한글 본문 폰트의 굵은 글꼴 이름 (처음 호출할 때 등록)
+
+        찾으면 reportlab 폰트 패밀리(normal/bold)로 묶어서 등록한다.
+
+        Returns:
+            str: 등록된 굵은 글꼴 이름, 없으면 None (호출하는 쪽에서 굵게 흉내)
+        """
+        if self._bold_font_resolved:
+            return self._bold_font
+
+        with self._lock:
+            if self._bold_font_resolved:
+                return self._bold_font
+
+            regular = self.get_korean_font()
+            if regular:
+                fonts = self.discover()
+                names = [BOLD_FONT_NAMES.get(regular)] + [regular + suffix for suffix in BOLD_SUFFIXES]
+                self._bold_font = next((name for name in names
+                                        if name in fonts and self.register(name)), None)
+
+            if self._bold_font:
+                from reportlab.pdfbase import pdfmetrics
+
+                pdfmetrics.registerFontFamily(regular, normal=regular, bold=self._bold_font,
+                                              italic=regular, boldItalic=self._bold_font)
+            elif regular:
+                print("ℹ️ 굵은 한글 폰트 없음 - 굵은 글씨는 외곽선을 더해서 표현")
+            self._bold_font_resolved = True
+            return self._bold_font
+
+    def available_fonts(self):
+        """검색된 폰트 목록 (등록하지 않음)"""
+        return {name: {'path': entry['path'], 'display_name': entry['display_name'],
+                       'hangul_coverage': entry['hangul_coverage']}
+                for name, entry in self.discover().items()}
+
+    def preload(self, required=True):
+        """
+        폰트 검색과 등록을 미리 수행
+
+        프리포크 서버의 마스터 프로세스에서 호출하면 워커는 fork 시점의
+        등록 상태를 공유하므로 각자 TTF를 다시 파싱하지 않는다.
+
+        Args:
+            required (bool): 한글 폰트가 없으면 예외 (False면 기본 폰트로 계속)
+
+        Raises:
+            FontNotFoundError: required이고 사용할 수 있는 한글 폰트가 없는 경우
+        """
+        korean_font = self.get_korean_font()
+        if korean_font is None and required:
+            raise FontNotFoundError(
+                f"한글 폰트를 찾을 수 없습니다 ({self.font_dir}/, 시스템 폰트). "
+                f"fonts/NanumGothic.woff2를 쓰려면 fonttools와 brotli가 필요합니다 "
+                f"(pip install -r requirements.txt). TTF를 {self.font_dir}/에 두어도 됩니다.")
+        self.get_bold_font()
+        return korean_font
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_font_registry():
+    """프로세스 전역 폰트 레지스트리"""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = FontRegistry()
+        return _default_registry
@@ -0,0 +1,115 @@
+"""
+DOCX 이미지 → reportlab 이미지 파이프라인 (메모리 내 처리)
+
+기존에는 word/media/의 모든 이미지를 PIL로 디코딩하고, 알파 채널을
+흰 배경에 합친 뒤 JPEG(품질 90)로 다시 인코딩해서 uploads/에 저장했고,
+그리기 단계에서 ImageReader(image_path)로 다시 열었다. 사진이 많은
+문서에서는 이 디코딩/인코딩/쓰기/읽기가 변환 시간의 대부분이었다.
+
+여기서는 원본 압축 바이트를 메모리에 그대로 둔다.
+- JPEG는 디코딩 없이 원본 바이트를 PDF에 그대로 넣는다 (DCTDecode)
+- PNG/GIF/BMP 등은 reportlab이 필요할 때 한 번만 디코딩한다
+  (투명도는 mask='auto'로 그릴 때 소프트 마스크로 유지)
+- 같은 내용의 이미지는 해시로 묶어서 리더를 공유하고, PDF에는 한 번만 포함된다
+- 이미지 스트림을 ASCII85로 다시 인코딩하지 않는다 (raw_image_streams() 블록 안의
+  drawImage에서만, reportlab 전역 설정은 그 뒤 복원)
+"""
+
+import hashlib
+import io
+import threading
+from contextlib import contextmanager
+
+from reportlab import rl_config
+from reportlab.lib.utils import ImageReader
+
+_raw_streams_lock = threading.Lock()
+_raw_streams_depth = 0
+_saved_use_a85 = None
+
+
+@contextmanager
+def raw_image_streams():
+    """
+    이 블록 안에서 만드는 이미지 XObject는 ASCII85 없이 넣음
+
+    reportlab은 기본으로 이미지 스트림을 ASCII85로 다시 인코딩한다. C 가속
+    모듈(rl_accel)이 없으면 순수 파이썬으로 처리해서 JPEG 원본을 넣어도
+    이미지당 수 초가 걸리고, 결과 파일도 25% 커진다. 이 설정(rl_config.useA85)은
+    프로세스 전역이고 drawImage() 안에서 XObject를 만들 때 읽으므로, 그 호출
+    동안만 끄고 마지막 블록이 끝나면 원래 값으로 되돌린다 (여러 스레드가 겹쳐도
+    처음 값으로 복원).
+    """
+    global _raw_streams_depth, _saved_use_a85
+
+    with _raw_streams_lock:
+        if _raw_streams_depth == 0:
+            _saved_use_a85 = rl_config.useA85
+            rl_config.useA85 = 0
+        _raw_streams_depth += 1
+    try:
+        yield
+    finally:
+        with _raw_streams_lock:
+            _raw_streams_depth -= 1
+            if _raw_streams_depth == 0:
+                rl_config.useA85 = _saved_use_a85
+
+
+class JpegPassthroughReader(ImageReader):
+    """
+    JPEG 원본 바이트를 디코딩하지 않고 그대로 넘겨주는 ImageReader
+
+    Canvas.drawImage()는 XObject 이름을 만들기 위해 getRGBData()로 전체
+    픽셀을 디코딩한다. 여기서는 그 대신 원본 바이트의 해시를 돌려주므로
+    디코딩이 일어나지 않고, 같은 JPEG는 같은 이름으로 한 번만 포함된다.
+    """
+
+    def __init__(self, data, digest):
+        self._digest = digest
+        # ImageReader가 PIL로 헤더만 읽고, JPEG이면 jpeg_fh로 원본 스트림을 넘겨준다
+        super().__init__(io.BytesIO(data), ident=digest[:12])
+        if getattr(self._image, 'format', None) != 'JPEG':
+            raise ValueError('JPEG 이미지가 아닙니다')
+
+    def getRGBData(self):
+        self._dataA = None
+        return f"jpeg:{self._digest}".encode('ascii')
+
+
+class ImageStore:
+    """한 문서 변환 동안 이미지 리더를 내용 해시로 공유"""
+
+    def __init__(self):
+        self._readers = {}  # 내용 해시 -> ImageReader
+        self.passthrough_count = 0
+        self.decoded_count = 0
+
+    def get_reader(self, blob):
+        """
+        이미지 바이트로 reportlab ImageReader 생성 (같은 내용이면 재사용)
+
+        Returns:
+            tuple: (ImageReader, 가로 픽셀, 세로 픽셀)
+
+        Raises:
+            PIL/reportlab이 열 수 없는 형식(EMF, WMF, SVG 등)이면 예외 발생
+        """
+        digest = hashlib.sha256(blob).hexdigest()
+        reader = self._readers.get(digest)
+        if reader is None:
+            if blob[:2] == b'\xff\xd8':  # JPEG SOI 마커 (content type보다 정확)
+                reader = JpegPassthroughReader(blob, digest)
+                self.passthrough_count += 1
+            else:
+                # 헤더만 확인하고, 픽셀 디코딩은 reportlab이 처음 그릴 때 한 번
+                reader = ImageReader(io.BytesIO(blob))
+                self.decoded_count += 1
+            self._readers[digest] = reader
+
+        width, height = reader.getSize()
+        return reader, width, height
+
+    @property
+    def unique_count(self):
+        return len(self._readers)
@@ -0,0 +1,301 @@
+"""
+변환 작업 큐
+
+/convert 요청 스레드에서 변환을 끝까지 수행하면 큰 PDF 하나가 Flask
+워커를 몇 분씩 붙잡고, 프록시 타임아웃이 발생한다. 여기서는 작업을
+제한된 크기의 워커 풀에 넣고 작업 ID만 바로 돌려준다. 클라이언트는
+/jobs/<id>로 상태를 조회하고 /jobs/<id>/result로 결과를 받는다.
+
+동시에 실행 중인 작업 + 대기 중인 작업 수가 (workers + max_queued)를
+넘으면 QueueFullError를 발생시켜 서버가 부하 상황에서 503으로 거절할
+수 있게 한다.
+
+state_dir을 지정하면 작업 상태를 <state_dir>/<id>.json에도 기록한다.
+여러 워커 프로세스로 서비스할 때 작업을 받은 프로세스가 아닌 다른
+워커가 상태 조회나 결과 다운로드 요청을 받아도 응답할 수 있다.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+
+class QueueFullError(Exception):
+    """작업 큐가 가득 찼을 때 발생"""
+
+
+class ConversionJob:
+    """변환 작업 하나의 상태"""
+
+    def __init__(self, filename=None):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.status = JOB_QUEUED
+        self.page = 0
+        self.total_pages = 0
+        self.error = None
+        self.output_path = None
+        self.download_name = None
+        self.cached = False
+        self.fallback = False  # 변환 실패로 대체 문서를 만든 경우 (캐시하지 않음)
+        self.created_at = time.time()
+        self.finished_at = None
+        self.on_progress = None  # 진행 상황 갱신 시 호출 (상태 파일 기록용)
+
+    def set_progress(self, page, total_pages):
+        """진행 상황 갱신 (변환 함수에서 호출)"""
+        self.page = page
+        self.total_pages = total_pages
+        if self.on_progress:
+            self.on_progress(self)
+
+    @property
+    def finished(self):
+        return self.status in (JOB_DONE, JOB_FAILED)
+
+    def to_dict(self):
+        data = {
+            'job_id': self.id,
+            'status': self.status,
+            'filename': self.filename,
+            'page': self.page,
+            'total_pages': self.total_pages,
+        }
+        if self.status == JOB_RUNNING and self.total_pages:
+            data['message'] = f"{self.page}/{self.total_pages} 페이지 처리 중"
+        if self.status == JOB_DONE:
+            data['download_name'] = self.download_name
+            data['cached'] = self.cached
+        if self.status == JOB_FAILED:
+            data['error'] = self.error
+        return data
+
+    def to_state(self):
+        """상태 파일에 기록할 전체 필드"""
+        return {
+            'id': self.id,
+            'filename': self.filename,
+            'status': self.status,
+            'page': self.page,
+            'total_pages': self.total_pages,
+            'error': self.error,
+            'output_path': self.output_path,
+            'download_name': self.download_name,
+            'cached': self.cached,
+            'fallback': self.fallback,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """상태 파일 내용으로 작업 객체 복원 (조회 전용)"""
+        job = cls(filename=state.get('filename'))
+        for key, value in state.items():
+            setattr(job, key, value)
+        return job
+
+
+class JobQueue:
+    """제한된 워커 풀과 대기열 길이를 가진 변환 작업 큐"""
+
+    # 진행 상황은 이 간격(초)보다 자주 상태 파일에 기록하지 않음
+    PROGRESS_WRITE_INTERVAL = 0.5
+
+    def __init__(self, workers=2, max_queued=8, retention_seconds=3600, state_dir=None):
+        self.workers = max(1, int(workers))
+        self.max_queued = max(0, int(max_queued))
+        self.retention_seconds = retention_seconds
+        self.state_dir = state_dir
+        self.completed_count = 0  # 이 프로세스에서 실행을 마친 작업 수
+
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+            self._cleanup_state_dir()
+
+        self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix='convert')
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queued)
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, filename=None, on_finish=None, **kwargs):
+        """
+        변환 작업 등록
+
+        Args:
+            func (callable): func(job, *args, **kwargs) 형태로 호출되며
+                (output_path, download_name)을 반환해야 한다.
+            filename (str): 상태 응답에 표시할 원본 파일명
+            on_finish (callable): 성공/실패와 관계없이 작업 종료 후 on_finish(job) 호출
+
+        Returns:
+            ConversionJob: 등록된 작업
+
+        Raises:
+            QueueFullError: 실행 중 + 대기 중 작업 수가 한도를 넘은 경우
+        """
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError('변환 대기열이 가득 찼습니다')
+
+        job = ConversionJob(filename=filename)
+        job.on_progress = self._on_progress
+        with self._lock:
+            self._expire_finished()
+            self._jobs[job.id] = job
+        self._write_state(job)
+
+        try:
+            self._executor.submit(self._run, job, func, args, kwargs, on_finish)
+        except Exception:
+            self._slots.release()
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            self._remove_state(job.id)
+            raise
+        return job
+
+    def add_finished(self, output_path, download_name, filename=None, cached=True):
+        """워커를 거치지 않고 이미 완료된 작업 등록 (캐시 적중 등)"""
+        job = ConversionJob(filename=filename)
+        job.output_path = output_path
+        job.download_name = download_name
+        job.cached = cached
+        job.status = JOB_DONE
+        job.finished_at = time.time()
+        with self._lock:
+            self._expire_finished()
+            self._jobs[job.id] = job
+        self._write_state(job)
+        return job
+
+    def get(self, job_id):
+        """작업 조회 (없으면 None, 다른 프로세스의 작업은 상태 파일에서 조회)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None and self.state_dir:
+            job = self._read_state(job_id)
+        return job
+
+    def is_idle(self):
+        """이 프로세스에 실행 중이거나 대기 중인 작업이 없는지 여부"""
+        with self._lock:
+            return all(job.finished for job in self._jobs.values())
+
+    def stats(self):
+        """큐 상태 요약"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return {
+            'workers': self.workers,
+            'max_queued': self.max_queued,
+            'queued': sum(1 for j in jobs if j.status == JOB_QUEUED),
+            'running': sum(1 for j in jobs if j.status == JOB_RUNNING),
+        }
+
+    def _run(self, job, func, args, kwargs, on_finish):
+        job.status = JOB_RUNNING
+        self._write_state(job)
+        try:
+            job.output_path, job.download_name = func(job, *args, **kwargs)
+            job.status = JOB_DONE
+        except Exception as e:
+            print(f"❌ 작업 {job.id} 실패: {e}")
+            job.error = str(e)
+            job.status = JOB_FAILED
+        finally:
+            job.finished_at = time.time()
+            self._write_state(job)
+            with self._lock:
+                self.completed_count += 1
+            self._slots.release()
+            if on_finish:
+                try:
+                    on_finish(job)
+                except Exception as e:
+                    print(f"작업 종료 처리 오류 (무시됨): {e}")
+
+    def _expire_finished(self):
+        """보관 기간이 지난 완료 작업 정리 (lock 보유 상태에서 호출)"""
+        cutoff = time.time() - self.retention_seconds
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+            self._remove_state(job_id)
+
+    # ---------------- 상태 파일 (멀티 프로세스 공유) ----------------
+
+    _JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+    def _state_path(self, job_id):
+        return os.path.join(self.state_dir, f"{job_id}.json")
+
+    def _on_progress(self, job):
+        now = time.time()
+        if (job.page >= job.total_pages
+                or now - getattr(job, '_state_written_at', 0) >= self.PROGRESS_WRITE_INTERVAL):
+            self._write_state(job)
+
+    def _write_state(self, job):
+        if not self.state_dir:
+            return
+        path = self._state_path(job.id)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(job.to_state(), f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            job._state_written_at = time.time()
+        except OSError as e:
+            print(f"작업 상태 기록 실패 (무시됨): {e}")
+
+    def _read_state(self, job_id):
+        if not self._JOB_ID_PATTERN.match(job_id):
+            return None
+        try:
+            with open(self._state_path(job_id), 'r', encoding='utf-8') as f:
+                job = ConversionJob.from_state(json.load(f))
+        except (OSError, ValueError):
+            return None
+        if job.finished and job.finished_at < time.time() - self.retention_seconds:
+            return None
+        return job
+
+    def _cleanup_state_dir(self):
+        """보관 기간이 지난 상태 파일 정리 (종료된 다른 프로세스의 작업 포함)"""
+        cutoff = time.time() - self.retention_seconds
+        for name in os.listdir(self.state_dir):
+            path = os.path.join(self.state_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _remove_state(self, job_id):
+        if not self.state_dir:
+            return
+        try:
+            os.remove(self._state_path(job_id))
+        except OSError:
+            pass
+
+
+def create_job_queue_from_env():
+    """환경 변수(CONVERT_WORKERS, CONVERT_QUEUE_DEPTH, JOB_STATE_DIR)로 작업 큐 생성"""
+    return JobQueue(
+        workers=int(os.environ.get('CONVERT_WORKERS', 2)),
+        max_queued=int(os.environ.get('CONVERT_QUEUE_DEPTH', 8)),
+        retention_seconds=int(os.environ.get('CONVERT_JOB_RETENTION', 3600)),
+        state_dir=os.environ.get('JOB_STATE_DIR') or None,
+    )
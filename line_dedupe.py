@@ -0,0 +1,173 @@
+"""
+줄 중복 제거 (64비트 해시)
+
+remove_duplicate_content는 5줄씩 이어 붙인 블록 문자열 전체를, final_compact는
+정규화한 줄 문자열 전체를 set에 넣었다. 큰 문서에서는 두 set이 텍스트
+크기만큼 커진다 (한글 줄 하나에 문자열 객체 100바이트 이상).
+
+LineDeduper는 키 문자열 대신 64비트 해시(str 해시, 한 프로세스 안에서 고정)만
+기억한다. 줄 수에 비례하는 메모리는 그대로지만 줄 길이와는 무관하다.
+- verify=True: 해시가 같으면 원래 키와 비교해서 충돌로 다른 줄을 버리지 않음
+  (키를 보관하므로 메모리는 기존과 비슷)
+- window=N: 최근에 본 N개 키만 기억 (LRU) - 메모리가 N에 묶이고,
+  페이지마다 반복되는 머리말/꼬리말처럼 가까이 반복되는 줄을 잡는 데 충분
+
+iter_dedupe_pages는 한 문서의 페이지를 이어서 보면서, 페이지 위/아래 가장자리
+줄 중 앞의 여러 페이지 가장자리에 이미 나온 줄(머리말, 꼬리말, 쪽 번호)을 뺀다.
+숫자를 무시하고 비교하는 것은 짧거나 대부분 숫자인 줄(쪽 번호, 날짜)뿐이라
+"문제 1. …", "문제 2. …"처럼 번호만 다른 본문 줄은 지우지 않는다.
+
+사용법:
+    deduper = LineDeduper()
+    unique = [line for line in lines if not deduper.is_duplicate(normalize_line(line))]
+"""
+
+import re
+from collections import OrderedDict
+
+# 페이지마다 머리말/꼬리말로 볼 위/아래 줄 수
+EDGE_LINES = 1
+
+# 머리말/꼬리말 비교에 기억할 최근 키 수
+EDGE_WINDOW = 64
+
+# 앞의 이만큼의 페이지 가장자리에 나온 줄이어야 머리말/꼬리말로 보고 뺌
+EDGE_MIN_REPEATS = 2
+
+# 공백을 뺀 길이가 이 이하이거나 숫자가 절반 이상인 줄만 숫자를 무시하고 비교
+# (쪽 번호 "- 3 -", "Page 3 of 10", 날짜 등)
+EDGE_SHORT_LINE = 10
+
+DIGITS_PATTERN = re.compile(r"\d+")
+
+
+def normalize_line(line, ignore_digits=False):
+    """
+    비교용 키: 공백 제거 + 소문자 (final_compact와 같음)
+
+    Args:
+        ignore_digits (bool): 숫자를 '#'로 바꿔서 쪽 번호/날짜만 다른 줄을 같게 봄
+    """
+    key = "".join(line.split()).lower()
+    if ignore_digits:
+        key = DIGITS_PATTERN.sub("#", key)
+    return key
+
+
+class LineDeduper:
+    """본 적 있는 키를 64비트 해시로 기억하는 중복 검사기"""
+
+    def __init__(self, window=None, verify=False):
+        """
+        Args:
+            window (int): 기억할 최근 키 수 (None이면 전부 - 문서 전체 중복 제거)
+            verify (bool): 해시가 같을 때 원래 키와 비교 (충돌 방지, 키를 보관함)
+        """
+        self.window = window
+        self.verify = verify
+        if window is not None:
+            self._seen = OrderedDict()  # 해시 -> 키 (verify가 아니면 None)
+        elif verify:
+            self._seen = {}
+        else:
+            self._seen = set()
+        self._collisions = set()  # verify: 해시는 같지만 키가 다른 키
+
+    def __len__(self):
+        return len(self._seen) + len(self._collisions)
+
+    def __contains__(self, key):
+        """기억하지 않고 이미 본 키인지만 확인"""
+        digest = hash(key)
+        if digest not in self._seen:
+            return False
+        return not self.verify or self._seen[digest] == key or key in self._collisions
+
+    def is_duplicate(self, key):
+        """이미 본 키면 True, 처음 보는 키면 기억하고 False"""
+        digest = hash(key)
+
+        if self.window is None and not self.verify:
+            if digest in self._seen:
+                return True
+            self._seen.add(digest)
+            return False
+
+        if digest in self._seen:
+            if not self.verify or self._seen[digest] == key:
+                if self.window is not None:
+                    self._seen.move_to_end(digest)
+                return True
+            # 해시 충돌: 다른 키
+            if key in self._collisions:
+                return True
+            self._collisions.add(key)
+            return False
+
+        self._seen[digest] = key if self.verify else None
+        if self.window is not None and len(self._seen) > self.window:
+            self._seen.popitem(last=False)
+        return False
+
+    def clear(self):
+        self._seen.clear()
+        self._collisions.clear()
+
+
+def edge_key(line):
+    """
+    머리말/꼬리말 비교용 키
+
+    짧거나 대부분 숫자인 줄은 숫자를 무시하고, 나머지는 숫자까지 같아야 같은 줄로 본다.
+    """
+    key = normalize_line(line)
+    digits = sum(1 for c in key if c.isdigit())
+    if digits and (len(key) <= EDGE_SHORT_LINE or digits * 2 >= len(key)):
+        key = DIGITS_PATTERN.sub("#", key)
+    return key
+
+
+def iter_dedupe_pages(page_texts, edge_lines=EDGE_LINES, window=EDGE_WINDOW,
+                      min_repeats=EDGE_MIN_REPEATS):
+    """
+    페이지별 텍스트를 줄로 펼치면서 반복되는 머리말/꼬리말 제거
+
+    페이지 위/아래 edge_lines줄은 edge_key로 비교해서, 최근 페이지 중 min_repeats개
+    이상의 페이지 가장자리에 같은 줄이 있었으면 뺀다 (처음 min_repeats페이지의 것은 남김).
+    본문 줄과 edge_lines의 2배 이하인 짧은 페이지는 그대로 둔다.
+
+    Args:
+        page_texts (iterable): 페이지 텍스트 또는 (페이지 번호, 텍스트)
+        edge_lines (int): 머리말/꼬리말로 볼 위/아래 줄 수
+        window (int): 기억할 최근 머리말/꼬리말 키 수
+        min_repeats (int): 앞의 몇 페이지에 나와야 뺄지
+
+    Yields:
+        str: 남길 줄
+    """
+    edges = OrderedDict()  # 키 해시 -> 나온 페이지 수 (최근 window개)
+    for page_text in page_texts:
+        if isinstance(page_text, tuple):
+            page_text = page_text[1]
+        lines = page_text.splitlines()
+        content = [index for index, line in enumerate(lines) if line.strip()]
+        if edge_lines > 0 and len(content) > 2 * edge_lines:
+            edge_indexes = set(content[:edge_lines] + content[-edge_lines:])
+        else:
+            edge_indexes = set()  # 짧은 페이지는 전부 본문으로 봄
+
+        page_keys = set()
+        for index, line in enumerate(lines):
+            if index in edge_indexes:
+                digest = hash(edge_key(line))
+                page_keys.add(digest)
+                if edges.get(digest, 0) >= min_repeats:
+                    continue
+            yield line
+
+        # 한 페이지 안에서 위/아래가 같은 줄이어도 한 번만 셈
+        for digest in page_keys:
+            edges[digest] = edges.get(digest, 0) + 1
+            edges.move_to_end(digest)
+        while len(edges) > window:
+            edges.popitem(last=False)
@@ -2,6 +2,10 @@
 """
 PDF ↔ DOCX 변환기 - Replit 배포용
 메인 진입점
+
+실행 모드 (SERVER_MODE 환경 변수):
+    development (기본값) - Werkzeug 개발 서버
+    production           - gunicorn 멀티 프로세스 서버 (production_server.py 참고)
 """
 
 import os
@@ -13,15 +17,22 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 # final_server 모듈 import 및 실행
 if __name__ == '__main__':
     try:
-        from final_server import app
-        
         # Replit 환경 변수 확인
         port = int(os.environ.get('PORT', 8080))
         host = os.environ.get('HOST', '0.0.0.0')
-        
+        server_mode = os.environ.get('SERVER_MODE', 'development').lower()
+
         print("🚀 PDF ↔ DOCX 변환기 시작 (Replit 배포)")
         print(f"📍 서버 주소: {host}:{port}")
-        
+
+        if server_mode == 'production':
+            from production_server import run_production
+            if run_production():
+                sys.exit(0)
+            print("↩️ 개발 서버로 실행합니다")
+
+        from final_server import app
+
         # Flask 앱 실행
         app.run(
             host=host,
@@ -29,9 +40,9 @@ if __name__ == '__main__':
             debug=False,  # 배포 환경에서는 False
             threaded=True
         )
-        
+
     except ImportError as e:
         print(f"❌ 모듈 import 오류: {e}")
         print("final_server.py 파일을 확인하세요.")
     except Exception as e:
-        print(f"❌ 서버 시작 오류: {e}")
\ No newline at end of file
+        print(f"❌ 서버 시작 오류: {e}")
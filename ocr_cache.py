@@ -0,0 +1,226 @@
+"""
+OCR 결과 캐시 (페이지 이미지 해시 기반)
+
+OCR은 변환에서 가장 비싼 단계인데, 스캔된 레터헤드나 표지처럼 같은
+페이지가 여러 업로드에 반복해서 나온다. 변환 캐시(conversion_cache)는
+파일 전체가 같을 때만 적중하므로 이런 페이지 단위 반복은 잡지 못한다.
+
+여기서는 렌더링된 페이지 비트맵의 해시 + 언어 + DPI로 키를 만들고,
+OCR 텍스트를 SQLite 파일(outputs/ocr_cache.sqlite3)에 보관한다.
+- 적중하면 tesseract를 실행하지 않고 저장된 텍스트를 돌려준다
+- 키는 비트맵 바이트의 정확한 해시 (비슷하지만 다른 페이지에 다른 페이지의
+  텍스트를 돌려주는 일이 없도록 perceptual hash는 쓰지 않음)
+- 항목 수와 전체 텍스트 크기 한도를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+- 적중/미스 횟수와 절약한 OCR 시간(적중한 항목을 처음 OCR할 때 걸린 시간의 합)을
+  같은 파일에 누적하므로, OCR 워커 프로세스들의 통계가 한 곳에 모인다
+
+사용법:
+    cache = get_ocr_cache()
+    key = make_ocr_key(image, 'kor+eng', 300)
+    text = cache.get(key)
+    if text is None:
+        text = pytesseract.image_to_string(image, lang='kor+eng')
+        cache.put(key, text, elapsed)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+# 키 형식이나 OCR 설정이 바뀌면 올려서 기존 항목을 무효화
+OCR_CACHE_VERSION = 1
+
+# 다른 프로세스가 쓰고 있을 때 기다리는 시간 (초)
+SQLITE_TIMEOUT = 10
+
+
+def make_ocr_key(image, lang, dpi):
+    """
+    페이지 비트맵과 OCR 옵션으로 캐시 키 생성
+
+    Args:
+        image (PIL.Image): 렌더링된 페이지 이미지
+        lang (str): tesseract 언어
+        dpi (int): 렌더링 해상도
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    digest.update(f"{OCR_CACHE_VERSION}|{lang}|{dpi}|{image.mode}|{image.size}|".encode('utf-8'))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+class OcrCache:
+    """SQLite 파일에 OCR 텍스트를 보관하는 LRU 캐시 (프로세스/스레드 간 공유)"""
+
+    def __init__(self, db_path=os.path.join('outputs', 'ocr_cache.sqlite3'),
+                 max_entries=50000, max_bytes=256 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self._local = threading.local()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS ocr_text ('
+                ' key TEXT PRIMARY KEY, text TEXT NOT NULL, size INTEGER NOT NULL,'
+                ' ocr_seconds REAL NOT NULL, last_used REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS ocr_text_last_used ON ocr_text (last_used)')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS ocr_stats ('
+                ' id INTEGER PRIMARY KEY CHECK (id = 0), hits INTEGER NOT NULL,'
+                ' misses INTEGER NOT NULL, seconds_saved REAL NOT NULL)'
+            )
+            conn.execute('INSERT OR IGNORE INTO ocr_stats VALUES (0, 0, 0, 0.0)')
+
+    def _connect(self):
+        """스레드마다 연결 하나 (sqlite3 연결은 스레드 간 공유하지 않음)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=SQLITE_TIMEOUT)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        """
+        캐시된 OCR 텍스트 조회
+
+        Returns:
+            str: OCR 텍스트, 없으면 None
+        """
+        with self._connect() as conn:
+            row = conn.execute('SELECT text, ocr_seconds FROM ocr_text WHERE key = ?',
+                               (key,)).fetchone()
+            if row is None:
+                conn.execute('UPDATE ocr_stats SET misses = misses + 1 WHERE id = 0')
+                return None
+
+            text, seconds = row
+            conn.execute('UPDATE ocr_text SET last_used = ? WHERE key = ?', (time.time(), key))
+            conn.execute('UPDATE ocr_stats SET hits = hits + 1, seconds_saved = seconds_saved + ?'
+                         ' WHERE id = 0', (seconds,))
+        return text
+
+    def put(self, key, text, ocr_seconds):
+        """
+        OCR 텍스트 저장
+
+        Args:
+            key (str): make_ocr_key로 만든 키
+            text (str): OCR 결과
+            ocr_seconds (float): OCR에 걸린 시간 (적중 시 절약 시간으로 집계)
+        """
+        size = len(text.encode('utf-8'))
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO ocr_text VALUES (?, ?, ?, ?, ?)',
+                         (key, text, size, float(ocr_seconds), time.time()))
+            self._evict(conn, keep=key)
+
+    def _evict(self, conn, keep=None):
+        """한도를 넘으면 오래 사용하지 않은 항목 삭제 (트랜잭션 안에서 호출)"""
+        count, total = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr_text').fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        removed = []
+        for key, size in conn.execute('SELECT key, size FROM ocr_text ORDER BY last_used'):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            removed.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany('DELETE FROM ocr_text WHERE key = ?', removed)
+
+    def stats(self):
+        """적중률과 절약한 OCR 시간 등 캐시 상태 (모든 프로세스 누적)"""
+        conn = self._connect()
+        hits, misses, seconds_saved = conn.execute(
+            'SELECT hits, misses, seconds_saved FROM ocr_stats WHERE id = 0').fetchone()
+        entries, total = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr_text').fetchone()
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+            'seconds_saved': round(seconds_saved, 1),
+            'entries': entries,
+            'bytes': total,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+        }
+
+
+def create_ocr_cache_from_env():
+    """환경 변수로 OCR 캐시 생성 (OCR_CACHE=0이면 None)"""
+    if os.environ.get('OCR_CACHE', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+    return OcrCache(
+        db_path=os.environ.get('OCR_CACHE_PATH', os.path.join('outputs', 'ocr_cache.sqlite3')),
+        max_entries=int(os.environ.get('OCR_CACHE_MAX_ENTRIES', 50000)),
+        max_bytes=int(os.environ.get('OCR_CACHE_MAX_MB', 256)) * 1024 * 1024,
+    )
+
+
+_ocr_cache = None
+_ocr_cache_loaded = False
+_ocr_cache_lock = threading.Lock()
+
+
+def get_ocr_cache():
+    """프로세스에서 공유하는 OCR 캐시 (처음 사용할 때 생성, 꺼져 있으면 None)"""
+    global _ocr_cache, _ocr_cache_loaded
+
+    with _ocr_cache_lock:
+        if not _ocr_cache_loaded:
+            try:
+                _ocr_cache = create_ocr_cache_from_env()
+            except (sqlite3.Error, OSError) as e:
+                print(f"⚠️ OCR 캐시 사용 안 함: {e}")
+                _ocr_cache = None
+            _ocr_cache_loaded = True
+        return _ocr_cache
+
+
+def cached_ocr(image, lang, dpi, ocr_func):
+    """
+    캐시를 거쳐 페이지 이미지 OCR
+
+    Args:
+        image (PIL.Image): 렌더링된 페이지 이미지
+        lang (str): tesseract 언어
+        dpi (int): 렌더링 해상도 (키에 포함)
+        ocr_func (callable): 미스일 때 호출할 ocr_func(image, lang)
+
+    Returns:
+        str: OCR 텍스트
+    """
+    cache = get_ocr_cache()
+    if cache is None:
+        return ocr_func(image, lang)
+
+    key = make_ocr_key(image, lang, dpi)
+    try:
+        text = cache.get(key)
+    except sqlite3.Error as e:
+        print(f"⚠️ OCR 캐시 조회 실패: {e}")
+        return ocr_func(image, lang)
+    if text is not None:
+        return text
+
+    start = time.perf_counter()
+    text = ocr_func(image, lang)
+    try:
+        cache.put(key, text, time.perf_counter() - start)
+    except sqlite3.Error as e:
+        print(f"⚠️ OCR 캐시 저장 실패: {e}")
+    return text
@@ -0,0 +1,274 @@
+"""
+병렬 OCR 엔진
+
+기존 ocr_helper.extract_text_with_ocr는 문서 전체를 300dpi로 한 번에
+렌더링해서 모든 페이지 이미지를 메모리에 올린 뒤, 페이지마다 tesseract를
+순서대로 실행했다. 100페이지 스캔 문서는 (페이지 수 × 페이지당 시간)이
+걸리고, 메모리도 페이지 수에 비례해서 늘어났다.
+
+여기서는 페이지 번호만 프로세스 풀에 보내고, 워커가 해당 페이지를
+렌더링한 뒤 바로 OCR한다 (큰 비트맵을 프로세스 사이로 넘기지 않음).
+- 동시에 진행 중인 페이지는 워커 수의 2배로 제한 (메모리 일정)
+- tesseract 자체의 OpenMP 스레드는 1개로 제한해서 워커끼리 코어를 나눠 쓰지 않게 함
+- 페이지 OCR 결과는 ocr_cache에 보관해서 같은 페이지 이미지는 다시 OCR하지 않음
+- 결과는 페이지 순서대로 돌려주고, 페이지마다 진행률 콜백 호출
+- cancel_event가 설정되면 대기 중인 페이지를 취소하고 OcrCancelledError 발생
+  (이미 실행 중인 페이지는 해당 페이지까지만 마침)
+
+사용법:
+    for index, text in iter_ocr_pages('scan.pdf', on_progress=print):
+        ...
+"""
+
+import io
+import multiprocessing
+import os
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from ocr_cache import cached_ocr
+from pdf_rasterizer import get_pdf_page_count, iter_pdf_pages
+
+# OCR 워커 프로세스 수 (1이면 현재 프로세스에서 순차 처리)
+OCR_WORKERS = max(1, int(os.environ.get('OCR_WORKERS', os.cpu_count() or 1)))
+
+DEFAULT_DPI = 300
+DEFAULT_LANG = 'kor+eng'
+
+# 취소 여부를 확인하는 간격 (초)
+CANCEL_POLL_INTERVAL = 0.2
+
+_ocr_pool = None
+_ocr_pool_lock = threading.Lock()
+
+
+class OcrCancelledError(Exception):
+    """cancel_event로 OCR이 취소된 경우"""
+
+
+def _limit_tesseract_threads():
+    """워커 초기화: tesseract가 페이지마다 코어를 모두 쓰지 않도록 OpenMP 스레드 1개"""
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+
+
+def _tesseract(image, lang):
+    import pytesseract
+
+    return pytesseract.image_to_string(image, lang=lang)
+
+
+def _ocr_image(image, lang, dpi):
+    """페이지 이미지 OCR (캐시에 있으면 tesseract를 실행하지 않음)"""
+    return cached_ocr(image, lang, dpi, _tesseract)
+
+
+def _encode_page_image(image, dpi, image_dpi):
+    """OCR용으로 렌더링한 페이지를 image_dpi 크기로 줄여서 PNG 바이트로 (다시 렌더링하지 않도록)"""
+    from PIL import Image
+
+    if image_dpi < dpi:
+        scale = image_dpi / dpi
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        image = image.resize(size, Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def _ocr_page(pdf_path, page_number, dpi, lang, image_dpi=None):
+    """
+    워커 프로세스: 한 페이지를 렌더링하고 OCR (page_number는 1부터)
+
+    Returns:
+        str: 텍스트 (image_dpi가 있으면 (텍스트, image_dpi 크기 PNG 바이트))
+    """
+    from pdf2image import convert_from_path
+
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number)
+    if not images:
+        return '' if image_dpi is None else ('', None)
+    try:
+        text = _ocr_image(images[0], lang, dpi)
+        if image_dpi is None:
+            return text
+        return text, _encode_page_image(images[0], dpi, image_dpi)
+    finally:
+        images[0].close()
+
+
+def get_ocr_pool():
+    """요청 간에 공유하는 OCR 프로세스 풀 (처음 사용할 때 생성)"""
+    global _ocr_pool
+
+    if OCR_WORKERS <= 1:
+        return None
+
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            # 스레드를 쓰는 웹 서버 안에서 fork하지 않도록 spawn 사용
+            _ocr_pool = ProcessPoolExecutor(
+                max_workers=OCR_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_limit_tesseract_threads
+            )
+        return _ocr_pool
+
+
+def shutdown_ocr_pool():
+    """OCR 프로세스 풀 종료 (다음 사용 시 다시 생성됨)"""
+    global _ocr_pool
+
+    with _ocr_pool_lock:
+        pool, _ocr_pool = _ocr_pool, None
+    if pool is not None:
+        if sys.version_info >= (3, 9):
+            pool.shutdown(wait=False, cancel_futures=True)
+        else:
+            pool.shutdown(wait=False)  # 3.8에는 cancel_futures가 없음
+
+
+def _check_cancel(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise OcrCancelledError('OCR이 취소되었습니다.')
+
+
+def iter_ocr_pages(pdf_path, lang=DEFAULT_LANG, dpi=DEFAULT_DPI, on_progress=None,
+                   cancel_event=None, page_count=None, pages=None, image_dpi=None):
+    """
+    PDF 페이지를 OCR해서 페이지 순서대로 반환
+
+    Args:
+        pdf_path (str): PDF 파일 경로
+        lang (str): tesseract 언어
+        dpi (int): 렌더링 해상도
+        on_progress (callable): 페이지마다 on_progress(처리한 페이지 수, OCR할 페이지 수)
+        cancel_event (threading.Event): 설정되면 남은 페이지를 취소
+        page_count (int): 이미 알고 있는 페이지 수
+        pages (list): OCR할 페이지 번호 (0부터, 없으면 전체 - page_triage 계획으로 고른 페이지 등)
+        image_dpi (int): 주면 OCR용 렌더링을 이 해상도로 줄인 PNG도 함께 돌려줌
+            (슬라이드 이미지 등을 위해 같은 페이지를 다시 렌더링하지 않도록)
+
+    Yields:
+        tuple: (0부터 시작하는 페이지 번호, 추출된 텍스트),
+               image_dpi가 있으면 (페이지 번호, 텍스트, PNG 바이트 또는 None)
+
+    Raises:
+        OcrCancelledError: cancel_event로 취소된 경우
+    """
+    full_document = pages is None
+    if full_document:
+        if page_count is None:
+            page_count = get_pdf_page_count(pdf_path)
+        pages = range(page_count)
+    else:
+        pages = sorted(pages)
+    total = len(pages)
+
+    pool = get_ocr_pool()
+    if pool is None:
+        # 순차 처리에서는 tesseract가 코어를 모두 써도 됨
+        if full_document:
+            page_images = iter_pdf_pages(pdf_path, dpi=dpi, chunk_size=1, page_count=page_count)
+        else:
+            # 일부 페이지만: 워커와 같이 페이지마다 따로 렌더링
+            page_images = ((index, None) for index in pages)
+        for done, (index, image) in enumerate(page_images, start=1):
+            _check_cancel(cancel_event)
+            if image is None:
+                result = _ocr_page(pdf_path, index + 1, dpi, lang, image_dpi)
+            elif image_dpi is None:
+                result = _ocr_image(image, lang, dpi)
+            else:
+                result = (_ocr_image(image, lang, dpi), _encode_page_image(image, dpi, image_dpi))
+            if on_progress:
+                on_progress(done, total)
+            yield (index, result) if image_dpi is None else (index,) + result
+        return
+
+    yield from _iter_pool_pages(pool, pdf_path, pages, lang, dpi, image_dpi,
+                                on_progress, cancel_event)
+
+
+def _iter_pool_pages(pool, pdf_path, pages, lang, dpi, image_dpi, on_progress, cancel_event,
+                     prime=False):
+    """
+    풀에 페이지를 OCR_WORKERS * 2개까지 넣어 두고 페이지 순서대로 받음
+
+    prime이면 첫 페이지들을 넣은 뒤 None을 한 번 낸다 (start_ocr_pages에서 사용).
+    """
+    waiting = deque(pages)
+    pending = deque()
+    total = len(pages)
+    done = 0
+
+    def submit():
+        while waiting and len(pending) < OCR_WORKERS * 2:
+            index = waiting.popleft()
+            pending.append((index, pool.submit(_ocr_page, pdf_path, index + 1, dpi, lang,
+                                               image_dpi)))
+
+    try:
+        if prime:
+            submit()
+            yield None
+        while waiting or pending:
+            submit()
+
+            index, future = pending[0]
+            while True:
+                _check_cancel(cancel_event)
+                try:
+                    result = future.result(timeout=CANCEL_POLL_INTERVAL)
+                    break
+                except FutureTimeoutError:
+                    continue
+            pending.popleft()
+
+            done += 1
+            if on_progress:
+                on_progress(done, total)
+            yield (index, result) if image_dpi is None else (index,) + result
+    except BrokenProcessPool:
+        # tesseract/poppler 크래시 등으로 워커가 죽으면 다음 요청을 위해 풀을 새로 만든다
+        shutdown_ocr_pool()
+        raise
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+def start_ocr_pages(pdf_path, pages, lang=DEFAULT_LANG, dpi=DEFAULT_DPI, on_progress=None,
+                    cancel_event=None, image_dpi=None):
+    """
+    iter_ocr_pages와 같지만 호출하는 즉시 첫 페이지들을 풀에 넣어 둠
+
+    결과는 반환한 제너레이터를 돌릴 때 받으므로, 그 사이에 다른 일을 하는 동안
+    워커가 OCR을 진행한다. 풀이 없으면 iter_ocr_pages를 그대로 돌려준다.
+
+    Returns:
+        generator: iter_ocr_pages와 같은 값을 내는 제너레이터 (close()하면 남은 페이지 취소)
+    """
+    pool = get_ocr_pool()
+    if pool is None:
+        return iter_ocr_pages(pdf_path, lang=lang, dpi=dpi, on_progress=on_progress,
+                              cancel_event=cancel_event, pages=pages, image_dpi=image_dpi)
+    stream = _iter_pool_pages(pool, pdf_path, sorted(pages), lang, dpi, image_dpi,
+                              on_progress, cancel_event, prime=True)
+    next(stream)  # 첫 페이지들만 넣고 돌아옴 (시작한 제너레이터라 close()가 finally를 실행)
+    return stream
+
+
+def extract_text_with_ocr(pdf_path, lang=DEFAULT_LANG, dpi=DEFAULT_DPI, on_progress=None,
+                          cancel_event=None):
+    """
+    PDF 전체를 OCR해서 페이지별 텍스트 목록 반환
+
+    Returns:
+        list: 페이지 순서대로 추출된 텍스트
+    """
+    return [text for _, text in iter_ocr_pages(pdf_path, lang=lang, dpi=dpi,
+                                               on_progress=on_progress,
+                                               cancel_event=cancel_event)]
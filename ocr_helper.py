@@ -1,38 +1,58 @@
 import pytesseract
 from PIL import Image
-from pdf2image import convert_from_path
+from ocr_engine import iter_ocr_pages, OcrCancelledError
+from advanced_text_filter import iter_filter_lines
+from line_dedupe import iter_dedupe_pages
 
-def extract_text_with_ocr(pdf_path, lang='kor+eng'):
+def extract_text_with_ocr(pdf_path, lang='kor+eng', cancel_event=None, on_progress=None):
     """
     PDF에서 OCR을 사용하여 텍스트 추출
     
+    페이지 렌더링과 OCR은 ocr_engine의 프로세스 풀에서 병렬로 처리된다
+    (OCR_WORKERS로 워커 수 설정).
+    
     Args:
         pdf_path (str): PDF 파일 경로
         lang (str): OCR 언어 설정 (기본값: 한국어+영어)
+        cancel_event (threading.Event): 설정되면 남은 페이지를 취소하고 빈 목록 반환
+        on_progress (callable): 페이지마다 on_progress(처리한 페이지 수, 전체 페이지 수) 호출
     
     Returns:
         list: 각 페이지별 추출된 텍스트 리스트
     """
     try:
-        # PDF를 이미지로 변환
-        images = convert_from_path(pdf_path, dpi=300)
-        
         extracted_texts = []
-        for i, image in enumerate(images):
-            print(f"페이지 {i+1} OCR 처리 중...")
-            
-            # OCR로 텍스트 추출
-            text = pytesseract.image_to_string(image, lang=lang)
+        for i, text in iter_ocr_pages(pdf_path, lang=lang, dpi=300, on_progress=on_progress,
+                                      cancel_event=cancel_event):
             extracted_texts.append(text)
-            
             print(f"페이지 {i+1} 완료 - {len(text)} 글자 추출")
         
         return extracted_texts
         
+    except OcrCancelledError:
+        print("OCR 처리 취소됨")
+        return []
     except Exception as e:
         print(f"OCR 처리 오류: {e}")
         return []
 
+def iter_filtered_ocr_lines(pdf_path, lang='kor+eng', cancel_event=None, on_progress=None):
+    """
+    OCR한 페이지를 바로 노이즈 필터에 흘려보내서 남길 줄만 생성
+    
+    문서 전체 텍스트를 모으지 않고 페이지가 끝나는 대로 필터를 거친다.
+    여러 페이지에 반복되는 머리말/꼬리말(쪽 번호만 다른 줄 포함)은 앞의 두 페이지 것만 남긴다.
+    
+    Yields:
+        str: 필터를 통과한 줄
+    
+    Raises:
+        OcrCancelledError: cancel_event로 취소된 경우
+    """
+    pages = iter_ocr_pages(pdf_path, lang=lang, dpi=300, on_progress=on_progress,
+                           cancel_event=cancel_event)
+    yield from iter_filter_lines(iter_dedupe_pages(pages))
+
 def test_ocr_with_sample():
     """
     샘플 이미지로 OCR 테스트
@@ -0,0 +1,160 @@
+"""
+PDF 페이지 분류 (텍스트 / OCR / 혼합)
+
+기존에는 페이지를 처리하는 도중에 looks_garbled가 추출 텍스트의 앞 1000자를
+파이썬 제너레이터로 네 번씩 훑어서 OCR 여부를 정했다. 판단이 페이지 처리
+순서에 묶여 있어서 OCR할 페이지를 미리 모아 한꺼번에 보낼 수 없었고,
+글꼴의 ToUnicode 매핑이 깨진 경우((cid:N) 글자)나 페이지 대부분이 그림인
+경우는 따로 보지 않았다.
+
+여기서는 렌더링을 시작하기 전에 문서의 모든 페이지를 한 번에 분류한다.
+- 페이지마다 pdfplumber 글자 정보에서 매핑된 글자, (cid:N) 글자 수, 그림 면적을 모음
+- 모든 페이지의 글자를 코드포인트 배열 하나로 합쳐서 NumPy로 한 번에
+  한글 비율, 제어 문자 비율, 매핑 실패 비율(cid, U+FFFD, 사용자 정의 영역)을 계산
+- 페이지마다 계획을 정함
+    text:   텍스트 레이어를 그대로 사용
+    ocr:    텍스트 레이어가 없거나 깨짐 → OCR
+    hybrid: 텍스트는 정상이지만 그림이 페이지의 상당 부분을 차지 → 텍스트 + OCR
+한글 비율과 제어 문자 기준은 looks_garbled와 같다.
+
+사용법:
+    samples = [collect_page_sample(page) for page in pdf.pages]
+    plan = classify_pages(samples)
+    ocr_pages = pages_needing_ocr(plan)
+"""
+
+import numpy as np
+
+PAGE_TEXT = 'text'
+PAGE_OCR = 'ocr'
+PAGE_HYBRID = 'hybrid'
+
+# 글자 중 한글 음절 비율이 이보다 낮으면 깨진 것으로 봄 (looks_garbled와 같음)
+MIN_HANGUL_RATIO = 0.05
+
+# 제어 문자 비율이 이보다 높으면 깨진 것으로 봄 (looks_garbled와 같음)
+MAX_JUNK_RATIO = 0.25
+
+# 글리프 중 유니코드로 매핑되지 않은 비율이 이보다 높으면 깨진 것으로 봄
+MAX_UNMAPPED_RATIO = 0.1
+
+# 그림이 페이지 면적의 이 비율 이상이면 그림 속 글자도 OCR (혼합)
+HYBRID_IMAGE_COVERAGE = 0.3
+
+# 페이지 전체가 그림이고 텍스트 레이어가 정상이면 이미 OCR된 스캔본으로 보고 텍스트만 사용
+FULL_PAGE_IMAGE_COVERAGE = 0.9
+
+CID_PREFIX = '(cid:'
+
+# BMP 코드포인트별 str.isalpha() 결과 (looks_garbled의 글자 판정과 같게)
+_ALPHA = np.array([chr(code).isalpha() for code in range(0x10000)], dtype=bool)
+
+
+def _image_coverage(page):
+    """페이지 면적 중 그림이 차지하는 비율 (겹치는 그림은 따로 셈, 최대 1)"""
+    width = float(page.width)
+    height = float(page.height)
+    if width <= 0 or height <= 0:
+        return 0.0
+
+    area = 0.0
+    for image in page.images:
+        x0 = max(0.0, float(image['x0']))
+        x1 = min(width, float(image['x1']))
+        top = max(0.0, float(image['top']))
+        bottom = min(height, float(image['bottom']))
+        if x1 > x0 and bottom > top:
+            area += (x1 - x0) * (bottom - top)
+    return min(1.0, area / (width * height))
+
+
+def collect_page_sample(page):
+    """
+    페이지 분류에 필요한 원자료 수집 (pdfplumber 페이지 하나)
+
+    Returns:
+        dict: {'text': 매핑된 글자를 이어 붙인 문자열, 'cid': (cid:N) 글자 수,
+               'image_coverage': 그림 면적 비율}
+    """
+    mapped = []
+    cid = 0
+    for char in page.chars:
+        text = char.get('text') or ''
+        if text.startswith(CID_PREFIX):
+            cid += 1
+        else:
+            mapped.append(text)
+    return {'text': ''.join(mapped), 'cid': cid, 'image_coverage': _image_coverage(page)}
+
+
+def classify_pages(samples):
+    """
+    모든 페이지를 한 번에 분류
+
+    Args:
+        samples (list): 페이지 순서대로 collect_page_sample 결과
+
+    Returns:
+        list: 페이지마다 {'page', 'plan', 'glyphs', 'hangul_ratio', 'junk_ratio',
+              'unmapped_ratio', 'image_coverage'} ('page'는 0부터)
+    """
+    page_total = len(samples)
+    if page_total == 0:
+        return []
+
+    lengths = np.array([len(sample['text']) for sample in samples], dtype=np.int64)
+    cid = np.array([sample['cid'] for sample in samples], dtype=np.int64)
+    coverage = np.array([sample['image_coverage'] for sample in samples], dtype=np.float64)
+
+    text = ''.join(sample['text'] for sample in samples)
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+    page_ids = np.repeat(np.arange(page_total), lengths)
+
+    hangul = (codes >= 0xAC00) & (codes <= 0xD7A3)
+    junk = (codes < 32) | ((codes >= 127) & (codes < 160))
+    bad = (codes == 0xFFFD) | ((codes >= 0xE000) & (codes <= 0xF8FF))
+    alpha = (codes <= 0xFFFF) & _ALPHA[np.minimum(codes, 0xFFFF)] & ~bad
+
+    def per_page(mask):
+        return np.bincount(page_ids[mask], minlength=page_total)
+
+    letters = per_page(alpha | hangul)
+    glyphs = lengths + cid
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hangul_ratio = np.where(letters > 0, per_page(hangul) / letters, 0.0)
+        junk_ratio = np.where(lengths > 0, per_page(junk) / lengths, 0.0)
+        unmapped_ratio = np.where(glyphs > 0, (per_page(bad) + cid) / glyphs, 0.0)
+
+    text_ok = ((letters > 0)
+               & (hangul_ratio >= MIN_HANGUL_RATIO)
+               & (junk_ratio <= MAX_JUNK_RATIO)
+               & (unmapped_ratio <= MAX_UNMAPPED_RATIO))
+    hybrid = (coverage >= HYBRID_IMAGE_COVERAGE) & (coverage < FULL_PAGE_IMAGE_COVERAGE)
+    plans = np.where(text_ok, np.where(hybrid, PAGE_HYBRID, PAGE_TEXT), PAGE_OCR)
+
+    return [
+        {
+            'page': index,
+            'plan': str(plans[index]),
+            'glyphs': int(glyphs[index]),
+            'hangul_ratio': round(float(hangul_ratio[index]), 3),
+            'junk_ratio': round(float(junk_ratio[index]), 3),
+            'unmapped_ratio': round(float(unmapped_ratio[index]), 3),
+            'image_coverage': round(float(coverage[index]), 3),
+        }
+        for index in range(page_total)
+    ]
+
+
+def pages_needing_ocr(plan):
+    """OCR이 필요한 페이지 번호 목록 (ocr, hybrid)"""
+    return [entry['page'] for entry in plan if entry['plan'] != PAGE_TEXT]
+
+
+def summarize_plan(plan):
+    """계획별 페이지 수 (로그용)"""
+    counts = {PAGE_TEXT: 0, PAGE_OCR: 0, PAGE_HYBRID: 0}
+    for entry in plan:
+        counts[entry['plan']] += 1
+    return counts
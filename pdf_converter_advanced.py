@@ -1,10 +1,15 @@
-import os, math
+import os, math, io
 import pdfplumber
 from pdf2image import convert_from_path
+from PIL import Image
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.dml.color import RGBColor
 from collections import defaultdict
+from ocr_cache import cached_ocr
+from ocr_engine import get_ocr_pool, start_ocr_pages
+from page_triage import (PAGE_HYBRID, PAGE_OCR, PAGE_TEXT, classify_pages, collect_page_sample,
+                         pages_needing_ocr, summarize_plan)
 
 # OCR 준비
 try:
@@ -22,11 +27,13 @@ except ImportError:
     pytesseract = None
     OCR_OK = False
 
+OCR_LANG = "kor+eng"
+
 def log(msg):
     print(msg, flush=True)
 
 def looks_garbled(text: str) -> bool:
-    """텍스트 깨짐 감지"""
+    """텍스트 깨짐 감지 (OCR 여부 판단용, 한글 비율 기준)"""
     if not text:
         return True
     s = text[:1000]
@@ -37,13 +44,57 @@ def looks_garbled(text: str) -> bool:
     junk = sum(1 for c in s if (0 <= ord(c) < 32) or (127 <= ord(c) < 160))
     return (hangul / letters) < 0.05 or (junk / len(s)) > 0.25
 
-def extract_text_pdf(pdf_path, page_index):
-    """PDF에서 텍스트 추출 (pdfplumber 사용)"""
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            if page_index >= len(pdf.pages):
+class PdfSession:
+    """
+    변환 한 번 동안 PDF를 한 번만 열어 두고 페이지 텍스트/이미지를 제공
+
+    기존에는 페이지마다 pdfplumber.open으로 문서 전체를 다시 파싱하고,
+    슬라이드 이미지(160dpi)와 OCR(200dpi)이 같은 페이지를 따로 렌더링했다.
+    세션은 pdfplumber 문서 하나를 유지하고, 페이지 이미지는 페이지마다
+    요청된 가장 높은 dpi로 한 번만 렌더링한다. 더 낮은 dpi 요청은
+    메모리에서 축소해서 돌려준다.
+    페이지 처리가 끝나면 release_page()로 파싱 캐시와 이미지를 해제한다.
+
+    triage()는 렌더링 전에 모든 페이지를 분류하고(page_triage), 같은 파싱으로
+    페이지 텍스트도 뽑아 두므로 페이지를 두 번 파싱하지 않는다.
+    prefetch_ocr()는 OCR이 필요한 페이지를 OCR 프로세스 풀로 한꺼번에 보낸다.
+    워커는 OCR용으로 렌더링한 페이지를 슬라이드 크기로 줄여서 함께 돌려주므로
+    풀을 쓸 때도 페이지마다 poppler 렌더링은 한 번이다. 결과는 페이지를 처리할
+    차례가 되면 받아오므로 미리 받아 둔 이미지가 문서 전체만큼 쌓이지 않는다.
+    """
+
+    def __init__(self, pdf_path):
+        self.pdf_path = pdf_path
+        self._pdf = pdfplumber.open(pdf_path)
+        self.page_count = len(self._pdf.pages)
+        self._bitmaps = {}  # 페이지 번호 -> (dpi, PIL 이미지)
+        self._texts = {}  # 페이지 번호 -> triage()에서 뽑아 둔 텍스트
+        self._ocr_texts = {}  # 페이지 번호 -> prefetch_ocr()로 미리 OCR한 텍스트
+        self._ocr_stream = None  # prefetch_ocr()의 start_ocr_pages (페이지 순서대로 받음)
+        self._ocr_waiting = set()  # 아직 받지 않은 prefetch 페이지
+        self._ocr_dpi = None
+        self._ocr_image_dpi = None
+        self.plan = None  # triage() 결과 (페이지별 text/ocr/hybrid)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self._stop_prefetch()
+        self._release_images()
+        self._pdf.close()
+
+    def extract_text(self, page_index):
+        """PDF에서 텍스트 추출 (pdfplumber 사용)"""
+        if page_index in self._texts:
+            return self._texts[page_index]
+        try:
+            if page_index >= self.page_count:
                 return ""
-            page = pdf.pages[page_index]
+            page = self._pdf.pages[page_index]
             
             # words 기반 라인 재구성
             words = page.extract_words(use_text_flow=True) or []
@@ -64,37 +115,199 @@ def extract_text_pdf(pdf_path, page_index):
             
             # fallback
             return page.extract_text() or ""
+        except Exception as e:
+            log(f"[extract_text_pdf] 오류: {e}")
+            return ""
+
+    def render_page(self, page_index, dpi):
+        """
+        페이지 이미지 (이미 더 높은 dpi로 렌더링했으면 다시 렌더링하지 않고 축소)
+
+        Returns:
+            PIL 이미지 (세션이 관리하므로 호출하는 쪽에서 닫지 않음), 실패하면 None
+        """
+        self._receive_prefetched(page_index)
+        cached = self._bitmaps.get(page_index)
+        if cached is None or cached[0] < dpi:
+            imgs = convert_from_path(self.pdf_path, dpi=dpi,
+                                     first_page=page_index + 1,
+                                     last_page=page_index + 1)
+            if cached is not None and cached[1] is not None:
+                cached[1].close()
+            cached = self._bitmaps[page_index] = (dpi, imgs[0] if imgs else None)
+
+        source_dpi, image = cached
+        if image is None or source_dpi == dpi:
+            return image
+        scale = dpi / source_dpi
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        return image.resize(size, Image.Resampling.LANCZOS)
+
+    def triage(self):
+        """
+        모든 페이지를 렌더링 전에 분류 (page_triage)
+
+        Returns:
+            list: 페이지별 분류 결과 (self.plan에도 보관)
+        """
+        samples = []
+        for index, page in enumerate(self._pdf.pages):
+            samples.append(collect_page_sample(page))
+            # 글자를 파싱한 김에 텍스트도 뽑아 두고 파싱 캐시는 바로 해제
+            self._texts[index] = self.extract_text(index)
+            page.flush_cache()
+        self.plan = classify_pages(samples)
+        return self.plan
+
+    def prefetch_ocr(self, pages, dpi=200, image_dpi=160):
+        """
+        OCR할 페이지를 OCR 프로세스 풀로 한꺼번에 처리 (풀이 없으면 페이지를 처리할 때 OCR)
+
+        첫 페이지들을 풀에 넣기만 하고 바로 돌아온다. 결과는 render_page/extract_text_ocr가
+        그 페이지에 이르렀을 때 받으므로, 앞쪽 텍스트 페이지를 처리하는 동안 OCR이 진행된다.
+        워커가 dpi로 렌더링한 페이지를 image_dpi로 줄여서 같이 돌려주므로,
+        page_to_images(image_dpi)는 그 페이지를 다시 렌더링하지 않는다.
+        """
+        self._stop_prefetch()
+        if not (pages and OCR_OK and pytesseract) or get_ocr_pool() is None:
+            return
+        try:
+            self._ocr_stream = start_ocr_pages(self.pdf_path, pages, lang=OCR_LANG, dpi=dpi,
+                                               image_dpi=image_dpi)
+        except Exception as e:
+            log(f"[OCR] 일괄 처리 시작 실패, 페이지별로 처리: {e}")
+            return
+        self._ocr_waiting = set(pages)
+        self._ocr_dpi = dpi
+        self._ocr_image_dpi = image_dpi
+
+    def _receive_prefetched(self, page_index):
+        """prefetch 결과를 page_index까지 받아 둠 (결과는 페이지 순서대로 옴)"""
+        if page_index not in self._ocr_waiting:
+            return
+        try:
+            for index, text, image_data in self._ocr_stream:
+                if index not in self._ocr_waiting:
+                    continue  # 받기 전에 release_page()로 끝난 페이지
+                self._ocr_waiting.discard(index)
+                self._ocr_texts[index] = (self._ocr_dpi, text.strip())
+                if image_data is not None:
+                    self._bitmaps[index] = (self._ocr_image_dpi, Image.open(io.BytesIO(image_data)))
+                if index >= page_index:
+                    return
+        except Exception as e:
+            log(f"[OCR] 일괄 처리 실패, 남은 페이지는 페이지별로 처리: {e}")
+        self._stop_prefetch()
+
+    def _stop_prefetch(self):
+        if self._ocr_stream is not None:
+            self._ocr_stream.close()  # 대기 중인 페이지 취소
+        self._ocr_stream = None
+        self._ocr_waiting = set()
+
+    def extract_text_ocr(self, page_index, dpi=200):
+        """OCR을 사용한 텍스트 추출"""
+        if not (OCR_OK and pytesseract):
+            return ""
+        self._receive_prefetched(page_index)
+        prefetched = self._ocr_texts.get(page_index)
+        if prefetched is not None and prefetched[0] == dpi:
+            return prefetched[1]
+        try:
+            image = self.render_page(page_index, dpi)
+            if image is None:
+                return ""
+            return cached_ocr(image, OCR_LANG, dpi,
+                              lambda img, lang: pytesseract.image_to_string(img, lang=lang)).strip()
+        except Exception as e:
+            log(f"[OCR] 실패 p{page_index}: {e}")
+            return ""
+
+    def get_clean_text(self, page_index):
+        """깨끗한 텍스트 추출 (triage() 계획이 있으면 따르고, 없으면 깨짐 감지로 OCR 백업)"""
+        base = self.extract_text(page_index)
+        if self.plan is not None:
+            plan = self.plan[page_index]['plan']
+        else:
+            plan = PAGE_OCR if looks_garbled(base) else PAGE_TEXT
+
+        if plan == PAGE_HYBRID:
+            log(f"[p{page_index}] 그림 영역이 큼 → 텍스트 + OCR")
+            return merge_ocr_lines(base, self.extract_text_ocr(page_index))
+        if plan == PAGE_OCR:
+            log(f"[p{page_index}] 텍스트 깨짐 감지 → OCR")
+            ocr = self.extract_text_ocr(page_index)
+            if ocr and not looks_garbled(ocr):
+                log(f"[p{page_index}] OCR 사용")
+                return ocr
+            # OCR도 만족 못하면 base 혹은 ocr 중 길이 긴 것 반환
+            return ocr if len(ocr) > len(base) else base
+        return base
+
+    def page_to_images(self, page_index, dpi=160):
+        """PDF 페이지를 이미지로 변환"""
+        try:
+            image = self.render_page(page_index, dpi)
+            return [image] if image is not None else []
+        except Exception as e:
+            log(f"페이지 이미지 변환 실패: {e}")
+            return []
+
+    def release_page(self, page_index):
+        """페이지 처리가 끝나면 pdfplumber 캐시와 렌더링한 이미지 해제"""
+        self._pdf.pages[page_index].flush_cache()
+        self._texts.pop(page_index, None)
+        self._ocr_texts.pop(page_index, None)
+        self._release_images(page_index)
+        # 아직 받지 않은 prefetch 결과는 기다리지 않고 받을 때 버림
+        self._ocr_waiting.discard(page_index)
+        if self._ocr_stream is not None and not self._ocr_waiting:
+            self._stop_prefetch()
+
+    def _release_images(self, page_index=None):
+        """페이지 이미지 해제 (page_index가 없으면 전부, 미리 받아 둔 다음 페이지는 남김)"""
+        indexes = list(self._bitmaps) if page_index is None else [page_index]
+        for index in indexes:
+            _, image = self._bitmaps.pop(index, (None, None))
+            if image is not None:
+                image.close()
+
+def merge_ocr_lines(base, ocr):
+    """텍스트 레이어에 없는 OCR 줄만 뒤에 덧붙임 (공백 차이는 무시)"""
+    known = "".join(base.split())
+    extra = []
+    for line in ocr.splitlines():
+        key = "".join(line.split())
+        if key and key not in known:
+            extra.append(line.strip())
+    return "\n".join([base] + extra) if extra else base
+
+def extract_text_pdf(pdf_path, page_index):
+    """PDF에서 텍스트 추출 (한 페이지만 필요할 때, 여러 페이지는 PdfSession 사용)"""
+    try:
+        with PdfSession(pdf_path) as session:
+            return session.extract_text(page_index)
     except Exception as e:
         log(f"[extract_text_pdf] 오류: {e}")
         return ""
 
 def extract_text_ocr(pdf_path, page_index, dpi=200):
-    """OCR을 사용한 텍스트 추출"""
-    if not (OCR_OK and pytesseract):
-        return ""
+    """OCR을 사용한 텍스트 추출 (한 페이지만 필요할 때)"""
     try:
-        imgs = convert_from_path(pdf_path, dpi=dpi,
-                               first_page=page_index + 1,
-                               last_page=page_index + 1)
-        if not imgs:
-            return ""
-        return pytesseract.image_to_string(imgs[0], lang="kor+eng").strip()
+        with PdfSession(pdf_path) as session:
+            return session.extract_text_ocr(page_index, dpi=dpi)
     except Exception as e:
         log(f"[OCR] 실패 p{page_index}: {e}")
         return ""
 
 def get_clean_text(pdf_path, page_index):
-    """깨끗한 텍스트 추출 (자동 OCR 백업)"""
-    base = extract_text_pdf(pdf_path, page_index)
-    if looks_garbled(base):
-        log(f"[p{page_index}] 텍스트 깨짐 감지 → OCR")
-        ocr = extract_text_ocr(pdf_path, page_index)
-        if ocr and not looks_garbled(ocr):
-            log(f"[p{page_index}] OCR 사용")
-            return ocr
-        # OCR도 만족 못하면 base 혹은 ocr 중 길이 긴 것 반환
-        return ocr if len(ocr) > len(base) else base
-    return base
+    """깨끗한 텍스트 추출 (자동 OCR 백업, 한 페이지만 필요할 때)"""
+    try:
+        with PdfSession(pdf_path) as session:
+            return session.get_clean_text(page_index)
+    except Exception as e:
+        log(f"[get_clean_text] 오류: {e}")
+        return ""
 
 def add_table_chunk(slide, numbered_lines, top_in=4.5, height_in=3.0):
     """
@@ -183,10 +396,10 @@ def add_text_fallback(slide, numbered_lines, top_in, height_in):
     except Exception as e:
         log(f"텍스트박스 생성도 실패: {e}")
 
-def add_page_image(slide, img_path):
-    """슬라이드에 페이지 이미지 추가"""
+def add_page_image(slide, image_file):
+    """슬라이드에 페이지 이미지 추가 (파일 경로 또는 스트림)"""
     try:
-        slide.shapes.add_picture(img_path, Inches(0), Inches(0),
+        slide.shapes.add_picture(image_file, Inches(0), Inches(0),
                                Inches(10), Inches(4.5))
     except Exception as e:
         log(f"이미지 추가 실패: {e}")
@@ -196,12 +409,12 @@ def add_page_image(slide, img_path):
         textbox.text_frame.text = "이미지 로드 실패"
 
 def page_to_images(pdf_path, page_index, dpi=160):
-    """PDF 페이지를 이미지로 변환"""
+    """PDF 페이지를 이미지로 변환 (한 페이지만 필요할 때)"""
     try:
-        imgs = convert_from_path(pdf_path, dpi=dpi,
-                               first_page=page_index+1,
-                               last_page=page_index+1)
-        return imgs
+        with PdfSession(pdf_path) as session:
+            imgs = session.page_to_images(page_index, dpi=dpi)
+            # 세션이 닫힐 때 이미지가 해제되지 않도록 복사
+            return [img.copy() for img in imgs]
     except Exception as e:
         log(f"페이지 이미지 변환 실패: {e}")
         return []
@@ -220,71 +433,75 @@ def convert_pdf(pdf_path, output_path,
         prs = Presentation()
         blank = prs.slide_layouts[6]  # 빈 레이아웃
         
-        # PDF 페이지 수 확인
-        with pdfplumber.open(pdf_path) as pdf:
-            total_pages = len(pdf.pages)
-        
-        log(f"총 {total_pages}페이지 변환 시작")
-        
-        for p in range(total_pages):
-            log(f"=== 페이지 {p+1}/{total_pages} 처리 시작 ===")
-            
-            # 텍스트 추출
-            raw_text = get_clean_text(pdf_path, p)
-            
-            # 라인 전처리
-            lines = [l.strip() for l in raw_text.splitlines()]
-            lines = [l for l in lines if l and len(l) > 1]  # 의미있는 라인만
+        # PDF를 한 번만 열어서 모든 페이지에 사용
+        with PdfSession(pdf_path) as session:
+            total_pages = session.page_count
             
-            if not lines:
-                lines = ["(텍스트 없음)"]
-            
-            # 번호 매기기
-            numbered = list(enumerate(lines, start=1))
-            chunks = list(split_lines(numbered, max_lines_per_slide))
-            
-            log(f"[p{p+1}] 원문 라인수: {len(lines)}, 슬라이드 분할: {len(chunks)}")
+            log(f"총 {total_pages}페이지 변환 시작")
+
+            # 렌더링 전에 페이지를 분류하고 OCR할 페이지는 한꺼번에 처리
+            plan = session.triage()
+            log(f"페이지 분류: {summarize_plan(plan)}")
+            session.prefetch_ocr(pages_needing_ocr(plan), image_dpi=dpi_image)
             
-            # 슬라이드 생성
-            for ci, chunk in enumerate(chunks):
-                slide = prs.slides.add_slide(blank)
+            for p in range(total_pages):
+                log(f"=== 페이지 {p+1}/{total_pages} 처리 시작 ===")
                 
-                # 첫 번째 청크에만 이미지 추가
-                if ci == 0:
-                    try:
-                        imgs = page_to_images(pdf_path, p, dpi=dpi_image)
-                        if imgs:
-                            tmp = f"__temp_p{p}_{os.getpid()}.png"
-                            imgs[0].save(tmp, "PNG")
-                            add_page_image(slide, tmp)
-                            
-                            # 임시 파일 정리
-                            try:
-                                os.remove(tmp)
-                            except:
-                                pass
-                    except Exception as e:
-                        log(f"[p{p+1}] 이미지 변환 실패: {e}")
-                else:
-                    # 연속 슬라이드 표시
-                    try:
-                        box = slide.shapes.add_textbox(Inches(0), Inches(0),
-                                                      Inches(10), Inches(0.6))
-                        tf = box.text_frame
-                        tf.text = f"페이지 {p+1} (계속 - {ci+1}/{len(chunks)})"
-                        
-                        # 스타일 설정
-                        for paragraph in tf.paragraphs:
-                            for run in paragraph.runs:
-                                run.font.bold = True
-                                run.font.size = Pt(14)
-                                run.font.name = "맑은 고딕"
-                                run.font.color.rgb = RGBColor(0, 100, 200)
-                    except Exception as e:
-                        log(f"헤더 추가 실패: {e}")
+                # 텍스트 추출
+                raw_text = session.get_clean_text(p)
+                
+                # 라인 전처리
+                lines = [l.strip() for l in raw_text.splitlines()]
+                lines = [l for l in lines if l and len(l) > 1]  # 의미있는 라인만
+                
+                if not lines:
+                    lines = ["(텍스트 없음)"]
                 
-                # 표 추가
-                add_table_chunk(slide, chunk, top_in=4.5, height_in=table_height_in)
+                # 번호 매기기
+                numbered = list(enumerate(lines, start=1))
+                chunks = list(split_lines(numbered, max_lines_per_slide))
+                
+                log(f"[p{p+1}] 원문 라인수: {len(lines)}, 슬라이드 분할: {len(chunks)}")
+                
+                # 슬라이드 생성
+                for ci, chunk in enumerate(chunks):
+                    slide = prs.slides.add_slide(blank)
+                    
+                    # 첫 번째 청크에만 이미지 추가
+                    if ci == 0:
+                        try:
+                            imgs = session.page_to_images(p, dpi=dpi_image)
+                            if imgs:
+                                # 임시 파일 없이 메모리 버퍼로 삽입
+                                buffer = io.BytesIO()
+                                imgs[0].save(buffer, "PNG")
+                                buffer.seek(0)
+                                add_page_image(slide, buffer)
+                        except Exception as e:
+                            log(f"[p{p+1}] 이미지 변환 실패: {e}")
+                    else:
+                        # 연속 슬라이드 표시
+                        try:
+                            box = slide.shapes.add_textbox(Inches(0), Inches(0),
+                                                          Inches(10), Inches(0.6))
+                            tf = box.text_frame
+                            tf.text = f"페이지 {p+1} (계속 - {ci+1}/{len(chunks)})"
+                            
+                            # 스타일 설정
+                            for paragraph in tf.paragraphs:
+                                for run in paragraph.runs:
+                                    run.font.bold = True
+                                    run.font.size = Pt(14)
+                                    run.font.name = "맑은 고딕"
+                                    run.font.color.rgb = RGBColor(0, 100, 200)
+                        except Exception as e:
+                            log(f"헤더 추가 실패: {e}")
+                    
+                    # 표 추가
+                    add_table_chunk(slide, chunk, top_in=4.5, height_in=table_height_in)
+                    
+                # 페이지 파싱 캐시와 렌더링 이미지 해제
+                session.release_page(p)
         
         # PPTX 저장
         prs.save(output_path)
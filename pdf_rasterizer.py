@@ -0,0 +1,213 @@
+"""
+PDF 페이지 래스터화 (청크 단위 스트리밍)
+
+convert_from_path()로 문서 전체를 한 번에 렌더링하면 모든 페이지가
+디코딩된 PIL 이미지로 동시에 메모리에 올라간다. 여기서는
+first_page/last_page 구간 단위로 pdftoppm을 호출하고, 페이지를 하나씩
+넘겨준 뒤 바로 해제하므로 최대 메모리가 페이지 수가 아니라
+청크 크기에 비례한다.
+
+페이지 렌더링과 JPEG 인코딩은 CPU 작업이므로 iter_encoded_pages()는
+페이지 구간을 프로세스 풀로 나눠 보내고, 워커에서 인코딩된 JPEG
+바이트를 페이지 순서대로 돌려준다. 풀은 프로세스당 하나만 만들어
+요청 간에 재사용한다.
+"""
+
+import io
+import multiprocessing
+import os
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+# 한 번에 렌더링할 페이지 수 (환경 변수로 조정 가능)
+DEFAULT_CHUNK_PAGES = max(1, int(os.environ.get('RASTER_CHUNK_PAGES', 4)))
+
+# 렌더링 워커 프로세스 수 (1이면 현재 프로세스에서 순차 처리)
+RENDER_WORKERS = max(1, int(os.environ.get('RENDER_WORKERS', os.cpu_count() or 1)))
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+def get_pdf_page_count(pdf_path):
+    """pdfinfo로 PDF 페이지 수 확인 (렌더링 없음)"""
+    info = pdfinfo_from_path(pdf_path)
+    return int(info.get('Pages', 0))
+
+
+def iter_pdf_pages(pdf_path, dpi=150, chunk_size=None, page_count=None, **convert_kwargs):
+    """
+    PDF 페이지를 청크 단위로 렌더링하여 한 장씩 반환
+
+    Args:
+        pdf_path (str): PDF 파일 경로
+        dpi (int): 렌더링 해상도
+        chunk_size (int): pdftoppm 1회 호출당 페이지 수
+        page_count (int): 이미 알고 있는 페이지 수 (없으면 pdfinfo로 확인)
+        **convert_kwargs: convert_from_path에 그대로 전달할 옵션 (fmt 등)
+
+    Yields:
+        tuple: (0부터 시작하는 페이지 번호, PIL 이미지)
+        이미지는 소비자가 다음 페이지를 요청하는 시점에 닫힌다.
+    """
+    chunk_size = max(1, int(chunk_size or DEFAULT_CHUNK_PAGES))
+    if page_count is None:
+        page_count = get_pdf_page_count(pdf_path)
+
+    for first in range(1, page_count + 1, chunk_size):
+        last = min(first + chunk_size - 1, page_count)
+        chunk = convert_from_path(pdf_path, dpi=dpi,
+                                  first_page=first, last_page=last,
+                                  **convert_kwargs)
+        chunk.reverse()  # pop()으로 앞 페이지부터 꺼내기 위함
+
+        page_index = first - 1
+        while chunk:
+            image = chunk.pop()
+            try:
+                yield page_index, image
+            finally:
+                image.close()
+                del image
+            page_index += 1
+
+
+def encode_jpeg(image, quality=85, optimize=False):
+    """
+    페이지 이미지를 메모리 버퍼에 JPEG로 인코딩
+
+    python-docx의 add_picture와 python-pptx의 shapes.add_picture는
+    파일 경로 대신 스트림도 받으므로, 임시 JPEG 파일을 쓰고 다시 읽고
+    삭제하는 과정을 생략할 수 있다.
+
+    Returns:
+        io.BytesIO: 처음 위치로 되감긴 JPEG 스트림
+    """
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=quality, optimize=optimize)
+    buffer.seek(0)
+    return buffer
+
+
+def _render_encoded_range(pdf_path, first, last, dpi, quality, max_size, optimize, fmt='ppm'):
+    """워커 프로세스: first~last 페이지를 렌더링하고 JPEG 바이트 목록 반환"""
+    from PIL import Image
+
+    encoded = []
+    for image in convert_from_path(pdf_path, dpi=dpi, first_page=first, last_page=last, fmt=fmt):
+        if max_size and (image.size[0] > max_size[0] or image.size[1] > max_size[1]):
+            image.thumbnail(max_size, Image.Resampling.LANCZOS)
+        encoded.append(encode_jpeg(image, quality=quality, optimize=optimize).getvalue())
+        image.close()
+    return encoded
+
+
+def encode_page(pdf_path, page_index, dpi=150, quality=85, max_size=None, optimize=False):
+    """
+    PDF 한 페이지만 렌더링해서 JPEG로 인코딩 (일부 페이지만 이미지로 넣을 때 사용)
+
+    Returns:
+        io.BytesIO: 처음 위치로 되감긴 JPEG 스트림
+    """
+    data = _render_encoded_range(pdf_path, page_index + 1, page_index + 1,
+                                 dpi, quality, max_size, optimize)[0]
+    return io.BytesIO(data)
+
+
+def get_render_pool():
+    """요청 간에 공유하는 렌더링 프로세스 풀 (처음 사용할 때 생성)"""
+    global _render_pool
+
+    if RENDER_WORKERS <= 1:
+        return None
+
+    with _render_pool_lock:
+        if _render_pool is None:
+            # 스레드를 쓰는 웹 서버 안에서 fork하지 않도록 spawn 사용
+            _render_pool = ProcessPoolExecutor(
+                max_workers=RENDER_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _render_pool
+
+
+def shutdown_render_pool():
+    """렌더링 프로세스 풀 종료 (다음 사용 시 다시 생성됨)"""
+    global _render_pool
+
+    with _render_pool_lock:
+        pool, _render_pool = _render_pool, None
+    if pool is not None:
+        if sys.version_info >= (3, 9):
+            pool.shutdown(wait=False, cancel_futures=True)
+        else:
+            pool.shutdown(wait=False)  # 3.8에는 cancel_futures가 없음
+
+
+def iter_encoded_pages(pdf_path, dpi=150, quality=85, max_size=None, optimize=False,
+                       chunk_size=None, page_count=None, fmt='ppm'):
+    """
+    PDF 페이지를 렌더링하고 JPEG로 인코딩하여 페이지 순서대로 반환
+
+    RENDER_WORKERS > 1이면 chunk_size 페이지씩 프로세스 풀에 나눠 보낸다.
+    동시에 진행 중인 구간은 워커 수의 2배로 제한하므로 결과 버퍼가
+    문서 전체만큼 쌓이지 않는다.
+
+    Args:
+        pdf_path (str): PDF 파일 경로
+        dpi (int): 렌더링 해상도
+        quality (int): JPEG 품질
+        max_size (tuple): (최대 너비, 최대 높이), 넘으면 축소
+        optimize (bool): JPEG optimize 옵션
+        chunk_size (int): 작업 1개당 페이지 수
+        page_count (int): 이미 알고 있는 페이지 수
+        fmt (str): pdftoppm 출력 형식 (convert_from_path의 fmt, 품질 설정의 'format')
+
+    Yields:
+        tuple: (0부터 시작하는 페이지 번호, JPEG io.BytesIO)
+    """
+    if page_count is None:
+        page_count = get_pdf_page_count(pdf_path)
+
+    pool = get_render_pool()
+    if pool is None:
+        from PIL import Image
+
+        for index, image in iter_pdf_pages(pdf_path, dpi=dpi, chunk_size=chunk_size,
+                                           page_count=page_count, fmt=fmt):
+            if max_size and (image.size[0] > max_size[0] or image.size[1] > max_size[1]):
+                image.thumbnail(max_size, Image.Resampling.LANCZOS)
+            yield index, encode_jpeg(image, quality=quality, optimize=optimize)
+        return
+
+    chunk_size = max(1, int(chunk_size or DEFAULT_CHUNK_PAGES))
+    ranges = deque((first, min(first + chunk_size - 1, page_count))
+                   for first in range(1, page_count + 1, chunk_size))
+    pending = deque()
+
+    try:
+        while ranges or pending:
+            while ranges and len(pending) < RENDER_WORKERS * 2:
+                first, last = ranges.popleft()
+                future = pool.submit(_render_encoded_range, pdf_path, first, last,
+                                     dpi, quality, max_size, optimize, fmt)
+                pending.append((first, future))
+
+            first, future = pending.popleft()
+            for offset, data in enumerate(future.result()):
+                yield first - 1 + offset, io.BytesIO(data)
+    except BrokenProcessPool:
+        # poppler 크래시 등으로 워커가 죽으면 다음 요청을 위해 풀을 새로 만든다
+        shutdown_render_pool()
+        raise
+    finally:
+        for _, future in pending:
+            future.cancel()
@@ -0,0 +1,251 @@
+"""
+PDF → DOCX 텍스트 모드
+
+이미지 모드는 모든 페이지를 그림으로 렌더링해서 DOCX에 넣기 때문에
+결과 파일이 크고, 텍스트를 검색하거나 편집할 수 없고, 변환도 느리다.
+
+텍스트 레이어가 있는 PDF(워드프로세서 등에서 만든 PDF)는 pdfplumber로
+단어와 글꼴 정보를 읽어서 DOCX 문단/run/표로 바로 쓴다.
+- 단어는 extract_text_pdf(pdf_converter_advanced)와 같은 방식으로 줄로 묶고,
+  줄 간격과 글자 크기로 문단을 나눈다
+- 같은 서식(굵게, 크기)이 이어지는 단어는 run 하나로 합친다
+- 선으로 그려진 표는 DOCX 표로 쓰고, 표 안의 단어는 본문에서 뺀다
+- text_layer_unusable이 쓸 수 없다고 판단한 페이지(스캔 이미지, 글꼴 인코딩 깨짐)만
+  기존처럼 그림으로 렌더링해서 넣는다. OCR 여부를 정하는 looks_garbled와 달리
+  한글 비율은 보지 않으므로 영문 등 한글이 없는 PDF도 텍스트로 변환한다
+- 그림 렌더링이 실패한 페이지는 안내 문단으로 대신하고 다음 페이지를 계속 처리한다
+
+사용법:
+    doc = Document()
+    stats = convert_pdf_text_to_docx('input.pdf', doc, Inches(6))
+    doc.save('output.docx')
+"""
+
+import re
+from collections import defaultdict
+
+import pdfplumber
+from docx.shared import Pt
+
+from page_triage import MAX_JUNK_RATIO, MAX_UNMAPPED_RATIO
+from pdf_rasterizer import encode_page
+
+# 단어 세로 중앙을 이 간격(pt) 단위로 묶어서 한 줄로 봄 (extract_text_pdf와 같음)
+LINE_BUCKET = 3
+
+# 앞 줄과의 빈 간격이 글자 크기의 이 배수보다 크면 새 문단
+PARAGRAPH_GAP_RATIO = 0.6
+
+# 글자 크기가 이만큼(pt) 넘게 바뀌면 새 문단 (제목과 본문 분리)
+PARAGRAPH_SIZE_CHANGE = 1
+
+BOLD_MARKERS = ('bold', 'black', 'heavy')
+
+# 공백을 뺀 글자 중 문자/숫자 비율이 이보다 낮으면 쓸 수 없는 텍스트로 봄
+MIN_LETTER_RATIO = 0.3
+
+# pdfplumber가 유니코드로 매핑하지 못한 글리프를 쓰는 형태
+CID_PATTERN = re.compile(r"\(cid:\d+\)")
+
+
+def _is_unmapped(char):
+    code = ord(char)
+    return code == 0xFFFD or 0xE000 <= code <= 0xF8FF
+
+
+def text_layer_unusable(text):
+    """
+    텍스트 모드용 깨짐 판정 (언어와 무관)
+
+    문자/숫자 비율, 제어 문자 비율, 매핑 실패((cid:N), U+FFFD, 사용자 정의 영역)
+    비율로 판단한다. 제어 문자와 매핑 실패 기준은 page_triage와 같다.
+    """
+    sample = text[:2000] if text else ''
+    cid = len(CID_PATTERN.findall(sample))
+    sample = CID_PATTERN.sub('', sample)
+
+    chars = [c for c in sample if not c.isspace()]
+    glyphs = len(chars) + cid
+    if glyphs == 0:
+        return True
+
+    unmapped = sum(1 for c in chars if _is_unmapped(c)) + cid
+    letters = sum(1 for c in chars if c.isalnum() and not _is_unmapped(c))
+    junk = sum(1 for c in sample if (0 <= ord(c) < 32 and not c.isspace()) or 127 <= ord(c) < 160)
+    return (letters < MIN_LETTER_RATIO * max(1, len(chars))
+            or junk / max(1, len(sample)) > MAX_JUNK_RATIO
+            or unmapped / glyphs > MAX_UNMAPPED_RATIO)
+
+
+def _is_bold(fontname):
+    # 서브셋 글꼴 이름은 'ABCDEF+NanumGothicBold' 형태
+    name = fontname.lower()
+    return any(marker in name for marker in BOLD_MARKERS)
+
+
+def _inside(word, box):
+    x0, top, x1, bottom = box
+    x = (word['x0'] + word['x1']) / 2
+    y = (word['top'] + word['bottom']) / 2
+    return x0 <= x <= x1 and top <= y <= bottom
+
+
+def _group_lines(words):
+    """단어를 줄로 묶음 (위에서 아래 순서, 줄 안에서는 왼쪽부터)"""
+    line_map = defaultdict(list)
+    for word in words:
+        mid = (word['top'] + word['bottom']) / 2
+        line_map[round(mid / LINE_BUCKET)].append(word)
+
+    lines = []
+    for key in sorted(line_map):
+        line_words = sorted(line_map[key], key=lambda w: w['x0'])
+        lines.append({
+            'top': min(w['top'] for w in line_words),
+            'bottom': max(w['bottom'] for w in line_words),
+            'size': max(w.get('size', 0) for w in line_words),
+            'words': line_words,
+        })
+    return lines
+
+
+def _group_paragraphs(lines):
+    """줄 간격과 글자 크기 변화로 문단 나누기"""
+    paragraphs = []
+    previous = None
+    for line in lines:
+        if (previous is None
+                or line['top'] - previous['bottom'] > previous['size'] * PARAGRAPH_GAP_RATIO
+                or abs(line['size'] - previous['size']) > PARAGRAPH_SIZE_CHANGE):
+            paragraphs.append({'type': 'paragraph', 'top': line['top'], 'lines': [line]})
+        else:
+            paragraphs[-1]['lines'].append(line)
+        previous = line
+    return paragraphs
+
+
+def _paragraph_runs(lines):
+    """
+    문단의 단어를 서식별 run으로 합침
+
+    Returns:
+        list: [(텍스트, 굵게 여부, 글자 크기 pt)]
+    """
+    runs = []
+    for line in lines:
+        for word in line['words']:
+            bold = _is_bold(word.get('fontname', ''))
+            size = round(word.get('size', 0) * 2) / 2  # 0.5pt 단위
+            if runs and runs[-1][1] == bold and runs[-1][2] == size:
+                runs[-1][0].append(word['text'])
+            else:
+                runs.append(([word['text']], bold, size))
+    return [(' '.join(texts), bold, size) for texts, bold, size in runs]
+
+
+def extract_page_blocks(page):
+    """
+    페이지의 문단과 표를 위에서 아래 순서로 추출
+
+    Returns:
+        list: [{'type': 'paragraph', 'top', 'lines'} 또는 {'type': 'table', 'top', 'rows'}],
+              텍스트가 깨졌거나 없으면 None (그림으로 넣어야 하는 페이지)
+    """
+    words = page.extract_words(use_text_flow=True, extra_attrs=['fontname', 'size']) or []
+
+    tables = []
+    for table in page.find_tables():
+        rows = [[cell or '' for cell in row] for row in table.extract()]
+        if len(rows) >= 2 and max(len(row) for row in rows) >= 2:
+            tables.append({'type': 'table', 'top': table.bbox[1], 'rows': rows, 'bbox': table.bbox})
+
+    if tables:
+        words = [w for w in words if not any(_inside(w, table['bbox']) for table in tables)]
+
+    lines = _group_lines(words)
+    page_text = '\n'.join(' '.join(w['text'] for w in line['words']) for line in lines)
+    page_text += '\n' + '\n'.join(cell for table in tables for row in table['rows'] for cell in row)
+    if text_layer_unusable(page_text):
+        return None
+
+    blocks = _group_paragraphs(lines) + tables
+    blocks.sort(key=lambda block: block['top'])
+    return blocks
+
+
+def _write_paragraph(doc, block):
+    paragraph = doc.add_paragraph()
+    runs = _paragraph_runs(block['lines'])
+    for i, (text, bold, size) in enumerate(runs):
+        run = paragraph.add_run(text if i == len(runs) - 1 else text + ' ')
+        if bold:
+            run.bold = True
+        if size:
+            run.font.size = Pt(size)
+
+
+def _write_table(doc, block):
+    rows = block['rows']
+    column_count = max(len(row) for row in rows)
+    table = doc.add_table(rows=len(rows), cols=column_count)
+    try:
+        table.style = 'Table Grid'
+    except (KeyError, ValueError):
+        pass  # 스타일이 없는 템플릿이면 기본 표
+    for row, cells in zip(table.rows, rows):
+        for cell, text in zip(row.cells, cells):
+            cell.text = text
+
+
+def convert_pdf_text_to_docx(pdf_path, doc, image_width, on_progress=None, dpi=150, quality=85):
+    """
+    PDF 텍스트 레이어를 DOCX 문단/표로 변환 (깨진 페이지만 그림으로)
+
+    Args:
+        pdf_path (str): PDF 파일 경로
+        doc (docx.Document): 내용을 추가할 문서 (방향 설정과 저장은 호출하는 쪽에서)
+        image_width (Length): 그림으로 넣는 페이지의 너비
+        on_progress (callable): 페이지마다 on_progress(처리한 페이지 수, 전체 페이지 수)
+        dpi (int): 그림으로 넣는 페이지의 렌더링 해상도
+        quality (int): 그림으로 넣는 페이지의 JPEG 품질
+
+    Returns:
+        dict: {'pages', 'text_pages', 'raster_pages', 'failed_pages'}
+    """
+    text_pages = 0
+    raster_pages = 0
+    failed_pages = 0
+
+    with pdfplumber.open(pdf_path) as pdf:
+        total_pages = len(pdf.pages)
+        for index, page in enumerate(pdf.pages):
+            if index > 0:
+                doc.add_page_break()
+
+            blocks = extract_page_blocks(page)
+            if blocks is None:
+                print(f"[p{index + 1}] 텍스트 레이어 없음/깨짐 → 이미지로 삽입")
+                try:
+                    doc.add_picture(encode_page(pdf_path, index, dpi=dpi, quality=quality),
+                                    width=image_width)
+                    raster_pages += 1
+                except Exception as e:
+                    # 한 페이지 렌더링 실패로 이미 변환한 다른 페이지를 버리지 않음
+                    print(f"⚠️ [p{index + 1}] 이미지 변환 실패: {e}")
+                    doc.add_paragraph(f"[페이지 {index + 1} - 이미지 변환 실패]")
+                    failed_pages += 1
+            else:
+                for block in blocks:
+                    if block['type'] == 'paragraph':
+                        _write_paragraph(doc, block)
+                    else:
+                        _write_table(doc, block)
+                text_pages += 1
+
+            # 페이지별 파싱 결과 해제 (긴 문서에서 메모리가 쌓이지 않도록)
+            page.close()
+            if on_progress:
+                on_progress(index + 1, total_pages)
+
+    return {'pages': total_pages, 'text_pages': text_pages, 'raster_pages': raster_pages,
+            'failed_pages': failed_pages}
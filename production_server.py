@@ -0,0 +1,159 @@
+"""
+프로덕션 서버 (gunicorn)
+
+main.py에서 SERVER_MODE=production일 때 사용한다. Werkzeug 개발 서버 대신
+gunicorn으로 여러 워커 프로세스와 스레드에서 서비스하고, 다음을 지원한다.
+
+- 워커 프로세스/스레드 수 설정 (WEB_WORKERS, WEB_THREADS)
+- 변환 N회 후 워커 재시작 (WORKER_MAX_CONVERSIONS) - PIL/reportlab 메모리 누수 차단
+- 요청 N회 후 워커 재시작 (WORKER_MAX_REQUESTS, WORKER_MAX_REQUESTS_JITTER)
+- 정상 종료/재시작 시 실행 중인 변환을 GRACEFUL_TIMEOUT초까지 기다림
+  (마스터에 SIGHUP을 보내면 워커를 하나씩 교체)
+- 마스터에서 폰트를 미리 등록하고(fork로 공유), 워커마다 변환 라이브러리를 미리 로드
+
+워커가 여러 개이면 작업 상태를 JOB_STATE_DIR(기본값 outputs/jobs)에 기록해서
+어느 워커가 상태 조회를 받아도 응답할 수 있게 한다.
+"""
+
+import os
+import sys
+import time
+
+try:
+    from gunicorn.app.base import BaseApplication
+    GUNICORN_AVAILABLE = True
+except ImportError:  # Windows 등 gunicorn을 사용할 수 없는 환경
+    BaseApplication = object
+    GUNICORN_AVAILABLE = False
+
+# run_production()에서 채움 (fork된 워커의 훅에서 그대로 사용)
+SETTINGS = {}
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def _env_flag(name, default='1'):
+    return os.environ.get(name, default).lower() not in ('0', 'false', 'no', 'off')
+
+
+def load_settings():
+    """환경 변수로 프로덕션 서버 설정 생성"""
+    return {
+        'host': os.environ.get('HOST', '0.0.0.0'),
+        'port': _env_int('PORT', 8080),
+        'workers': max(1, _env_int('WEB_WORKERS', 2)),
+        'threads': max(1, _env_int('WEB_THREADS', 4)),
+        'max_conversions': max(0, _env_int('WORKER_MAX_CONVERSIONS', 50)),
+        'max_requests': max(0, _env_int('WORKER_MAX_REQUESTS', 0)),
+        'max_requests_jitter': max(0, _env_int('WORKER_MAX_REQUESTS_JITTER', 0)),
+        'timeout': _env_int('WORKER_TIMEOUT', 60),
+        'graceful_timeout': _env_int('GRACEFUL_TIMEOUT', 120),
+        'preload_converters': _env_flag('PRELOAD_CONVERTERS'),
+    }
+
+
+def configure_environment(settings):
+    """final_server import 전에 워커 수에 맞춰 기본값 조정"""
+    if settings['workers'] > 1:
+        # 작업을 받은 워커와 상태를 조회하는 워커가 다를 수 있음
+        os.environ.setdefault('JOB_STATE_DIR', os.path.join('outputs', 'jobs'))
+    # 웹 워커마다 렌더링 프로세스 풀을 두므로 CPU를 워커 수로 나눔
+    os.environ.setdefault('RENDER_WORKERS',
+                          str(max(1, (os.cpu_count() or 1) // settings['workers'])))
+
+
+# ---------------- gunicorn 훅 ----------------
+
+def post_fork(server, worker):
+    """워커 시작 시 변환 라이브러리와 폰트 미리 로드"""
+    if SETTINGS.get('preload_converters'):
+        from final_server import preload_converters
+        preload_converters()
+
+
+def post_request(worker, req, environ, resp):
+    """변환 횟수가 한도에 도달한 워커는 새 요청을 받지 않고 재시작"""
+    max_conversions = SETTINGS.get('max_conversions')
+    if not max_conversions or not worker.alive:
+        return
+
+    from final_server import job_queue
+    if job_queue.completed_count >= max_conversions:
+        worker.log.info("변환 %d회 처리 - 워커 재시작 예약 (pid %s)",
+                        job_queue.completed_count, worker.pid)
+        worker.alive = False
+
+
+def worker_exit(server, worker):
+    """실행 중이거나 대기 중인 변환이 끝날 때까지 대기 (GRACEFUL_TIMEOUT까지)"""
+    final_server = sys.modules.get('final_server')
+    if final_server is None:
+        return
+
+    job_queue = final_server.job_queue
+    deadline = time.time() + SETTINGS.get('graceful_timeout', 0)
+    while not job_queue.is_idle() and time.time() < deadline:
+        # 대기하는 동안 마스터가 응답 없는 워커로 판단하지 않도록 heartbeat 전송
+        worker.notify()
+        time.sleep(0.5)
+
+    if not job_queue.is_idle():
+        worker.log.warning("종료 대기 시간 초과 - 완료되지 않은 변환 작업이 있습니다 (pid %s)",
+                           worker.pid)
+
+
+class ProductionServer(BaseApplication):
+    """final_server 앱을 gunicorn으로 실행"""
+
+    def __init__(self, settings):
+        self.settings = settings
+        super().__init__()
+
+    def load_config(self):
+        s = self.settings
+        config = {
+            'bind': f"{s['host']}:{s['port']}",
+            'workers': s['workers'],
+            'threads': s['threads'],
+            'worker_class': 'gthread',
+            'max_requests': s['max_requests'],
+            'max_requests_jitter': s['max_requests_jitter'],
+            'timeout': s['timeout'],
+            'graceful_timeout': s['graceful_timeout'],
+            'preload_app': True,
+            'post_fork': post_fork,
+            'post_request': post_request,
+            'worker_exit': worker_exit,
+        }
+        for key, value in config.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from final_server import app, font_registry
+        # 마스터에서 한 번 등록하면 fork된 워커가 그대로 공유
+        font_registry.preload()
+        return app
+
+
+def run_production(settings=None):
+    """
+    gunicorn으로 서버 실행
+
+    Returns:
+        bool: gunicorn을 사용할 수 없어 실행하지 못하면 False
+    """
+    if not GUNICORN_AVAILABLE:
+        print("⚠️ gunicorn 없음 - 프로덕션 모드를 사용할 수 없습니다 (pip install gunicorn)")
+        return False
+
+    settings = settings or load_settings()
+    SETTINGS.update(settings)
+    configure_environment(settings)
+
+    print(f"🏭 프로덕션 모드: 워커 {settings['workers']}개 × 스레드 {settings['threads']}개")
+    if settings['max_conversions']:
+        print(f"♻️ 워커당 변환 {settings['max_conversions']}회 후 재시작")
+    ProductionServer(settings).run()
+    return True
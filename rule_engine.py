@@ -0,0 +1,315 @@
+"""
+텍스트 필터 규칙 엔진
+
+builder1_filter와 custom_filter_rules는 각자 정규식 문자열 목록을 들고
+줄마다 re.search(pattern, line, re.IGNORECASE)를 패턴 수만큼 호출한 뒤,
+남은 줄을 다시 합쳐서 filter_text_blocks에 넘겼다. custom_filter_rules는
+패턴 목록을 줄마다 새로 만들었고, 패턴을 바꾸려면 코드를 고쳐야 했다.
+
+여기서는 규칙 묶음(rule set)을 파일에서 읽는다.
+- rules/*.txt: 한 줄에 정규식 하나, custom_words.txt: 한 줄에 단어 하나
+  ('//'로 시작하는 줄과 빈 줄은 무시)
+- 규칙 묶음 하나를 교대(alternation) 정규식 하나로 컴파일해서 줄마다 검색을 한 번만
+  하고, 걸린 줄만 규칙마다 이름 붙은 그룹이 있는 정규식으로 어떤 규칙인지 확인
+  (이름 붙은 그룹이 있으면 re의 리터럴 접두사 최적화가 꺼져서 검색이 10배 이상 느림)
+- 컴파일 결과는 규칙 내용의 해시로 캐시 (같은 파일을 여러 필터가 읽어도 한 번만 컴파일)
+- RuleEngine은 줄을 하나씩 흘려보내면서 보호(keep) 묶음 → 제거(drop) 묶음 순서로
+  검사하고, 남은 줄을 그대로 iter_filter_lines(노이즈 필터)로 이어서 흘려보낸다
+  (filter_text는 window=None으로 filter_text_blocks와 같은 결과, 다시 합치고 나누지 않음)
+- 규칙별 적중 횟수와 단계별 소요 시간을 stats()로 제공
+- custom_words.txt는 기본으로 쓰지 않는다 (기존 필터는 이 파일을 읽지 않았음).
+  create_rule_engine(..., protect_words=True)로 켜면 그 단어가 들어간 줄은 제거
+  규칙에서 보호되므로 결과가 달라진다
+
+사용법:
+    engine = RuleEngine([load_rule_set(CUSTOM_WORDS_PATH, kind='literal', action='keep'),
+                         load_rule_set(os.path.join(RULES_DIR, 'ui_noise.txt'))])
+    text = engine.filter_text(raw_text)
+    print(engine.stats())
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+
+from advanced_text_filter import SECOND_PASS_WINDOW, iter_filter_lines
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RULES_DIR = os.path.join(BASE_DIR, 'rules')
+CUSTOM_WORDS_PATH = os.path.join(BASE_DIR, 'custom_words.txt')
+
+ACTION_DROP = 'drop'
+ACTION_KEEP = 'keep'
+
+COMMENT_PREFIX = '//'
+
+_compiled_sets = {}  # 규칙 내용 해시 -> (규칙 목록, 검색용 정규식, 규칙 확인용 정규식)
+_compiled_lock = threading.Lock()
+
+
+class RuleSet:
+    """컴파일된 규칙 묶음"""
+
+    def __init__(self, name, rules, pattern, named_pattern, action, content_hash, lowercase=False):
+        self.name = name
+        self.rules = rules
+        self.pattern = pattern
+        self.named_pattern = named_pattern  # 규칙 하나당 이름 붙은 그룹 하나 (r0, r1, ...)
+        self.action = action
+        self.content_hash = content_hash
+        self.lowercase = lowercase  # 단어 규칙은 줄을 소문자로 바꿔서 비교
+
+    def match(self, line):
+        """
+        줄에 걸리는 규칙 번호
+
+        Returns:
+            int: 가장 앞에서 걸린 규칙의 번호, 없으면 None
+        """
+        if self.lowercase:
+            line = line.lower()
+        match = self.pattern.search(line)
+        if match is None:
+            return None
+        # 같은 위치에서 같은 순서로 다시 맞춰 보면 검색에서 걸린 규칙이 나옴
+        return int(self.named_pattern.match(line, match.start()).lastgroup[1:])
+
+
+def compile_rule_set(name, rules, kind='regex', action=ACTION_DROP):
+    """
+    규칙 목록을 정규식 하나로 컴파일 (내용이 같으면 캐시 사용)
+
+    Args:
+        name (str): 통계에 표시할 이름
+        rules (list): 정규식 또는 단어 목록
+        kind (str): 'regex' 또는 'literal' (단어는 그대로, 대소문자 무시하고 찾음)
+        action (str): 'drop'(걸리면 제거) 또는 'keep'(걸리면 제거 규칙에서 보호)
+
+    Raises:
+        ValueError: 정규식이 잘못된 경우 (어느 규칙인지 포함)
+    """
+    if kind not in ('regex', 'literal'):
+        raise ValueError(f"알 수 없는 규칙 종류: {kind}")
+    if action not in (ACTION_DROP, ACTION_KEEP):
+        raise ValueError(f"알 수 없는 규칙 동작: {action}")
+
+    rules = list(rules)
+    content_hash = hashlib.sha256(
+        '\n'.join([kind] + rules).encode('utf-8')).hexdigest()
+
+    with _compiled_lock:
+        cached = _compiled_sets.get(content_hash)
+    lowercase = kind == 'literal'
+    if cached is None:
+        # 단어는 소문자로 바꿔서 대소문자 구분 검색 (IGNORECASE 리터럴 검색보다 훨씬 빠름)
+        flags = 0 if lowercase else re.IGNORECASE
+        sources = []
+        for index, rule in enumerate(rules):
+            source = re.escape(rule.lower()) if lowercase else rule
+            try:
+                re.compile(source, flags)
+            except re.error as e:
+                raise ValueError(f"{name} 규칙 {index + 1} '{rule}' 오류: {e}") from e
+            sources.append(source)
+        pattern = re.compile('|'.join(f"(?:{source})" for source in sources) or '(?!)', flags)
+        named_pattern = re.compile('|'.join(f"(?P<r{index}>{source})"
+                                            for index, source in enumerate(sources)) or '(?!)', flags)
+        cached = (rules, pattern, named_pattern)
+        with _compiled_lock:
+            _compiled_sets[content_hash] = cached
+
+    return RuleSet(name, cached[0], cached[1], cached[2], action, content_hash, lowercase)
+
+
+def read_rules(path):
+    """규칙 파일 읽기 (주석과 빈 줄 제외, 앞뒤 공백 제거)"""
+    with open(path, encoding='utf-8') as f:
+        lines = [line.strip() for line in f]
+    return [line for line in lines if line and not line.startswith(COMMENT_PREFIX)]
+
+
+def load_rule_set(path, kind='regex', action=ACTION_DROP, name=None):
+    """규칙 파일을 읽어서 컴파일 (이름은 기본으로 파일 이름)"""
+    if name is None:
+        name = os.path.splitext(os.path.basename(path))[0]
+    return compile_rule_set(name, read_rules(path), kind=kind, action=action)
+
+
+class RuleEngine:
+    """규칙 묶음들과 노이즈 필터(iter_filter_lines)를 한 번의 줄 단위 흐름으로 실행"""
+
+    def __init__(self, rule_sets):
+        self.keep_sets = [rule_set for rule_set in rule_sets if rule_set.action == ACTION_KEEP]
+        self.drop_sets = [rule_set for rule_set in rule_sets if rule_set.action == ACTION_DROP]
+
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self._hits = {rule_set.name: [0] * len(rule_set.rules)
+                          for rule_set in self.keep_sets + self.drop_sets}
+            self._seconds = {}
+            self._lines_in = 0
+            self._lines_out = 0
+            self._runs = 0
+
+    def iter_lines(self, lines, hits=None, seconds=None):
+        """
+        규칙 단계: 앞뒤 공백을 뗀 줄 중 제거 규칙에 걸리지 않은 줄을 순서대로 생성
+
+        Args:
+            lines (iterable): 입력 줄
+            hits (dict): 규칙 묶음 이름 -> 규칙별 적중 횟수 목록 (호출하는 쪽이 모음)
+            seconds (dict): 단계 이름 -> 소요 시간 (호출하는 쪽이 모음)
+        """
+        rule_sets = self.keep_sets + self.drop_sets
+        if hits is None:
+            hits = {rule_set.name: [0] * len(rule_set.rules) for rule_set in rule_sets}
+        if seconds is None:
+            seconds = {}
+        stage_seconds = dict.fromkeys((f"rules:{rule_set.name}" for rule_set in rule_sets), 0.0)
+
+        try:
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    continue
+
+                keep = False
+                drop = False
+                for rule_set in rule_sets:
+                    if keep and rule_set.action == ACTION_DROP:
+                        break  # 보호된 줄은 제거 규칙을 검사하지 않음
+                    start = time.perf_counter()
+                    index = rule_set.match(line)
+                    stage_seconds[f"rules:{rule_set.name}"] += time.perf_counter() - start
+                    if index is None:
+                        continue
+                    hits[rule_set.name][index] += 1
+                    if rule_set.action == ACTION_KEEP:
+                        keep = True
+                    else:
+                        drop = True
+                        break
+
+                if not drop:
+                    yield line
+        finally:
+            for stage, elapsed in stage_seconds.items():
+                seconds[stage] = seconds.get(stage, 0.0) + elapsed
+
+    def filter_text(self, text):
+        """
+        규칙 단계와 노이즈 필터를 거친 최종 텍스트
+
+        줄을 한 번만 흘려보낸다 (규칙 단계 결과를 합쳐서 filter_text_blocks로 다시
+        나누지 않음). window=None이라 filter_text_blocks와 결과가 같다.
+        """
+        if not text:
+            return ""
+        return "\n".join(self.iter_filtered(text.splitlines(), window=None))
+
+    def iter_filtered(self, lines, window=SECOND_PASS_WINDOW):
+        """
+        규칙 단계와 노이즈 필터(iter_filter_lines)를 이어서 줄을 하나씩 처리
+
+        전체 텍스트를 모으지 않으므로 페이지별 추출 결과를 바로 넘길 수 있다.
+
+        Args:
+            lines (iterable): 입력 줄
+            window (int): iter_filter_lines의 window (None이면 문서 전체)
+
+        Yields:
+            str: 남길 줄
+        """
+        hits = {rule_set.name: [0] * len(rule_set.rules)
+                for rule_set in self.keep_sets + self.drop_sets}
+        seconds = {}
+        counts = {'in': 0, 'out': 0}
+
+        def counted(source, key):
+            for line in source:
+                counts[key] += 1
+                yield line
+
+        kept = counted(self.iter_lines(counted(lines, 'in'), hits, seconds), 'out')
+        stream = iter_filter_lines(kept, window=window)
+        busy = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                line = next(stream, None)
+                busy += time.perf_counter() - start
+                if line is None:
+                    break
+                yield line
+        finally:
+            stream.close()
+            kept.close()
+            # 규칙 단계를 뺀 나머지 (입력이 생성기면 입력을 만드는 시간도 포함)
+            seconds['text_filter'] = max(0.0, busy - sum(seconds.values()))
+            self._record(hits, seconds, counts['in'], counts['out'])
+
+    def _record(self, hits, seconds, lines_in, lines_out):
+        with self._lock:
+            for name, counts in hits.items():
+                totals = self._hits[name]
+                for index, count in enumerate(counts):
+                    totals[index] += count
+            for stage, elapsed in seconds.items():
+                self._seconds[stage] = self._seconds.get(stage, 0.0) + elapsed
+            self._lines_in += lines_in
+            self._lines_out += lines_out
+            self._runs += 1
+
+    def stats(self):
+        """
+        누적 통계
+
+        Returns:
+            dict: {'runs', 'lines_in', 'lines_after_rules',
+                   'rules': {묶음 이름: {규칙: 적중 횟수}} (적중한 규칙만),
+                   'stage_seconds': {단계 이름: 초}}
+        """
+        with self._lock:
+            rules = {}
+            for rule_set in self.keep_sets + self.drop_sets:
+                counts = self._hits[rule_set.name]
+                rules[rule_set.name] = {rule: count
+                                        for rule, count in zip(rule_set.rules, counts) if count}
+            return {
+                'runs': self._runs,
+                'lines_in': self._lines_in,
+                'lines_after_rules': self._lines_out,
+                'rules': rules,
+                'stage_seconds': {stage: round(elapsed, 4)
+                                  for stage, elapsed in self._seconds.items()},
+            }
+
+
+def load_custom_words():
+    """custom_words.txt를 보호 규칙으로 로드 (파일이 없으면 None)"""
+    if not os.path.exists(CUSTOM_WORDS_PATH):
+        return None
+    return load_rule_set(CUSTOM_WORDS_PATH, kind='literal', action=ACTION_KEEP)
+
+
+def create_rule_engine(*rule_files, protect_words=False):
+    """
+    rules/ 아래 제거 규칙 파일들로 엔진 생성
+
+    Args:
+        protect_words (bool): custom_words.txt의 단어가 들어간 줄을 제거 규칙에서 보호
+            (기존 필터에는 없던 동작이라 기본은 끔)
+    """
+    rule_sets = []
+    if protect_words:
+        custom_words = load_custom_words()
+        if custom_words is not None:
+            rule_sets.append(custom_words)
+    for rule_file in rule_files:
+        rule_sets.append(load_rule_set(os.path.join(RULES_DIR, rule_file)))
+    return RuleEngine(rule_sets)
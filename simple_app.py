@@ -1,8 +1,8 @@
 from flask import Flask, request, render_template, send_file, jsonify
 import os
-import tempfile
 from werkzeug.utils import secure_filename
 from pdf2image import convert_from_path
+from pdf_rasterizer import encode_jpeg
 from docx import Document
 from docx.shared import Inches
 from PIL import Image
@@ -27,14 +27,10 @@ def pdf_to_docx_simple(pdf_path, output_path):
         doc = Document()
         
         for i, image in enumerate(images):
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_file:
-                image.save(temp_file.name, 'JPEG', quality=85)
-                doc.add_picture(temp_file.name, width=Inches(6))
-                
-                if i < len(images) - 1:
-                    doc.add_page_break()
-                    
-                os.unlink(temp_file.name)
+            doc.add_picture(encode_jpeg(image, quality=85), width=Inches(6))
+            
+            if i < len(images) - 1:
+                doc.add_page_break()
         
         doc.save(output_path)
         return True
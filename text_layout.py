@@ -0,0 +1,169 @@
+"""
+문단 줄바꿈 레이아웃
+
+기존 DOCX → PDF 렌더링은 글자를 하나씩 이어 붙이다가 글자 수가
+chars_per_line에 도달하면 줄을 나눴다. 긴 문단에서는 문자열 연결이
+제곱 시간이 되고, 단어 중간에서 잘리며, 실제 글자 폭을 무시해서
+영문이 많은 줄은 짧고 한글이 많은 줄은 여백을 넘었다.
+
+여기서는 등록된 폰트의 실제 글자 폭(pdfmetrics.stringWidth)으로 측정한다.
+- 글자 폭은 폰트별로 크기 1 기준으로 한 번만 계산해서 캐시하고, 크기는 곱해서 적용
+  (reportlab은 커닝 없이 글자 폭을 더하므로 stringWidth와 같은 값)
+- 누적 폭 배열을 한 번 만들고, 줄마다 이진 탐색으로 들어가는 위치를 찾은 뒤
+  그 앞의 가장 가까운 줄바꿈 가능 위치(공백, 한글 음절 경계)에서 끊는 선형 시간
+  그리디 알고리즘
+- 한 단어가 한 줄보다 길면 글자 단위로 강제로 나눔
+
+사용법:
+    lines = layout_paragraph(text, 'NanumGothic', 11, max_width=495)
+    for line in lines:
+        canvas.drawString(x, y, line.text)
+"""
+
+import re
+from bisect import bisect_right
+from itertools import accumulate
+
+from reportlab.pdfbase import pdfmetrics
+
+TAB_SPACES = 4
+
+# 한글 음절(및 한자/가나)이 연속된 두 글자 사이에서도 줄바꿈 가능
+_CJK = r'\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7a3'
+_CJK_PAIR = re.compile(rf'[{_CJK}]{{2}}')
+
+
+class _CharWidths(dict):
+    """글자 -> 크기 1일 때의 폭 (처음 나온 글자만 측정)"""
+
+    def __init__(self, font_name):
+        super().__init__()
+        self.font_name = font_name
+
+    def __missing__(self, char):
+        width = pdfmetrics.stringWidth(char, self.font_name, 1)
+        self[char] = width
+        return width
+
+
+_width_cache = {}
+
+
+def get_char_widths(font_name):
+    """폰트별 글자 폭 캐시"""
+    widths = _width_cache.get(font_name)
+    if widths is None:
+        widths = _width_cache[font_name] = _CharWidths(font_name)
+    return widths
+
+
+def string_width(text, font_name, font_size):
+    """캐시된 글자 폭으로 문자열 폭 계산 (pdfmetrics.stringWidth와 같은 값)"""
+    widths = get_char_widths(font_name)
+    return sum(map(widths.__getitem__, text)) * font_size
+
+
+class LineBox:
+    """한 줄의 레이아웃 결과 (캔버스에 그릴 텍스트와 폭)"""
+
+    __slots__ = ('text', 'width', 'font_name', 'font_size')
+
+    def __init__(self, text, width, font_name, font_size):
+        self.text = text
+        self.width = width
+        self.font_name = font_name
+        self.font_size = font_size
+
+    def __repr__(self):
+        return f"LineBox({self.text!r}, width={self.width:.1f})"
+
+
+def _find_break(text, start, fit, break_hangul):
+    """
+    text[start:fit]이 한 줄에 들어갈 때 줄을 끊을 위치
+
+    Returns:
+        tuple: (줄 끝 위치, 다음 줄 시작 위치), 끊을 곳이 없으면 None
+    """
+    space = text.rfind(' ', start + 1, fit + 1)
+
+    if break_hangul:
+        # 마지막 공백 이후에서 가장 뒤쪽의 한글 음절 경계
+        pos = fit
+        while pos > space and pos > start:
+            if _CJK_PAIR.match(text, pos - 1):
+                return pos, pos
+            pos -= 1
+
+    if space > start:
+        return space, space + 1
+    return None
+
+
+def _layout_segment(text, widths, font_name, font_size, max_width, break_hangul, lines):
+    """줄바꿈 문자가 없는 문자열 하나를 줄 단위로 나눔"""
+    prefix = list(accumulate(map(widths.__getitem__, text), initial=0.0))
+    length = len(text)
+    limit_width = max_width / font_size
+
+    start = 0
+    while start < length:
+        limit = prefix[start] + limit_width
+        if prefix[length] <= limit:
+            end = next_start = length
+        else:
+            # text[start:fit]이 들어가는 가장 긴 구간
+            fit = bisect_right(prefix, limit, start) - 1
+            found = _find_break(text, start, fit, break_hangul)
+            if found:
+                end, next_start = found
+            else:
+                # 끊을 곳이 없는 긴 단어는 글자 단위로 강제 분할
+                end = next_start = max(fit, start + 1)
+
+        line = text[start:end].rstrip(' ')
+        lines.append(LineBox(line, (prefix[start + len(line)] - prefix[start]) * font_size,
+                             font_name, font_size))
+        start = next_start
+        while start < length and text[start] == ' ':
+            start += 1
+
+
+def layout_paragraph(text, font_name, font_size, max_width, break_hangul=True):
+    """
+    문단을 max_width(pt)에 맞게 줄 단위로 나눔
+
+    Args:
+        text (str): 문단 텍스트 ('\\n'은 강제 줄바꿈, '\\t'는 공백 4칸)
+        font_name (str): reportlab에 등록된 폰트 이름
+        font_size (float): 글자 크기 (pt)
+        max_width (float): 줄 최대 폭 (pt)
+        break_hangul (bool): 한글 음절 사이에서도 줄바꿈 허용 (Word의 한글 기본 동작)
+
+    Returns:
+        list[LineBox]: 줄 목록 (빈 문단이면 빈 목록)
+    """
+    if not text:
+        return []
+
+    widths = get_char_widths(font_name)
+    lines = []
+    for segment in text.replace('\t', ' ' * TAB_SPACES).split('\n'):
+        if segment:
+            _layout_segment(segment, widths, font_name, font_size, max_width, break_hangul, lines)
+        else:
+            lines.append(LineBox('', 0.0, font_name, font_size))
+    return lines
+
+
+def fit_text(text, font_name, font_size, max_width, ellipsis='...'):
+    """한 줄에 들어가도록 잘라서 말줄임표 추가 (들어가면 그대로 반환)"""
+    widths = get_char_widths(font_name)
+    prefix = list(accumulate(map(widths.__getitem__, text), initial=0.0))
+    limit = max_width / font_size
+    if prefix[-1] <= limit:
+        return text
+
+    limit -= sum(map(widths.__getitem__, ellipsis))
+    fit = max(0, bisect_right(prefix, limit) - 1)
+    return text[:fit].rstrip() + ellipsis
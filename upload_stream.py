@@ -0,0 +1,132 @@
+"""
+스트리밍 업로드 처리
+
+기존 before_request 훅은 업로드 크기를 재기 위해 file.read()로 최대
+100MB를 메모리에 올린 뒤, file.save()로 한 번 더 복사했다. 여기서는
+Werkzeug의 멀티파트 파서가 파일 파트를 쓰는 스트림 자체를 교체해서,
+받은 청크를 uploads/ 아래 임시 파일에 바로 쓰면서 크기와 SHA-256을
+함께 계산한다. 한도를 넘는 순간 413으로 중단하므로 본문 전체가
+메모리에 올라가는 일이 없다.
+
+사용법:
+    app.request_class = StreamingUploadRequest
+    size, content_hash = save_upload(request.files['file'], input_path)
+"""
+
+import hashlib
+import os
+import uuid
+
+from flask import Request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+UPLOAD_FOLDER = 'uploads'
+
+
+class HashingUploadFile:
+    """받은 청크를 디스크에 쓰면서 크기와 SHA-256을 계산하는 파일 객체"""
+
+    def __init__(self, upload_dir=UPLOAD_FOLDER, max_bytes=None):
+        os.makedirs(upload_dir, exist_ok=True)
+        self.path = os.path.join(upload_dir, f".upload_{uuid.uuid4().hex}.part")
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._digest = hashlib.sha256()
+        self._file = open(self.path, 'w+b')
+        self._finalized = False
+
+    @property
+    def name(self):
+        return self.path
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def write(self, data):
+        self.size += len(data)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            self._discard()
+            raise RequestEntityTooLarge()
+        self._digest.update(data)
+        return self._file.write(data)
+
+    def hexdigest(self):
+        """지금까지 받은 내용의 SHA-256 (16진수)"""
+        return self._digest.hexdigest()
+
+    def read(self, size=-1):
+        return self._file.read(size)
+
+    def seek(self, offset, whence=0):
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        return self._file.tell()
+
+    def flush(self):
+        self._file.flush()
+
+    def readable(self):
+        return True
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def finalize(self, dest_path):
+        """임시 파일을 최종 경로로 이동 (복사 없음)"""
+        self._file.close()
+        os.replace(self.path, dest_path)
+        self.path = dest_path
+        self._finalized = True
+
+    def close(self):
+        """finalize되지 않은 임시 파일은 요청 종료 시 삭제"""
+        if not self._finalized:
+            self._discard()
+
+    def _discard(self):
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class StreamingUploadRequest(Request):
+    """파일 파트를 HashingUploadFile로 받는 Flask 요청 클래스"""
+
+    upload_dir = UPLOAD_FOLDER
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None,
+                         content_length=None):
+        return HashingUploadFile(self.upload_dir, max_bytes=self.max_content_length)
+
+
+def save_upload(file_storage, dest_path):
+    """
+    업로드 파일을 dest_path에 저장하고 크기와 내용 해시 반환
+
+    StreamingUploadRequest로 받은 파일은 이미 디스크에 있으므로 이동만
+    하고, 그 외의 파일은 저장하면서 해시를 계산한다.
+
+    Returns:
+        tuple: (바이트 크기, SHA-256 16진수 문자열)
+    """
+    stream = file_storage.stream
+    if isinstance(stream, HashingUploadFile):
+        stream.finalize(dest_path)
+        return stream.size, stream.hexdigest()
+
+    digest = hashlib.sha256()
+    size = 0
+    with open(dest_path, 'wb') as f:
+        for chunk in iter(lambda: stream.read(1024 * 1024), b''):
+            digest.update(chunk)
+            size += len(chunk)
+            f.write(chunk)
+    return size, digest.hexdigest()